@@ -0,0 +1,193 @@
+"""Writes a synthetic workspace of FreeCAD documents for benchmarks.
+
+Each document has a ``Spreadsheet`` with aliased value cells
+and formula cells referencing its own aliases and the aliases of other documents,
+and ``Box`` objects with ``ExpressionEngine`` entries referencing the same.
+Document ``i`` links to documents ``i + 1`` to ``i + fan_out`` (wrapping around)
+through ``XLinks`` and ``DocMap`` elements,
+so each document is referenced by ``fan_out`` other documents.
+
+From the root of this repository:
+
+    python benchmarks/generate_workspace.py ./workspace --documents 100
+"""
+import argparse
+import os
+import random
+from typing import List
+from xml.sax.saxutils import quoteattr
+from zipfile import ZIP_DEFLATED, ZipFile
+
+STAMP = '2021-07-25T20:03:03Z'
+
+GUI_DOCUMENT_XML = """<?xml version='1.0' encoding='utf-8'?>
+<Document SchemaVersion="1">
+    <ViewProviderData Count="0">
+    </ViewProviderData>
+</Document>
+"""
+
+
+def document_name(index: int) -> str:
+    return 'Document{:04d}'.format(index)
+
+
+def generate_workspace(base_path: str,
+                       documents: int = 10,
+                       objects: int = 5,
+                       cells: int = 100,
+                       aliases: int = 50,
+                       expressions: int = 10,
+                       fan_out: int = 3,
+                       binary_size: int = 64 * 1024,
+                       seed: int = 0) -> List[str]:
+    """Writes documents to base_path, and returns their filepaths.
+
+    * ``objects`` - objects per document: one ``Spreadsheet``, and ``Box`` objects.
+    * ``cells`` - spreadsheet cells per document, of which ``aliases`` are aliased values.
+    * ``expressions`` - ``ExpressionEngine`` entries per ``Box`` object.
+    * ``fan_out`` - number of other documents each document references.
+    * ``binary_size`` - bytes of shape data per document, split across ``Box`` objects.
+    """
+    if aliases < 1 or aliases > cells:
+        raise ValueError('aliases must be between 1 and cells ({}).'.format(cells))
+    os.makedirs(base_path, exist_ok=True)
+    fan_out = min(fan_out, documents - 1)
+    rng = random.Random(seed)
+    document_paths = []
+    for index in range(documents):
+        targets = [document_name((index + offset) % documents) for offset in range(1, fan_out + 1)]
+        document_xml = make_document_xml(document_name(index), objects, cells, aliases, expressions, targets, rng)
+        document_path = os.path.join(base_path, document_name(index) + '.FCStd')
+        box_count = max(objects - 1, 1)
+        with ZipFile(document_path, 'w', ZIP_DEFLATED) as archive:
+            archive.writestr('Document.xml', document_xml)
+            archive.writestr('GuiDocument.xml', GUI_DOCUMENT_XML)
+            for box in range(1, objects):
+                # Random bytes don't compress, like the worst case of shape data.
+                size = binary_size // box_count
+                archive.writestr('Box{}.Shape.brp'.format(box), rng.getrandbits(8 * size).to_bytes(size, 'little')
+                                 if size else b'')
+        document_paths.append(document_path)
+    return document_paths
+
+
+def make_document_xml(name: str,
+                      objects: int,
+                      cells: int,
+                      aliases: int,
+                      expressions: int,
+                      targets: List[str],
+                      rng: random.Random) -> str:
+    box_names = ['Box{}'.format(box) for box in range(1, objects)]
+    lines = ["<?xml version='1.0' encoding='utf-8'?>",
+             '<Document SchemaVersion="4" ProgramVersion="0.19R24276 (Git)" FileVersion="1">',
+             '    <Properties Count="2" TransientCount="0">',
+             '        <Property name="Label" type="App::PropertyString" status="1">',
+             '            <String value="{}"/>'.format(name),
+             '        </Property>',
+             '        <Property name="Comment" type="App::PropertyString">',
+             '            <String value=""/>',
+             '        </Property>',
+             '    </Properties>',
+             '    <Objects Count="{}" Dependencies="1">'.format(objects),
+             '        <Object type="Spreadsheet::Sheet" name="Spreadsheet" id="1" />']
+    for id, box_name in enumerate(box_names, 2):
+        lines.append('        <Object type="Part::Box" name="{}" id="{}" />'.format(box_name, id))
+    lines.append('    </Objects>')
+    lines.append('    <ObjectData Count="{}">'.format(objects))
+
+    lines.append('        <Object name="Spreadsheet">')
+    lines.append('            <Properties Count="3" TransientCount="0">')
+    lines.extend(_label_property('Spreadsheet'))
+    lines.extend(_expression_engine_property([], []))
+    lines.append('                <Property name="cells" type="Spreadsheet::PropertySheet" status="67108864">')
+    lines.append('                    <Cells Count="{}"{}>'.format(cells, ' xlink="1"' if targets else ''))
+    lines.extend(_xlinks(targets, '                        '))
+    for row in range(cells):
+        address = 'A{}'.format(row + 1)
+        if row < aliases:
+            lines.append('                        <Cell address="{}" content="{}" alias="Value{}" />'.format(
+                address, rng.randint(1, 1000), row))
+        else:
+            content = '=' + _reference(targets, aliases, rng, 'Spreadsheet.')
+            lines.append('                        <Cell address="{}" content={} />'.format(
+                address, quoteattr(content)))
+    lines.append('                    </Cells>')
+    lines.append('                </Property>')
+    lines.append('            </Properties>')
+    lines.append('        </Object>')
+
+    for box_name in box_names:
+        entries = [('Constraint{}'.format(e), _reference(targets, aliases, rng, 'Spreadsheet.'))
+                   for e in range(expressions)]
+        box_targets = sorted({e.split('#')[0] for _, e in entries if '#' in e})
+        lines.append('        <Object name="{}" Extensions="True">'.format(box_name))
+        lines.append('            <Properties Count="3" TransientCount="0">')
+        lines.extend(_label_property(box_name))
+        lines.extend(_expression_engine_property(entries, box_targets))
+        lines.append('                <Property name="Length" type="App::PropertyLength" status="1">')
+        lines.append('                    <Float value="10"/>')
+        lines.append('                </Property>')
+        lines.append('            </Properties>')
+        lines.append('        </Object>')
+    lines.append('    </ObjectData>')
+    lines.append('</Document>')
+    return '\n'.join(lines) + '\n'
+
+
+def _reference(targets: List[str], aliases: int, rng: random.Random, local_prefix: str) -> str:
+    """Returns a reference to an alias in this document (half of the time) or another document."""
+    alias = 'Value{}'.format(rng.randrange(aliases))
+    if targets and rng.random() < 0.5:
+        return '{}#Spreadsheet.{}'.format(rng.choice(targets), alias)
+    return local_prefix + alias
+
+
+def _label_property(label: str) -> List[str]:
+    return ['                <Property name="Label" type="App::PropertyString" status="134217728">',
+            '                    <String value="{}"/>'.format(label),
+            '                </Property>']
+
+
+def _expression_engine_property(entries: List[tuple], targets: List[str]) -> List[str]:
+    lines = ['                <Property name="ExpressionEngine" type="App::PropertyExpressionEngine" status="67108864">',
+             '                    <ExpressionEngine count="{}"{}>'.format(len(entries), ' xlink="1"' if targets else '')]
+    lines.extend(_xlinks(targets, '                        '))
+    for path, expression in entries:
+        lines.append('                        <Expression path="{}" expression={}/>'.format(path, quoteattr(expression)))
+    lines.append('                    </ExpressionEngine>')
+    lines.append('                </Property>')
+    return lines
+
+
+def _xlinks(targets: List[str], indent: str) -> List[str]:
+    if not targets:
+        return []
+    lines = [indent + '<XLinks count="{0}" docs="{0}">'.format(len(targets))]
+    for index, target in enumerate(targets):
+        lines.append(indent + '    <DocMap name="{0}" label="{0}" index="{1}"/>'.format(target, index))
+    for target in targets:
+        lines.append(indent + '    <XLink file="{}.FCStd" stamp="{}" name="Spreadsheet"/>'.format(target, STAMP))
+    lines.append(indent + '</XLinks>')
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('base_path', help='Directory to write documents to.')
+    parser.add_argument('--documents', type=int, default=10)
+    parser.add_argument('--objects', type=int, default=5)
+    parser.add_argument('--cells', type=int, default=100)
+    parser.add_argument('--aliases', type=int, default=50)
+    parser.add_argument('--expressions', type=int, default=10)
+    parser.add_argument('--fan-out', type=int, default=3)
+    parser.add_argument('--binary-size', type=int, default=64 * 1024)
+    parser.add_argument('--seed', type=int, default=0)
+    args = vars(parser.parse_args())
+    document_paths = generate_workspace(**args)
+    print('Wrote {} document(s) to {}.'.format(len(document_paths), args['base_path']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Measures how the cost of removing a document from an XLinks element
+grows with the number of XLink elements.
+
+From the root of this repository:
+
+    python benchmarks/remove_document_from_multi_xlinks.py
+"""
+import argparse
+import timeit
+from xml.etree.ElementTree import Element, SubElement
+
+from fcxref.remove.remove_document_from_xlinks import \
+    remove_document_from_multi_xlinks
+
+
+def make_xlinks_element(xlink_count: int, doc_map_count: int) -> Element:
+    """Returns an XLinks element with xlink_count XLink elements
+    spread evenly across doc_map_count documents.
+    """
+    xlinks_element = Element('XLinks', {'count': str(xlink_count), 'docs': str(doc_map_count)})
+    xlinks_per_document = xlink_count // doc_map_count
+    for i in range(doc_map_count):
+        name = 'Document{}'.format(i)
+        SubElement(xlinks_element, 'DocMap', {'name': name,
+                                              'label': name,
+                                              'index': str(i * xlinks_per_document)})
+    for i in range(xlink_count):
+        document_index = min(i // xlinks_per_document, doc_map_count - 1)
+        SubElement(xlinks_element, 'XLink', {'file': 'Document{}.FCStd'.format(document_index),
+                                             'stamp': '2021-07-25T20:03:03Z',
+                                             'name': 'Spreadsheet{}'.format(i)})
+    return xlinks_element
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='Numbers of XLink elements.')
+    parser.add_argument('--docs', type=int, default=50, help='Number of DocMap elements.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timings to take the best of.')
+    args = parser.parse_args()
+
+    print('{:>10} {:>12} {:>16}'.format('XLinks', 'Best (ms)', 'Per XLink (us)'))
+    for size in args.sizes:
+        xlinks_element = make_xlinks_element(size, args.docs)
+        # Remove a document in the middle, so DocMap elements on both sides are kept.
+        document_name = 'Document{}'.format(args.docs // 2)
+        seconds = min(timeit.repeat(lambda: remove_document_from_multi_xlinks(xlinks_element, document_name),
+                                    number=1,
+                                    repeat=args.repeat))
+        print('{:>10} {:>12.3f} {:>16.3f}'.format(size, seconds * 1000, seconds * 1000000 / size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Times find, rename_property, remove, and write_root_by_document_path
+on synthetic workspaces of several sizes.
+
+Results are written as JSON, and compared against a baseline written by a previous run,
+including how time grows with the number of documents between the smallest and largest scale.
+Exits with status 1 when a result regressed beyond the thresholds.
+
+From the root of this repository:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from generate_workspace import document_name, generate_workspace
+
+from fcxref import Profiler, Query, find, remove, rename_property
+from fcxref.root_by_document_path import write_root_by_document_path
+
+OPERATIONS = ['find', 'rename_property', 'remove', 'write_root_by_document_path']
+
+
+def make_operations(base_path: str) -> Dict[str, Callable[[], object]]:
+    """Returns functions running each operation on the workspace in base_path.
+
+    ``write_root_by_document_path`` writes the roots returned by ``rename_property``,
+    so it changes the workspace and runs last.
+    """
+    owner = document_name(0)
+    renamed_root_by_document_path = rename_property(base_path, owner, 'Spreadsheet', ('Value0', 'Renamed0'))
+    return {
+        'find': lambda: find(base_path, Query(owner, 'Spreadsheet', 'Value0')),
+        'rename_property': lambda: rename_property(base_path, owner, 'Spreadsheet', ('Value0', 'Renamed0')),
+        'remove': lambda: remove(base_path, owner),
+        'write_root_by_document_path': lambda: write_root_by_document_path(renamed_root_by_document_path)
+    }
+
+
+def run_scale(documents: int, parameters: dict, repeat: int) -> List[dict]:
+    base_path = tempfile.mkdtemp(prefix='fcxref-benchmark-')
+    try:
+        document_paths = generate_workspace(base_path, documents, **parameters)
+        workspace_bytes = sum(os.path.getsize(p) for p in document_paths)
+        operations = make_operations(base_path)
+        results = []
+        for operation in OPERATIONS:
+            function = operations[operation]
+            seconds = min(_time(function) for _ in range(repeat))
+            # Memory is traced in a separate run, since tracing slows it down.
+            with Profiler(trace_memory=True) as profiler:
+                function()
+            results.append({'operation': operation,
+                            'documents': documents,
+                            'seconds': seconds,
+                            'documents_per_second': documents / seconds if seconds else None,
+                            'bytes_per_second': workspace_bytes / seconds if seconds else None,
+                            'peak_memory': profiler.stats.peak_memory})
+            print('{:<28} {:>9} {:>10.4f} s {:>12.1f} docs/s {:>10.1f} MiB'.format(
+                operation, documents, seconds, results[-1]['documents_per_second'] or 0,
+                (profiler.stats.peak_memory or 0) / (1024 * 1024)), file=sys.stderr)
+        return results
+    finally:
+        shutil.rmtree(base_path)
+
+
+def compare(results: List[dict],
+            baseline: List[dict],
+            time_threshold: float,
+            growth_threshold: float) -> List[str]:
+    """Returns descriptions of regressions in results compared to baseline.
+
+    A result regressed when it's more than time_threshold times slower than the baseline,
+    or when the exponent of how its time grows with the number of documents
+    increased by more than growth_threshold (e.g. from linear to quadratic is an increase of 1).
+    """
+    regressions = []
+    baseline_by_key = {(r['operation'], r['documents']): r for r in baseline}
+    for result in results:
+        baseline_result = baseline_by_key.get((result['operation'], result['documents']))
+        if baseline_result is None or not baseline_result['seconds']:
+            continue
+        ratio = result['seconds'] / baseline_result['seconds']
+        print('{:<28} {:>9} {:>8.2f}x baseline time'.format(
+            result['operation'], result['documents'], ratio), file=sys.stderr)
+        if ratio > time_threshold:
+            regressions.append('{} with {} documents took {:.2f}x the baseline time.'.format(
+                result['operation'], result['documents'], ratio))
+    for operation in OPERATIONS:
+        growth = growth_exponent(results, operation)
+        baseline_growth = growth_exponent(baseline, operation)
+        if growth is None or baseline_growth is None:
+            continue
+        print('{:<28} time grows as documents^{:.2f} (baseline ^{:.2f})'.format(
+            operation, growth, baseline_growth), file=sys.stderr)
+        if growth - baseline_growth > growth_threshold:
+            regressions.append('{} time grows as documents^{:.2f}, up from ^{:.2f}.'.format(
+                operation, growth, baseline_growth))
+    return regressions
+
+
+def growth_exponent(results: List[dict], operation: str) -> Optional[float]:
+    """Returns the slope of log(seconds) over log(documents)
+    between the smallest and largest scale of operation.
+    """
+    points = sorted((r['documents'], r['seconds']) for r in results if r['operation'] == operation)
+    if len(points) < 2:
+        return None
+    (smallest, smallest_seconds), (largest, largest_seconds) = points[0], points[-1]
+    if smallest == largest or not smallest_seconds or not largest_seconds:
+        return None
+    return math.log(largest_seconds / smallest_seconds) / math.log(largest / smallest)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 50, 200],
+                        help='Numbers of documents to generate workspaces with.')
+    parser.add_argument('--objects', type=int, default=5)
+    parser.add_argument('--cells', type=int, default=100)
+    parser.add_argument('--aliases', type=int, default=50)
+    parser.add_argument('--expressions', type=int, default=10)
+    parser.add_argument('--fan-out', type=int, default=3)
+    parser.add_argument('--binary-size', type=int, default=64 * 1024)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timings to take the best of.')
+    parser.add_argument('--output', metavar='FILE', help='File to write results to as JSON.')
+    parser.add_argument('--baseline', metavar='FILE', help='Results of a previous run to compare against.')
+    parser.add_argument('--time-threshold', type=float, default=1.5,
+                        help='Ratio to baseline time above which a result regressed.')
+    parser.add_argument('--growth-threshold', type=float, default=0.25,
+                        help='Increase in the exponent of time growth above which an operation regressed.')
+    args = parser.parse_args()
+
+    parameters = {'objects': args.objects,
+                  'cells': args.cells,
+                  'aliases': args.aliases,
+                  'expressions': args.expressions,
+                  'fan_out': args.fan_out,
+                  'binary_size': args.binary_size,
+                  'seed': args.seed}
+    results = []
+    for documents in args.scales:
+        results.extend(run_scale(documents, parameters, args.repeat))
+    report = {'python': platform.python_version(),
+              'platform': platform.platform(),
+              'parameters': parameters,
+              'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('parameters') != parameters:
+            print('Baseline was run with different parameters: {}'.format(baseline.get('parameters')),
+                  file=sys.stderr)
+        regressions = compare(results, baseline['results'], args.time_threshold, args.growth_threshold)
+        for regression in regressions:
+            print('Regression: ' + regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+def _time(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
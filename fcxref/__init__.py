@@ -1,19 +1,51 @@
-from .find import Query, Reference, make_find
+from .aio import afind, aremove, arename_property
+from .dependency_graph import DependencyGraph, make_build_dependency_graph
+from .find import (Query, Reference, make_find, make_find_many,
+                   make_iter_find, make_stream_find)
 from .group_references_by_document_path import \
     group_references_by_document_path
+from .profiler import Profiler, ProfileStats
 from .remove import make_remove
-from .rename import make_rename_property
-from .root_by_document_path import find_root_by_document_path
+from .rename import make_rename_properties, make_rename_property
+from .root_by_document_path import (find_document_paths,
+                                    iter_root_by_document_path)
+from .walker import Walker
+from .workspace import SlimWorkspace, Workspace
 
-find = make_find(find_root_by_document_path)
-rename_property = make_rename_property(find_root_by_document_path)
-remove = make_remove(find_root_by_document_path)
+build_dependency_graph = make_build_dependency_graph(find_document_paths)
+find = make_find(iter_root_by_document_path)
+find_many = make_find_many(iter_root_by_document_path)
+iter_find = make_iter_find(iter_root_by_document_path)
+stream_find = make_stream_find(find_document_paths)
+rename_properties = make_rename_properties(iter_root_by_document_path)
+rename_property = make_rename_property(iter_root_by_document_path)
+remove = make_remove(iter_root_by_document_path)
 
 __all__ = [
+    'afind',
+    'aremove',
+    'arename_property',
+    'build_dependency_graph',
     'find',
+    'find_many',
     'group_references_by_document_path',
+    'iter_find',
+    'rename_properties',
     'rename_property',
     'remove',
+    'stream_find',
+    'make_find',
+    'make_find_many',
+    'make_iter_find',
+    'make_remove',
+    'make_rename_properties',
+    'make_rename_property',
+    'DependencyGraph',
+    'Profiler',
+    'ProfileStats',
     'Query',
-    'Reference'
+    'Reference',
+    'SlimWorkspace',
+    'Walker',
+    'Workspace'
 ]
@@ -0,0 +1,170 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import (AsyncIterator, Callable, Dict, List, Optional, Tuple,
+                    TypeVar)
+from xml.etree.ElementTree import Element
+
+from .find import Query, Reference
+from .find.compiled_query import CompiledQuery
+from .find.find_references_in_root import find_query_references_in_root
+from .label import extract_label, is_label
+from .prefilter import (LabelPrefilter, Prefilter, QueryPrefilter,
+                        escape_attribute)
+from .remove.remove import remove_document_from_root
+from .rename.rename_owner_document import rename_owner_document
+from .rename.rename_references_in_root import rename_references_in_root
+from .process_map import log_document_error
+from .root_by_document_path import (find_document_paths,
+                                    iter_root_by_document_path,
+                                    load_document_xml)
+from .walker import Walker
+
+__all__ = ['afind', 'aremove', 'arename_property']
+
+DEFAULT_LIMIT = 4
+
+T = TypeVar('T')
+
+
+async def afind(base_path: str,
+                query: Query,
+                executor: Optional[Executor] = None,
+                limit: int = DEFAULT_LIMIT,
+                walker: Optional[Walker] = None) -> List[Reference]:
+    """Returns the same references as ``find``, without blocking the event loop.
+
+    Each document is read, parsed, and matched in ``executor``,
+    or the event loop's default executor when it's ``None``.
+    At most ``limit`` documents are pending at once.
+    Documents not yet started are cancelled when the coroutine is cancelled.
+    """
+    find_in_document = partial(_find_in_document,
+                               compiled_query=CompiledQuery(query),
+                               prefilter=QueryPrefilter(query))
+    references = []
+    async for _, references_in_document in _amap(find_in_document, base_path, executor, limit, walker):
+        references.extend(references_in_document)
+    return references
+
+
+async def arename_property(base_path: str,
+                           document: str,
+                           object_name: str,
+                           from_to_properties: Tuple[str, str],
+                           executor: Optional[Executor] = None,
+                           limit: int = DEFAULT_LIMIT,
+                           walker: Optional[Walker] = None) -> Dict[str, Element]:
+    """Returns the same roots as ``rename_property``, without blocking the event loop.
+
+    See ``afind`` for ``executor`` and ``limit``.
+    """
+    from_property_name, to_property_name = from_to_properties
+    from_property = Query(document, object_name, from_property_name)
+    to_property = Query(document, object_name, to_property_name)
+    rename_in_document = partial(_rename_in_document,
+                                 compiled_query=CompiledQuery(from_property),
+                                 prefilter=QueryPrefilter(from_property),
+                                 to_property=to_property)
+    root_by_document_path = {}
+    async for document_path, root in _amap(rename_in_document, base_path, executor, limit, walker):
+        if root is not None:
+            root_by_document_path[document_path] = root
+
+    load_owner_document = partial(iter_root_by_document_path, walker=walker)
+    if is_label(document):
+        load_owner_document = partial(load_owner_document, prefilter=LabelPrefilter(extract_label(document)))
+    owner_root_by_document_path = await asyncio.get_running_loop().run_in_executor(
+        executor,
+        partial(rename_owner_document, load_owner_document, base_path, from_property, to_property_name))
+    if owner_root_by_document_path:
+        root_by_document_path.update(owner_root_by_document_path)
+    return root_by_document_path
+
+
+async def aremove(base_path: str,
+                  document_name: str,
+                  executor: Optional[Executor] = None,
+                  limit: int = DEFAULT_LIMIT,
+                  walker: Optional[Walker] = None) -> Dict[str, Element]:
+    """Returns the same roots as ``remove``, without blocking the event loop.
+
+    See ``afind`` for ``executor`` and ``limit``.
+    """
+    remove_in_document = partial(_remove_in_document,
+                                 document_name=document_name,
+                                 prefilter=Prefilter(['DocMap name="{}"'.format(escape_attribute(document_name))]))
+    root_by_document_path = {}
+    async for document_path, root in _amap(remove_in_document, base_path, executor, limit, walker):
+        if root is not None:
+            root_by_document_path[document_path] = root
+    return root_by_document_path
+
+
+async def _amap(function: Callable[[str], Tuple[T, Optional[str]]],
+                base_path: str,
+                executor: Optional[Executor],
+                limit: int,
+                walker: Optional[Walker]) -> AsyncIterator[Tuple[str, T]]:
+    """Yields (document filepath, result) pairs of function called on each document in base_path,
+    in the order documents are found in.
+
+    Documents are found in the event loop's default executor,
+    since walking directories blocks on the filesystem.
+    Documents function returns an error for are logged and skipped.
+    """
+    if limit < 1:
+        raise ValueError('limit must be at least 1, not {}.'.format(limit))
+    loop = asyncio.get_running_loop()
+    document_paths = await loop.run_in_executor(None, partial(find_document_paths, base_path, walker=walker))
+    pending = deque()
+    try:
+        for document_path in document_paths:
+            if len(pending) >= limit:
+                yield await _result(*pending.popleft())
+            pending.append((document_path, loop.run_in_executor(executor, function, document_path)))
+        while pending:
+            yield await _result(*pending.popleft())
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+async def _result(document_path: str, future: 'asyncio.Future[Tuple[T, Optional[str]]]') -> Tuple[str, T]:
+    result, error = await future
+    if error is not None:
+        log_document_error(document_path, error)
+    return document_path, result
+
+
+def _find_in_document(document_path: str,
+                      compiled_query: CompiledQuery,
+                      prefilter: Prefilter) -> Tuple[List[Reference], Optional[str]]:
+    root, error = load_document_xml(document_path, prefilter)
+    if root is None:
+        return [], error
+    return find_query_references_in_root(document_path, root, compiled_query), None
+
+
+def _rename_in_document(document_path: str,
+                        compiled_query: CompiledQuery,
+                        prefilter: Prefilter,
+                        to_property: Query) -> Tuple[Optional[Element], Optional[str]]:
+    root, error = load_document_xml(document_path, prefilter)
+    if root is None:
+        return None, error
+    references = find_query_references_in_root(document_path, root, compiled_query)
+    if not references:
+        return None, None
+    return rename_references_in_root(root, references, to_property), None
+
+
+def _remove_in_document(document_path: str,
+                        document_name: str,
+                        prefilter: Prefilter) -> Tuple[Optional[Element], Optional[str]]:
+    root, error = load_document_xml(document_path, prefilter)
+    if root is None:
+        return None, error
+    tree = remove_document_from_root(root, document_name)
+    return (tree.root if tree.modified else None), None
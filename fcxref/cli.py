@@ -1,20 +1,30 @@
 import argparse
 import logging
 import os
+import shlex
+import signal
+import sys
+import threading
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-
-from fcxref.remove import remove
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+from xml.etree.ElementTree import Element
 
 from ._version import __version__
-from .find import Query, Reference, make_find
+from .dependency_graph import make_build_dependency_graph
+from .document_cache import DocumentCache
+from .find import (Query, Reference, make_find_many, make_iter_find,
+                   make_stream_find)
+from .reference_index import INDEX_FILENAME, ReferenceIndex
 from .remove import make_remove
-from .rename import make_rename_property
-from .root_by_document_path import (find_root_by_document_path,
+from .rename import make_rename_properties, make_rename_property
+from .root_by_document_path import (find_document_paths,
+                                    iter_root_by_document_path,
                                     write_root_by_document_path)
-
-find = make_find(find_root_by_document_path)
-rename = make_rename_property(find_root_by_document_path)
-remove = make_remove(find_root_by_document_path)
+from .profiler import Profiler
+from .server import SOCKET_FILENAME, Client, WorkspaceMismatchError, serve
+from .walker import Walker
 
 
 def main():
@@ -22,6 +32,31 @@ def main():
         description='Manage cross-document references to properties.')
     parser.add_argument('--version', action='version', version=__version__)
     parser.add_argument('--debug', action='store_true', help='Whether to enable debug logging.')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes to read and write documents with (0 for one per CPU).')
+    parser.add_argument('--cache-dir', default=os.environ.get('FCXREF_CACHE_DIR'),
+                        help='Directory to cache references found in documents between find commands.')
+    parser.add_argument('--include', action='append', metavar='PATTERN',
+                        help='Only include documents matching pattern (may be repeated).')
+    parser.add_argument('--exclude', action='append', metavar='PATTERN',
+                        help='Exclude documents and directories matching pattern (may be repeated). '
+                             'Patterns are also read from a .fcxrefignore file.')
+    parser.add_argument('--max-depth', type=int,
+                        help='Maximum number of directories to descend into (0 for only the current directory).')
+    parser.add_argument('--socket', default=os.environ.get('FCXREF_SOCKET'),
+                        help='Unix socket of a server started with "fcxref serve" '
+                             '(defaults to {} in the current directory). '
+                             'The server is only used when it serves the same documents, '
+                             'and not with --cache-dir.'.format(SOCKET_FILENAME))
+    parser.add_argument('--index-file', default=INDEX_FILENAME,
+                        help='SQLite index of references (defaults to {} in the current directory).'.format(INDEX_FILENAME))
+    parser.add_argument('--profile', action='store_true',
+                        help='Report wall time, calls, and peak memory of each phase, and the slowest documents. '
+                             'Phases in worker processes started by --jobs are not included.')
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help='Write a cProfile .pstats file (implies --profile).')
+    parser.add_argument('--profile-slowest', type=int, default=10, metavar='N',
+                        help='Number of slowest documents to report with --profile.')
     subparsers = parser.add_subparsers(title='Commands',
                                        dest='command',
                                        required=True)
@@ -30,26 +65,70 @@ def main():
     find_parser = subparsers.add_parser('find',
                                         help='Find cross-document references to an object or property',
                                         description='Surround arguments containing special characters in quotes (e.g. "<<My Label>>").',
-                                        usage='fcxref find <document> <object> [property]')
+                                        usage='fcxref find (<document> <object> [property] | --queries-file FILE)')
     find_parser.add_argument(
-        'document', help='Document name or label.')
-    find_parser.add_argument('object', help='Object name or label.')
+        'document', help='Document name or label.', nargs='?')
+    find_parser.add_argument('object', help='Object name or label.', nargs='?')
     find_parser.add_argument('property', help='Property.', nargs='?')
+    find_mode_group = find_parser.add_mutually_exclusive_group()
+    find_mode_group.add_argument('--stream', action='store_true',
+                                 help='Stream each document instead of building its full XML tree.')
+    find_mode_group.add_argument('--queries-file', metavar='FILE',
+                                 help='File with one "<document> <object> [property]" query per line '
+                                      'to find references to in one pass over each document.')
+    find_mode_group.add_argument('--index', action='store_true',
+                                 help='Update and find references in the index at --index-file.')
+    # ---------------------------------------------------------
+
+    # Index
+    subparsers.add_parser('index',
+                          help='Create or update the index at --index-file for "find --index"',
+                          usage='fcxref index')
+    # ---------------------------------------------------------
+
+    # Serve
+    serve_parser = subparsers.add_parser('serve',
+                                         help='Keep documents loaded and answer find commands over a Unix socket',
+                                         description='Find commands use the server when one is listening on the socket.',
+                                         usage='fcxref serve [--interval SECONDS]')
+    serve_parser.add_argument('--interval', type=float, default=2.0, metavar='SECONDS',
+                              help='Seconds between checking documents for changes.')
+    # ---------------------------------------------------------
+
+    # Deps
+    deps_parser = subparsers.add_parser('deps',
+                                        help='List documents a document links to',
+                                        usage='fcxref deps <document> [--transitive]')
+    deps_parser.add_argument('document', help='Document name.')
+    deps_parser.add_argument('--transitive', action='store_true',
+                             help='Include documents linked to by linked documents.')
+    # ---------------------------------------------------------
+
+    # Rdeps
+    rdeps_parser = subparsers.add_parser('rdeps',
+                                         help='List documents linking to a document, directly or transitively',
+                                         usage='fcxref rdeps <document> [--direct]')
+    rdeps_parser.add_argument('document', help='Document name.')
+    rdeps_parser.add_argument('--direct', action='store_true',
+                              help='Only include documents directly linking to document.')
     # ---------------------------------------------------------
 
     # Rename
     rename_parser = subparsers.add_parser('rename',
                                           help='Rename cross-document references to a property',
                                           description='Surround arguments containing special characters in quotes (e.g. "<<My Label>>").',
-                                          usage='fcxref rename <document> <object> <from_property> <to_property>')
+                                          usage='fcxref rename <document> <object> (<from_property> <to_property> | --mapping FILE)')
     rename_parser.add_argument(
         'document', help='Document name or label of reference to rename.')
     rename_parser.add_argument(
         'object', help='Object name or label of reference to rename.')
     rename_parser.add_argument(
-        'from_property', help='Property of reference before renaming.')
+        'from_property', help='Property of reference before renaming.', nargs='?')
     rename_parser.add_argument(
-        'to_property', help='Property of reference after renaming.')
+        'to_property', help='Property of reference after renaming.', nargs='?')
+    rename_parser.add_argument('--mapping', metavar='FILE',
+                               help='File with one "<from_property> <to_property>" pair per line '
+                                    'to rename in one pass over each document.')
     # ---------------------------------------------------------
 
     # Remove
@@ -67,68 +146,183 @@ def main():
     args = vars(parser.parse_args())
     logging.basicConfig(level=logging.DEBUG if args['debug'] else logging.INFO)
     command = args.pop('command')
-    if command == 'find':
-        property = Query(args['document'], args['object'], args['property'])
-        references = find(cwd, property)
-
-        def format_reference(reference: Reference) -> str:
-            formatted_reference = str(reference)
-            formatted_reference += ' {}'.format(get_reference_type(reference, property))
-            return formatted_reference
-
-        num_references = len(references)
-        if num_references > 0:
-            print('\n'.join(map(format_reference, references)))
-        else:
-            print('No references to {} found.'.format(property))
-    elif command == 'rename':
-        renamed_root_by_document_path = rename(cwd,
-                                               args['document'],
-                                               args['object'],
-                                               (args['from_property'], args['to_property']))
-        from_property = Query(
-            args['document'], args['object'], args['from_property'])
-        to_property = Query(
-            args['document'], args['object'], args['to_property'])
-        document_paths = renamed_root_by_document_path.keys()
-        num_documents = len(document_paths)
-        if num_documents == 0:
-            print('No documents contain references to {}.'.format(from_property))
-        else:
-            print('The following {} document(s) reference {}:'.format(
-                num_documents, from_property))
+    jobs = args['jobs']
+    walker = Walker(args['include'], args['exclude'], args['max_depth'])
+    iter_root = partial(iter_root_by_document_path, walker=walker)
+    iter_find = make_iter_find(iter_root)
+    find_many = make_find_many(iter_root)
+    stream_find = make_stream_find(partial(find_document_paths, walker=walker))
+    rename = make_rename_property(iter_root)
+    rename_properties = make_rename_properties(iter_root)
+    remove = make_remove(iter_root)
+    build_dependency_graph = make_build_dependency_graph(partial(find_document_paths, walker=walker))
+    socket_path = args['socket'] or os.path.join(cwd, SOCKET_FILENAME)
+    with profile(args['profile'], args['profile_output'], args['profile_slowest']):
+        if command == 'serve':
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+            try:
+                serve(cwd, socket_path, walker, jobs, args['interval'], stop=stop)
+            except KeyboardInterrupt:
+                pass
+        elif command == 'index':
+            with ReferenceIndex(args['index_file'], cwd) as index:
+                document_paths = index.update(walker, jobs)
+            print('{} document(s) indexed or removed.'.format(len(document_paths)))
+        elif command == 'find' and args['queries_file']:
+            if args['document'] is not None:
+                find_parser.error('argument --queries-file: not allowed with document, object, and property')
+            try:
+                queries = read_queries_file(args['queries_file'])
+            except ValueError as error:
+                find_parser.exit(1, '{}\n'.format(error))
+            cache = DocumentCache(args['cache_dir']) if args['cache_dir'] else None
+            references_by_query = find_many(cwd, queries, jobs, cache)
+            for query, references in references_by_query.items():
+                if write_references(references, query) == 0:
+                    print('No references to {} found.'.format(query))
+        elif command == 'find':
+            if args['document'] is None or args['object'] is None:
+                find_parser.error('the following arguments are required: document, object')
+            property = Query(args['document'], args['object'], args['property'])
+            references = None
+            if args['stream']:
+                references = stream_find(cwd, property, jobs)
+            elif args['index']:
+                with ReferenceIndex(args['index_file'], cwd) as index:
+                    index.update(walker, jobs)
+                    references = index.find(property)
+            elif os.path.exists(socket_path) and not args['cache_dir']:
+                # The server rejects queries about documents it doesn't serve, which are then scanned here.
+                try:
+                    references = Client(socket_path, cwd, walker).find(property)
+                except (OSError, WorkspaceMismatchError) as error:
+                    logging.debug('Not using server on {}: {}'.format(socket_path, error))
+            if references is None:
+                cache = DocumentCache(args['cache_dir']) if args['cache_dir'] else None
+                references = iter_find(cwd, property, jobs, cache)
 
-            def format_document_path(document_path: str) -> str:
+            if write_references(references, property) == 0:
+                print('No references to {} found.'.format(property))
+        elif command in ('deps', 'rdeps'):
+            document = args['document']
+            dependency_graph = build_dependency_graph(cwd, jobs)
+            if command == 'deps':
+                document_paths = dependency_graph.dependencies(document, args['transitive'])
+                description = 'Documents {} links to'
+            else:
+                document_paths = dependency_graph.dependents(document, not args['direct'])
+                description = 'Documents linking to {}'
+            if len(dependency_graph.find_document_paths(document)) == 0:
+                print('No document named {} found.'.format(document))
+            elif len(document_paths) == 0:
+                print('{}: none.'.format(description.format(document)))
+            else:
+                print('{}:'.format(description.format(document)))
                 beginning_path = cwd + os.path.sep
-                return document_path.replace(beginning_path, '')
-            print('  ' + '\n  '.join(map(format_document_path, document_paths)) + '\n')
-            question = 'Do you wish to rename references to {}?'.format(
-                to_property)
-            answer = query_yes_no(question, 'no')
-            if answer:
-                write_root_by_document_path(renamed_root_by_document_path)
-                print('{} document(s) updated.'.format(num_documents))
-    elif command == 'remove':
-        document = args['document']
-        renamed_root_by_document_path = remove(cwd, document)
-        document_paths = renamed_root_by_document_path.keys()
-        num_documents = len(document_paths)
-        if num_documents == 0:
-            print('No documents contain XLinks to {}.'.format(document))
+                for document_path in document_paths:
+                    print('  ' + document_path.replace(beginning_path, ''))
+        elif command == 'rename':
+            if args['mapping']:
+                if args['from_property'] is not None:
+                    rename_parser.error('argument --mapping: not allowed with from_property and to_property')
+                try:
+                    to_property_by_from_property = read_mapping_file(args['mapping'])
+                    renamed_root_by_document_path = rename_properties(cwd,
+                                                                      args['document'],
+                                                                      args['object'],
+                                                                      to_property_by_from_property,
+                                                                      jobs)
+                except ValueError as error:
+                    rename_parser.exit(1, '{}\n'.format(error))
+                from_property = '{} properties of {}#{}'.format(
+                    len(to_property_by_from_property), args['document'], args['object'])
+                to_property = 'properties in {}'.format(args['mapping'])
+            else:
+                if args['from_property'] is None or args['to_property'] is None:
+                    rename_parser.error('the following arguments are required: from_property, to_property')
+                renamed_root_by_document_path = rename(cwd,
+                                                       args['document'],
+                                                       args['object'],
+                                                       (args['from_property'], args['to_property']),
+                                                       jobs)
+                from_property = Query(
+                    args['document'], args['object'], args['from_property'])
+                to_property = Query(
+                    args['document'], args['object'], args['to_property'])
+            document_paths = renamed_root_by_document_path.keys()
+            num_documents = len(document_paths)
+            if num_documents == 0:
+                print('No documents contain references to {}.'.format(from_property))
+            else:
+                print('The following {} document(s) reference {}:'.format(
+                    num_documents, from_property))
+
+                def format_document_path(document_path: str) -> str:
+                    beginning_path = cwd + os.path.sep
+                    return document_path.replace(beginning_path, '')
+                print('  ' + '\n  '.join(map(format_document_path, document_paths)) + '\n')
+                question = 'Do you wish to rename references to {}?'.format(
+                    to_property)
+                answer = query_yes_no(question, 'no')
+                if answer:
+                    write_documents(renamed_root_by_document_path, jobs, format_document_path)
+        elif command == 'remove':
+            document = args['document']
+            renamed_root_by_document_path = remove(cwd, document, jobs)
+            document_paths = renamed_root_by_document_path.keys()
+            num_documents = len(document_paths)
+            if num_documents == 0:
+                print('No documents contain XLinks to {}.'.format(document))
+            else:
+                print('The following {} document(s) contain XLinks to {}:'.format(
+                    num_documents, document))
+
+                def format_document_path(document_path: str) -> str:
+                    beginning_path = cwd + os.path.sep
+                    return document_path.replace(beginning_path, '')
+                print('  ' + '\n  '.join(map(format_document_path, document_paths)) + '\n')
+                question = 'Do you wish to remove XLinks to {}? (this will break document linking)'.format(
+                    document)
+                answer = query_yes_no(question, 'no')
+                if answer:
+                    write_documents(renamed_root_by_document_path, jobs, format_document_path)
+
+
+@contextmanager
+def profile(enabled: bool, pstats_path: Optional[str], slowest: int) -> Iterator[None]:
+    """Profiles the enclosed command, and reports stats to standard error
+    when enabled or pstats_path is passed.
+    """
+    if not enabled and pstats_path is None:
+        yield
+        return
+    profiler = Profiler(pstats_path=pstats_path)
+    try:
+        with profiler:
+            yield
+    finally:
+        print(profiler.stats.format(slowest), file=sys.stderr)
+        if pstats_path is not None:
+            print('Wrote cProfile stats to {}.'.format(pstats_path), file=sys.stderr)
+
+
+def write_documents(root_by_document_path: Dict[str, Element],
+                    jobs: int,
+                    format_document_path: Callable[[str], str]) -> None:
+    def print_progress(document_path: str, error: Optional[str]) -> None:
+        if error is None:
+            print('  Updated {}'.format(format_document_path(document_path)))
         else:
-            print('The following {} document(s) contain XLinks to {}:'.format(
-                num_documents, document))
+            print('  Failed to update {}: {}'.format(format_document_path(document_path), error))
 
-            def format_document_path(document_path: str) -> str:
-                beginning_path = cwd + os.path.sep
-                return document_path.replace(beginning_path, '')
-            print('  ' + '\n  '.join(map(format_document_path, document_paths)) + '\n')
-            question = 'Do you wish to remove XLinks to {}? (this will break document linking)'.format(
-                document)
-            answer = query_yes_no(question, 'no')
-            if answer:
-                write_root_by_document_path(renamed_root_by_document_path)
-                print('{} document(s) updated.'.format(num_documents))
+    error_by_document_path = write_root_by_document_path(root_by_document_path, jobs, print_progress)
+    num_errors = len(error_by_document_path)
+    print('{} document(s) updated.'.format(len(root_by_document_path) - num_errors))
+    if num_errors > 0:
+        print('{} document(s) failed to update:'.format(num_errors))
+        for document_path, error in error_by_document_path.items():
+            print('  {}: {}'.format(format_document_path(document_path), error))
 
 
 def query_yes_no(question, default: str = 'yes'):
@@ -161,6 +355,71 @@ def query_yes_no(question, default: str = 'yes'):
             print('Please respond with "yes" or "no" (or "y" or "n").\n')
 
 
+def read_queries_file(path: str) -> List[Query]:
+    """Reads one query per line, ignoring blank lines and lines starting with ``#``.
+
+    Surround arguments containing spaces in quotes (e.g. "<<My Label>>").
+
+    Raises ``ValueError`` with the line number of a line without 2 or 3 arguments.
+    """
+    queries = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            arguments = shlex.split(line, comments=True)
+            if not arguments:
+                continue
+            if len(arguments) not in (2, 3):
+                raise ValueError('{}:{}: Expected "<document> <object> [property]" but got "{}".'.format(
+                    path, line_number, line.strip()))
+            queries.append(Query(*arguments))
+    return queries
+
+
+def read_mapping_file(path: str) -> Dict[str, str]:
+    """Reads one "<from_property> <to_property>" pair per line,
+    ignoring blank lines and lines starting with ``#``.
+
+    Raises ``ValueError`` with the line number of a line without 2 arguments.
+    """
+    to_property_by_from_property = {}
+    with open(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            arguments = shlex.split(line, comments=True)
+            if not arguments:
+                continue
+            if len(arguments) != 2:
+                raise ValueError('{}:{}: Expected "<from_property> <to_property>" but got "{}".'.format(
+                    path, line_number, line.strip()))
+            from_property, to_property = arguments
+            to_property_by_from_property[from_property] = to_property
+    return to_property_by_from_property
+
+
+def write_references(references: Iterable[Reference], query: Query, file: Optional[TextIO] = None) -> int:
+    """Writes each reference to file (or standard output) as soon as it's found.
+
+    Returns the number of references written.
+    """
+    file = file or sys.stdout
+    num_references = 0
+    try:
+        for reference in references:
+            file.write(format_reference(reference, query) + '\n')
+            num_references += 1
+        file.flush()
+    except BrokenPipeError:
+        # Output was closed early (e.g. piped to head), so stop finding references.
+        if file is sys.stdout:
+            # Keep Python from writing buffered output to the closed pipe on exit.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise SystemExit(1)
+    return num_references
+
+
+def format_reference(reference: Reference, property: Query) -> str:
+    return '{} {}'.format(reference, get_reference_type(reference, property))
+
+
 def get_reference_type(reference: Reference, property: Query) -> str:
     if is_source(reference, property):
         return 'source'
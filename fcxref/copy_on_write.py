@@ -0,0 +1,104 @@
+import re
+from typing import Dict, Iterator, Optional, Tuple
+from xml.etree.ElementTree import Element
+
+__all__ = ['copy_element', 'find_indexed', 'find_locator', 'iter_indexed', 'matches_locator', 'CopyOnWriteTree', 'Locator']
+
+# Matches steps of simple xpaths like ObjectData/Object[@name='Box'].
+XPATH_STEP_PATTERN = re.compile(r"([^/\[]+)(?:\[@([^=\]]+)='([^']*)'\])?(?:/|$)")
+
+# Child indices from the root to an element (e.g. root[1][0][0][2]).
+Locator = Tuple[int, ...]
+
+
+class CopyOnWriteTree:
+    """Edits a copy of root without copying elements which aren't edited.
+
+    ``element`` returns a writable copy of the element at a locator,
+    copying only the elements on the path to it (once each),
+    and sharing every other element with root.
+    Root itself is never modified.
+    """
+
+    def __init__(self, root: Element) -> None:
+        self.original_root = root
+        self._copy_by_locator: Dict[Locator, Element] = {}
+
+    @property
+    def root(self) -> Element:
+        """The copied root, or the original root when nothing was edited."""
+        return self._copy_by_locator.get((), self.original_root)
+
+    @property
+    def modified(self) -> bool:
+        return bool(self._copy_by_locator)
+
+    def element(self, locator: Locator) -> Element:
+        copy = self._copy_by_locator.get(locator)
+        if copy is not None:
+            return copy
+        if not locator:
+            copy = copy_element(self.original_root)
+        else:
+            parent = self.element(locator[:-1])
+            index = locator[-1]
+            copy = copy_element(parent[index])
+            parent[index] = copy
+        self._copy_by_locator[locator] = copy
+        return copy
+
+
+def copy_element(element: Element) -> Element:
+    """Returns a copy of element with its own attributes, sharing its children."""
+    copy = element.makeelement(element.tag, dict(element.attrib))
+    copy.text = element.text
+    copy.tail = element.tail
+    copy.extend(element)
+    return copy
+
+
+def find_locator(root: Element, xpath: str) -> Optional[Locator]:
+    """Returns the locator of the first element matching a simple xpath of
+    ``tag`` and ``tag[@attribute='value']`` steps, or ``None`` when no element matches.
+    """
+    locator = []
+    element = root
+    for match in XPATH_STEP_PATTERN.finditer(xpath):
+        tag, attribute, value = match.groups()
+        for index, child in enumerate(element):
+            if child.tag == tag and (attribute is None or child.attrib.get(attribute) == value):
+                locator.append(index)
+                element = child
+                break
+        else:
+            return None
+    return tuple(locator)
+
+
+def matches_locator(root: Element, locator: Locator, xpath: str) -> bool:
+    """Returns whether locator leads to an element in root matching each step of a simple xpath,
+    like the element ``find_locator`` returns for xpath.
+    """
+    steps = XPATH_STEP_PATTERN.findall(xpath)
+    if len(steps) != len(locator):
+        return False
+    element = root
+    for index, (tag, attribute, value) in zip(locator, steps):
+        if index >= len(element):
+            return False
+        element = element[index]
+        if element.tag != tag or (attribute and element.attrib.get(attribute) != value):
+            return False
+    return True
+
+
+def find_indexed(parent: Element, tag: str) -> Tuple[Optional[int], Optional[Element]]:
+    """Returns the index and first child of parent with tag, like ``parent.find(tag)``."""
+    return next(iter_indexed(parent, tag), (None, None))
+
+
+def iter_indexed(parent: Element, tag: str) -> Iterator[Tuple[int, Element]]:
+    """Yields the index and each child of parent with tag, like ``parent.findall(tag)``."""
+    for index, child in enumerate(parent):
+        if child.tag == tag:
+            yield index, child
@@ -0,0 +1,105 @@
+import os
+from io import BytesIO
+from typing import Callable, Dict, List
+from xml.etree import ElementTree
+
+from .find.extract_document import extract_document
+from .process_map import (catch_document_errors, iter_document_results,
+                          process_map)
+from .root_by_document_path import read_document_xml
+
+__all__ = ['DependencyGraph', 'make_build_dependency_graph']
+
+
+class DependencyGraph:
+    """Directed graph of which documents link to which other documents through ``XLinks``.
+
+    Keys of dependencies_by_document_path are document filepaths,
+    and values are filepaths of the documents they link to,
+    which may be outside of the workspace or not exist.
+
+    Documents are passed to methods by name (e.g. ``MainDocument``).
+    """
+
+    def __init__(self, dependencies_by_document_path: Dict[str, List[str]]) -> None:
+        self.dependencies_by_document_path = dependencies_by_document_path
+        self.dependents_by_document_path: Dict[str, List[str]] = {}
+        for document_path, dependencies in dependencies_by_document_path.items():
+            for dependency in dependencies:
+                self.dependents_by_document_path.setdefault(dependency, []).append(document_path)
+
+    def dependencies(self, document: str, transitive: bool = False) -> List[str]:
+        """Returns filepaths of documents linked to by document."""
+        return self._traverse(document, self.dependencies_by_document_path, transitive)
+
+    def dependents(self, document: str, transitive: bool = True) -> List[str]:
+        """Returns filepaths of documents linking to document,
+        which may break if it's moved, renamed, or removed.
+        """
+        return self._traverse(document, self.dependents_by_document_path, transitive)
+
+    def find_document_paths(self, document: str) -> List[str]:
+        document_paths = list(self.dependencies_by_document_path.keys()) + [
+            p for p in self.dependents_by_document_path if p not in self.dependencies_by_document_path
+        ]
+        return [p for p in document_paths if extract_document(p) == document]
+
+    def _traverse(self,
+                  document: str,
+                  adjacent_by_document_path: Dict[str, List[str]],
+                  transitive: bool) -> List[str]:
+        start = self.find_document_paths(document)
+        visited = set(start)
+        result = []
+        pending = list(start)
+        while pending:
+            document_path = pending.pop(0)
+            for adjacent in adjacent_by_document_path.get(document_path, []):
+                if adjacent in visited:
+                    continue
+                visited.add(adjacent)
+                result.append(adjacent)
+                if transitive:
+                    pending.append(adjacent)
+        return result
+
+
+def make_build_dependency_graph(find_document_paths: Callable[[str], List[str]]):
+    def build_dependency_graph(base_path: str, jobs: int = 1) -> DependencyGraph:
+        """Builds a dependency graph of documents in base_path from their ``XLink`` elements.
+
+        Documents without ``<XLink`` in their ``Document.xml`` aren't parsed.
+        Other documents are parsed in full, since ``XLink`` elements may be in any object.
+        """
+        document_paths = find_document_paths(base_path)
+        document_path_by_absolute_path = {os.path.abspath(p): p for p in document_paths}
+        dependencies_by_document_path = {}
+        results = process_map(_read_xlink_files, document_paths, jobs)
+        for document_path, xlink_files in iter_document_results(document_paths, results):
+            directory = os.path.dirname(os.path.abspath(document_path))
+            dependencies = []
+            for xlink_file in xlink_files:
+                absolute_path = os.path.normpath(os.path.join(directory, xlink_file))
+                dependency = document_path_by_absolute_path.get(absolute_path, absolute_path)
+                if dependency not in dependencies:
+                    dependencies.append(dependency)
+            dependencies_by_document_path[document_path] = dependencies
+        return DependencyGraph(dependencies_by_document_path)
+    return build_dependency_graph
+
+
+@catch_document_errors()
+def _read_xlink_files(document_path: str) -> List[str]:
+    """Returns a (``XLink`` file attributes, error) pair of the document at document_path.
+
+    ``Document.xml`` is decompressed in full, but only parsed when it contains ``<XLink``.
+    """
+    document_xml = read_document_xml(document_path)
+    if b'<XLink ' not in document_xml:
+        return []
+    xlink_files = []
+    for _, element in ElementTree.iterparse(BytesIO(document_xml)):
+        if element.tag == 'XLink' and 'file' in element.attrib:
+            xlink_files.append(element.attrib['file'])
+        element.clear()
+    return xlink_files
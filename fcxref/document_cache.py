@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element, ParseError
+from zipfile import BadZipFile, ZipFile
+
+from .find.property_scanner import scanner_by_property_name
+
+__all__ = ['DocumentCache', 'extract_reference_root', 'read_document_key']
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'index.json'
+
+LABEL_PROPERTY_NAME = 'Label'
+
+
+class DocumentCache:
+    """Persistent on-disk cache of the reference-bearing parts of ``Document.xml`` files.
+
+    Entries are keyed by document path, and the CRC and size of ``Document.xml``
+    and modification time of the ``.FCStd`` file.
+    The key is read from the ZIP central directory without decompressing ``Document.xml``.
+
+    Cached roots only contain labels, ``cells``, and ``ExpressionEngine`` properties
+    (including ``XLinks``), so they must **not** be written back to documents.
+    """
+
+    def __init__(self, directory: str, max_size: int = 256 * 1024 * 1024) -> None:
+        self.directory = Path(directory).expanduser()
+        self.max_size = max_size
+        self._entry_by_document_path = self._load_index()
+
+    def contains(self, document_path: str, key: Optional[List[int]] = None) -> bool:
+        """Returns whether document_path has an entry matching key,
+        or its current key read with ``read_document_key`` when key isn't passed.
+        """
+        entry = self._entry_by_document_path.get(_normalize(document_path))
+        if entry is None:
+            return False
+        if key is None:
+            key = read_document_key(document_path)
+        return key is not None and entry['key'] == key
+
+    def get(self, document_path: str, key: Optional[List[int]] = None) -> Optional[Element]:
+        """Returns the cached root of document_path when it has an entry matching key (see ``contains``)."""
+        if not self.contains(document_path, key):
+            return None
+        entry = self._entry_by_document_path[_normalize(document_path)]
+        try:
+            document_xml = self.directory.joinpath(entry['filename']).read_bytes()
+            root = ElementTree.fromstring(document_xml)
+        except (OSError, ParseError):
+            return None
+        entry['accessed'] = time.time()
+        logger.debug(f'Cache hit for {document_path}')
+        return root
+
+    def put(self, document_path: str, root: Element, key: Optional[List[int]] = None) -> Element:
+        """Caches the reference-bearing parts of root under key, and returns them.
+
+        Pass the key read before root was parsed,
+        so a document changed since then isn't cached with a key matching its new content.
+        The current key is read when key isn't passed.
+        """
+        reference_root = extract_reference_root(root)
+        if key is None:
+            key = read_document_key(document_path)
+        if key is None:
+            return reference_root
+        document_xml = ElementTree.tostring(reference_root)
+        normalized_path = _normalize(document_path)
+        filename = hashlib.sha1(normalized_path.encode('utf-8')).hexdigest() + '.xml'
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.directory.joinpath(filename).write_bytes(document_xml)
+        self._entry_by_document_path[normalized_path] = {
+            'key': key,
+            'filename': filename,
+            'size': len(document_xml),
+            'accessed': time.time()
+        }
+        return reference_root
+
+    def evict(self) -> None:
+        """Evicts entries for deleted documents,
+        and least recently used entries exceeding the maximum size.
+        """
+        for document_path in list(self._entry_by_document_path.keys()):
+            if not os.path.exists(document_path):
+                self._remove(document_path)
+        entries = sorted(self._entry_by_document_path.items(),
+                         key=lambda item: item[1]['accessed'])
+        total_size = sum(entry['size'] for _, entry in entries)
+        for document_path, entry in entries:
+            if total_size <= self.max_size:
+                break
+            total_size -= entry['size']
+            self._remove(document_path)
+
+    def save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index_path = self.directory.joinpath(INDEX_FILENAME)
+        temporary_path = index_path.with_suffix('.tmp')
+        with open(temporary_path, 'w') as f:
+            json.dump(self._entry_by_document_path, f)
+        os.replace(temporary_path, index_path)
+
+    def _remove(self, document_path: str) -> None:
+        entry = self._entry_by_document_path.pop(document_path)
+        try:
+            self.directory.joinpath(entry['filename']).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.directory.joinpath(INDEX_FILENAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+def extract_reference_root(root: Element) -> Element:
+    """Returns a new root sharing only the document label,
+    and object labels, ``cells``, and ``ExpressionEngine`` properties with root.
+
+    Paths to kept elements are unchanged, so references found in the new root
+    have the same xpaths as references found in root.
+    """
+    property_names = {LABEL_PROPERTY_NAME} | set(scanner_by_property_name)
+    reference_root = Element(root.tag, root.attrib)
+
+    properties_element = root.find('Properties')
+    if properties_element is not None:
+        reference_properties_element = ElementTree.SubElement(
+            reference_root, 'Properties', properties_element.attrib)
+        for property_element in properties_element.findall('Property'):
+            if property_element.attrib.get('name') == LABEL_PROPERTY_NAME:
+                reference_properties_element.append(property_element)
+
+    object_data = root.find('ObjectData')
+    if object_data is not None:
+        reference_object_data = ElementTree.SubElement(
+            reference_root, 'ObjectData', object_data.attrib)
+        for object_element in object_data.findall('Object'):
+            reference_object_element = ElementTree.SubElement(
+                reference_object_data, 'Object', object_element.attrib)
+            reference_properties_element = ElementTree.SubElement(
+                reference_object_element, 'Properties')
+            object_properties_element = object_element.find('Properties')
+            if object_properties_element is None:
+                continue
+            for property_element in object_properties_element.findall('Property'):
+                if property_element.attrib.get('name') in property_names:
+                    reference_properties_element.append(property_element)
+    return reference_root
+
+
+def read_document_key(document_path: str) -> Optional[List[int]]:
+    """Returns the CRC and size of ``Document.xml`` and modification time of the document at document_path,
+    or ``None`` when they can't be read.
+    """
+    try:
+        mtime_ns = os.stat(document_path).st_mtime_ns
+        with ZipFile(document_path, 'r') as archive:
+            member = archive.getinfo('Document.xml')
+    except (OSError, BadZipFile, KeyError):
+        return None
+    return [member.CRC, member.file_size, mtime_ns]
+
+
+def _normalize(document_path: str) -> str:
+    return os.path.abspath(document_path)
@@ -0,0 +1,15 @@
+from typing import Iterable, Mapping, Tuple, Union
+from xml.etree.ElementTree import Element
+
+__all__ = ['DocumentRoots', 'iter_document_roots']
+
+DocumentRoots = Union[Mapping[str, Element], Iterable[Tuple[str, Element]]]
+
+
+def iter_document_roots(document_roots: DocumentRoots) -> Iterable[Tuple[str, Element]]:
+    """Returns (document path, root) pairs from a dictionary,
+    or an iterable of pairs such as ``iter_root_by_document_path``.
+    """
+    if isinstance(document_roots, Mapping):
+        return document_roots.items()
+    return document_roots
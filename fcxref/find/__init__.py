@@ -1,5 +1,16 @@
 from .make_find import make_find
+from .make_find_many import make_find_many
+from .make_iter_find import make_iter_find
+from .make_stream_find import make_stream_find
+from .property_scanner import PropertyScanner, register_property_scanner
 from .query import Query
 from .reference import Reference
 
-__all__ = ['make_find', 'Query', 'Reference']
+__all__ = ['make_find',
+           'make_find_many',
+           'make_iter_find',
+           'make_stream_find',
+           'register_property_scanner',
+           'PropertyScanner',
+           'Query',
+           'Reference']
@@ -0,0 +1,52 @@
+import re
+from re import Match
+from typing import Optional, Tuple
+from xml.etree.ElementTree import Element
+
+from .query import Query
+
+__all__ = ['CompiledQuery']
+
+
+class CompiledQuery:
+    """Query with its patterns compiled once, to reuse across documents.
+
+    References are classified as:
+
+    * direct - ``Document#Object.Property`` in a document other than the document owning the query.
+    * indirect - ``Property`` alone, in a document other than the document owning the query,
+      only found when the same document also has a direct reference.
+    * owner - ``Property`` alone, in the document owning the query.
+    """
+
+    def __init__(self, query: Query) -> None:
+        self.query = query
+        regex = query.to_regex()
+        self.direct_pattern = re.compile(regex)
+        self.owner_pattern = re.compile(r'\b{}\b'.format(query.property_name))
+        self.indirect_pattern = None
+        self._direct_suffix_pattern = None
+        if query.property_name:
+            self.indirect_pattern = self.owner_pattern
+            self._direct_suffix_pattern = re.compile(r'(?:{})\Z'.format(regex))
+
+    def matches_document(self, document_path: str, root: Optional[Element] = None) -> bool:
+        return self.query.matches_document(document_path, root)
+
+    def search(self, content: str, is_owner_document: bool) -> Tuple[Optional[Match], Optional[Match]]:
+        """Returns a (direct or owner match, indirect match) pair for content.
+
+        Either may be ``None``, and the indirect match is always ``None`` in the owner document.
+        """
+        if is_owner_document:
+            return self.owner_pattern.search(content), None
+        return self.direct_pattern.search(content), self.search_indirect(content)
+
+    def search_indirect(self, content: str) -> Optional[Match]:
+        """Returns the first ``Property`` match in content which doesn't end a direct match."""
+        if self.indirect_pattern is None:
+            return None
+        for match in self.indirect_pattern.finditer(content):
+            if not self._direct_suffix_pattern.search(content, 0, match.end()):
+                return match
+        return None
@@ -0,0 +1,183 @@
+import re
+from re import Pattern
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import Element
+
+from ..prefilter import is_literal
+from .compiled_query import CompiledQuery
+from .find_references_in_root import iter_reference_attributes
+from .query import Query
+from .reference import Reference
+
+__all__ = ['find_many_in_root']
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def find_many_in_root(document_path: str,
+                      root: Element,
+                      compiled_queries: List[CompiledQuery]) -> Dict[Query, List[Reference]]:
+    """Returns a dictionary where keys are queries,
+    and values are the same references ``find`` returns for each query in root.
+
+    Root is walked once for all queries.
+    Queries without regular expression special characters are matched by looking up
+    the text around each ``#`` and each word of an attribute in dictionaries,
+    so their cost grows with the attributes and references found rather than the number of queries.
+    Other queries are searched for in attributes one combined pattern for them matches.
+    """
+    references_by_query = {compiled_query.query: [] for compiled_query in compiled_queries}
+    indirect_references_by_query = {compiled_query.query: [] for compiled_query in compiled_queries}
+    is_owner_document_by_query = {
+        compiled_query.query: compiled_query.matches_document(document_path, root)
+        for compiled_query in compiled_queries
+    }
+    literal_queries = _LiteralQueries()
+    other_queries = []
+    for compiled_query in compiled_queries:
+        if not literal_queries.add(compiled_query, is_owner_document_by_query[compiled_query.query]):
+            other_queries.append(compiled_query)
+    combined_pattern = _combine_patterns(other_queries, is_owner_document_by_query) if other_queries else None
+
+    attributes = []
+    for attribute in iter_reference_attributes(root):
+        content = attribute[4]
+        for query, match in literal_queries.search(content):
+            references_by_query[query].append(_to_reference(document_path, attribute, match))
+        if combined_pattern is not None and combined_pattern.search(content):
+            for compiled_query in other_queries:
+                query = compiled_query.query
+                match, indirect_match = compiled_query.search(content, is_owner_document_by_query[query])
+                for match, references in [(match, references_by_query[query]),
+                                          (indirect_match, indirect_references_by_query[query])]:
+                    if match:
+                        references.append(_to_reference(document_path, attribute, match.group(0)))
+        attributes.append(attribute)
+
+    # Indirect references are only returned with a direct reference,
+    # so they're only searched for in a second pass for queries with one.
+    indirect_queries = [q for q in literal_queries.indirect_queries if references_by_query[q]]
+    if indirect_queries:
+        for attribute in attributes:
+            for query, match in _search_indirect(attribute[4], indirect_queries):
+                indirect_references_by_query[query].append(_to_reference(document_path, attribute, match))
+
+    for query, references in references_by_query.items():
+        if len(references):
+            references.extend(indirect_references_by_query[query])
+    return references_by_query
+
+
+class _LiteralQueries:
+    """Queries without regular expression special characters,
+    whose direct patterns only match ``Document#Object.Property`` as is,
+    and whose owner and indirect patterns only match ``Property`` as a whole word.
+    """
+
+    def __init__(self) -> None:
+        # Document, then text following #, then queries.
+        self.queries_by_after_by_document: Dict[str, Dict[str, List[Query]]] = {}
+        self.document_lengths: List[int] = []
+        self.after_lengths_by_document: Dict[str, List[int]] = {}
+        self.owner_queries_by_word: Dict[str, List[Query]] = {}
+        self.indirect_queries: List[Query] = []
+
+    def add(self, compiled_query: CompiledQuery, is_owner_document: bool) -> bool:
+        """Adds compiled_query, and returns whether it's literal."""
+        query = compiled_query.query
+        if is_owner_document:
+            # Matches the owner pattern of CompiledQuery, including queries without a property.
+            word = str(query.property_name)
+            if not (is_literal(word) and WORD_PATTERN.fullmatch(word)):
+                return False
+            self.owner_queries_by_word.setdefault(word, []).append(query)
+            return True
+        literals = [query.document, query.object_name] + ([query.property_name] if query.property_name else [])
+        if not all(map(is_literal, literals)):
+            return False
+        if query.property_name and not WORD_PATTERN.fullmatch(query.property_name):
+            return False
+        document, after = str(query).split('#', 1)
+        if document not in self.queries_by_after_by_document:
+            self.queries_by_after_by_document[document] = {}
+            self.after_lengths_by_document[document] = []
+            if len(document) not in self.document_lengths:
+                self.document_lengths.append(len(document))
+        self.queries_by_after_by_document[document].setdefault(after, []).append(query)
+        if len(after) not in self.after_lengths_by_document[document]:
+            self.after_lengths_by_document[document].append(len(after))
+        if query.property_name:
+            self.indirect_queries.append(query)
+        return True
+
+    def search(self, content: str) -> Iterator[Tuple[Query, str]]:
+        """Yields (query, matched text) pairs of queries with a direct or owner match in content."""
+        if self.queries_by_after_by_document:
+            yield from self._search_direct(content)
+        if self.owner_queries_by_word:
+            words = set(WORD_PATTERN.findall(content))
+            for word in words & self.owner_queries_by_word.keys():
+                for query in self.owner_queries_by_word[word]:
+                    yield query, word
+
+    def _search_direct(self, content: str) -> Iterator[Tuple[Query, str]]:
+        found = set()
+        index = content.find('#')
+        while index != -1:
+            for document_length in self.document_lengths:
+                if document_length > index:
+                    continue
+                document = content[index - document_length:index]
+                queries_by_after = self.queries_by_after_by_document.get(document)
+                if queries_by_after is None:
+                    continue
+                for after_length in self.after_lengths_by_document[document]:
+                    queries = queries_by_after.get(content[index + 1:index + 1 + after_length])
+                    for query in queries or []:
+                        if query not in found:
+                            found.add(query)
+                            yield query, str(query)
+            index = content.find('#', index + 1)
+
+
+def _search_indirect(content: str, queries: List[Query]) -> Iterator[Tuple[Query, str]]:
+    """Yields (query, property) pairs of the same first indirect match as ``CompiledQuery.search_indirect``
+    for each literal query with an indirect match in content.
+    """
+    queries_by_word: Dict[str, List[Query]] = {}
+    for query in queries:
+        queries_by_word.setdefault(query.property_name, []).append(query)
+    found = set()
+    for match in WORD_PATTERN.finditer(content):
+        for query in queries_by_word.get(match.group(0), []):
+            if query not in found and not content.endswith(str(query), 0, match.end()):
+                found.add(query)
+                yield query, match.group(0)
+
+
+def _to_reference(document_path: str,
+                  attribute: Tuple[str, str, str, str, str, str, Optional[Tuple[int, ...]]],
+                  match: str) -> Reference:
+    object_name, property_name, reference_attribute, location, content, xpath, locator = attribute
+    return Reference(document_path,
+                     object_name,
+                     property_name,
+                     reference_attribute,
+                     location,
+                     match,
+                     content,
+                     xpath,
+                     locator)
+
+
+def _combine_patterns(compiled_queries: List[CompiledQuery],
+                      is_owner_document_by_query: Dict[Query, bool]) -> Pattern:
+    alternatives = []
+    for compiled_query in compiled_queries:
+        if is_owner_document_by_query[compiled_query.query]:
+            alternatives.append(compiled_query.owner_pattern.pattern)
+        else:
+            alternatives.append(compiled_query.direct_pattern.pattern)
+            if compiled_query.indirect_pattern is not None:
+                alternatives.append(compiled_query.indirect_pattern.pattern)
+    return re.compile('|'.join('(?:{})'.format(a) for a in dict.fromkeys(alternatives)))
@@ -1,14 +1,17 @@
 import logging
 from re import Pattern
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 from xml.etree.ElementTree import Element
 
-from .match import Match
+from ..copy_on_write import Locator, find_indexed, iter_indexed
+from .compiled_query import CompiledQuery
+from .property_scanner import scanner_by_property_name
 from .reference import Reference
-from .xml_property import XMLProperty
-from .xml_property_name import XMLPropertyName
 
-__all__ = ['find_references_in_root']
+__all__ = ['find_query_references',
+           'find_query_references_in_root',
+           'find_references_in_root',
+           'iter_reference_attributes']
 
 logger = logging.getLogger(__name__)
 
@@ -16,88 +19,107 @@ def find_references_in_root(document_path: str,
                             root: Element,
                             pattern: Pattern) -> List[Reference]:
     references = []
-    xpath_template = "ObjectData/Object[@name='{}']/Properties/Property[@name='{}']"
-
-    object_data = root.find('ObjectData')
-    for object in object_data.findall('Object'):
-        properties_element = object.find('Properties')
-        object_name = object.attrib['name']
-        logger.debug(f"Checking ObjectData/Object[@name='{object_name}']")
-
-        for property_element in properties_element.findall('Property'):
-            property_element_name = property_element.attrib['name']
-            property_xpath = xpath_template.format(
-                object_name, property_element_name)
-            matches = find_matches(property_element, pattern)
-            for match in matches:
-                xpath = property_xpath + '/' + match.location_xpath
-                reference = Reference(document_path,
-                              object_name,
-                              property_element_name,
-                              match.reference_attribute,
-                              match.location,
-                              match.matched_text,
-                              match.content,
-                              xpath)
-                logger.debug(f'Found {repr(reference)}')
-                references.append(reference)
+    for attribute in iter_reference_attributes(root):
+        object_name, property_name, reference_attribute, location, content, xpath, locator = attribute
+        match = pattern.search(content)
+        if match:
+            reference = Reference(document_path,
+                                  object_name,
+                                  property_name,
+                                  reference_attribute,
+                                  location,
+                                  match.group(0),
+                                  content,
+                                  xpath,
+                                  locator)
+            logger.debug(f'Found {repr(reference)}')
+            references.append(reference)
     return references
 
 
-def find_matches(property_element: Element,
-                 pattern: Pattern) -> List[Match]:
-    property_element_name = property_element.attrib['name']
-    if does_property_have_potential_references(property_element_name):
-        logger.debug(f"Checking   Properties/Property[@name='{property_element_name}']")
-        xml_property = create_xml_property(property_element)
-        return xml_property.find_matches(pattern)
-    else:
-        return []
+def find_query_references_in_root(document_path: str,
+                                  root: Element,
+                                  compiled_query: CompiledQuery) -> List[Reference]:
+    """Returns the same references as ``find_references_in_root``
+    with the direct pattern followed by the indirect pattern of compiled_query,
+    walking root once.
+    """
+    is_owner_document = compiled_query.matches_document(document_path, root)
+    return find_query_references(document_path,
+                                 iter_reference_attributes(root),
+                                 compiled_query,
+                                 is_owner_document)
+
 
+def find_query_references(document_path: str,
+                          attributes: Iterable[Tuple[str, str, str, str, str, str, Optional[Locator]]],
+                          compiled_query: CompiledQuery,
+                          is_owner_document: bool) -> List[Reference]:
+    """Returns references to compiled_query in attributes,
+    which are tuples like those yielded by ``iter_reference_attributes``.
 
-def create_xml_property(property_element: Element) -> XMLProperty:
+    Indirect references are only returned when there's a direct reference,
+    and follow the direct references.
     """
-    XML Examples::
+    references = []
+    indirect_references = []
+    for attribute in attributes:
+        object_name, property_name, reference_attribute, location, content, xpath, locator = attribute
+        match, indirect_match = compiled_query.search(content, is_owner_document)
+        for match, matches in [(match, references), (indirect_match, indirect_references)]:
+            if match:
+                reference = Reference(document_path,
+                                      object_name,
+                                      property_name,
+                                      reference_attribute,
+                                      location,
+                                      match.group(0),
+                                      content,
+                                      xpath,
+                                      locator)
+                logger.debug(f'Found {repr(reference)}')
+                matches.append(reference)
+    if len(references):
+        references.extend(indirect_references)
+    return references
 
-        <Property name="cells" type="Spreadsheet::PropertySheet" status="67108864">
-            <Cells Count="4" xlink="1">
-                <Cell address="B1" content="=Main#Spreadsheet.Value" alias="Value" />
-            </Cells>
-        </Property>
-        <Property name="ExpressionEngine" type="App::PropertyExpressionEngine" status="67108864">
-            <ExpressionEngine count="2" xlink="1">
-                <Expression path="Radius" expression="Main#Spreadsheet.Value" />
-            </ExpressionEngine>
-        </Property>    
 
-    +--------------------+---------------------+--------------------+----------------------+--------------------+
-    | property_name      | nested_element_name | child_element_name | reference_attributes | location_attribute |
-    +====================+=====================+====================+======================+====================+
-    | cells              | Cells               | Cell               | [content, alias]     | address            |
-    +--------------------+---------------------+--------------------+----------------------+--------------------+
-    | ExpressionEngine   | ExpressionEngine    | Expression         | [expression]         | path               |
-    +--------------------+---------------------+--------------------+----------------------+--------------------+
+def iter_reference_attributes(root: Element) -> Iterator[Tuple[str, str, str, str, str, str, Locator]]:
+    """Yields (object name, property name, reference attribute, location, content, xpath, locator) tuples
+    for each attribute with potential references in root.
 
-    FreeCAD Source:
-    * `Property <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/App/PropertyContainer.cpp#L221-L310>`_
-    * `Cells <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/Mod/Spreadsheet/App/PropertySheet.cpp#L277-L304>`_
-    * `Expression Engine <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/App/PropertyExpressionEngine.cpp#L163-L185>`_
+    Locators are child indices from root to the element with the attribute.
+    Root may also be a ``SlimDocument``.
     """
-    property_element_name = property_element.attrib['name']
-    if property_element_name == XMLPropertyName.cells.value:
-        return XMLProperty(property_element,
-                           nested_element_name='Cells',
-                           child_element_name='Cell',
-                           reference_attributes=['content', 'alias'],
-                           location_attribute='address')
-    elif property_element_name == XMLPropertyName.ExpressionEngine.value:
-        return XMLProperty(property_element,
-                           nested_element_name='ExpressionEngine',
-                           child_element_name='Expression',
-                           reference_attributes=['expression'],
-                           location_attribute='path')
-    return None
+    if not isinstance(root, Element):
+        yield from root.iter_reference_attributes()
+        return
+    xpath_template = "ObjectData/Object[@name='{}']/Properties/Property[@name='{}']"
 
+    object_data_index, object_data = find_indexed(root, 'ObjectData')
+    for object_index, object in iter_indexed(object_data, 'Object'):
+        properties_index, properties_element = find_indexed(object, 'Properties')
+        object_name = object.attrib['name']
+        logger.debug(f"Checking ObjectData/Object[@name='{object_name}']")
 
-def does_property_have_potential_references(property_element_name: str) -> bool:
-    return any([p for p in list(XMLPropertyName) if property_element_name == p.value])
+        for property_index, property_element in iter_indexed(properties_element, 'Property'):
+            property_element_name = property_element.attrib['name']
+            scanner = scanner_by_property_name.get(property_element_name)
+            if scanner is None:
+                continue
+            logger.debug(f"Checking   Properties/Property[@name='{property_element_name}']")
+            property_xpath = xpath_template.format(object_name, property_element_name) + '/'
+            nested_index, nested_element = find_indexed(property_element, scanner.nested_element_name)
+            nested_locator = (object_data_index, object_index, properties_index, property_index, nested_index)
+            for child_index, child_element in iter_indexed(nested_element, scanner.child_element_name):
+                attrib = child_element.attrib
+                for reference_attribute in scanner.reference_attributes:
+                    if reference_attribute in attrib:
+                        location = attrib[scanner.location_attribute]
+                        yield (object_name,
+                               property_element_name,
+                               reference_attribute,
+                               location,
+                               attrib[reference_attribute],
+                               property_xpath + scanner.location_xpath_template.format(location),
+                               nested_locator + (child_index,))
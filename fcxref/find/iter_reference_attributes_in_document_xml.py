@@ -0,0 +1,116 @@
+import logging
+from typing import BinaryIO, Iterator, Tuple
+from xml.etree import ElementTree
+
+from ..copy_on_write import Locator
+from .property_scanner import scanner_by_property_name
+
+__all__ = ['iter_reference_attributes_in_document_xml']
+
+logger = logging.getLogger(__name__)
+
+# Depths of elements in Document.xml, where the Document element has a depth of 1.
+#
+#   Document/ObjectData/Object/Properties/Property/Cells/Cell
+#   1        2          3      4          5        6     7
+OBJECT_DATA_DEPTH = 2
+OBJECT_DEPTH = 3
+PROPERTIES_DEPTH = 4
+PROPERTY_DEPTH = 5
+NESTED_DEPTH = 6
+CHILD_DEPTH = 7
+
+
+def iter_reference_attributes_in_document_xml(
+        source: BinaryIO) -> Iterator[Tuple[str, str, str, str, str, str, Locator]]:
+    """Yields the same tuples, in the same order, as ``iter_reference_attributes``
+    for the root of the ``Document.xml`` source, without building the full element tree.
+
+    Elements are detached from their parent as soon as they end,
+    so at most one element of each depth is held in memory at a time.
+    """
+    xpath_template = "ObjectData/Object[@name='{}']/Properties/Property[@name='{}']/"
+    path = []
+    # Number of children seen so far of each element in path.
+    child_counts = [0]
+    indices = []
+
+    seen_object_data = False
+    in_object_data = False
+    seen_properties = False
+    in_properties = False
+    object_name = None
+    property_name = None
+    scanner = None
+    nested_tag = None
+
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            indices.append(child_counts[-1])
+            child_counts[-1] += 1
+            child_counts.append(0)
+            path.append(element)
+            depth = len(path)
+            tag = element.tag
+            if depth == OBJECT_DATA_DEPTH:
+                # Only the first ObjectData element is searched.
+                in_object_data = tag == 'ObjectData' and not seen_object_data
+                seen_object_data = seen_object_data or in_object_data
+            elif not in_object_data:
+                continue
+            elif depth == OBJECT_DEPTH and tag == 'Object':
+                object_name = element.attrib['name']
+                seen_properties = False
+                logger.debug(f"Checking ObjectData/Object[@name='{object_name}']")
+            elif depth == PROPERTIES_DEPTH and object_name is not None and tag == 'Properties':
+                # Only the first Properties element of an object is searched.
+                in_properties = not seen_properties
+                seen_properties = True
+            elif depth == PROPERTY_DEPTH and in_properties and tag == 'Property':
+                property_name = element.attrib['name']
+                scanner = scanner_by_property_name.get(property_name)
+                nested_tag = None
+                if scanner is not None:
+                    logger.debug(f"Checking   Properties/Property[@name='{property_name}']")
+            elif (depth == NESTED_DEPTH and
+                  scanner is not None and
+                  nested_tag is None and
+                  tag == scanner.nested_element_name):
+                nested_tag = tag
+            continue
+
+        depth = len(path)
+        if (depth == CHILD_DEPTH and
+                nested_tag and
+                path[-2].tag == nested_tag and
+                element.tag == scanner.child_element_name):
+            attrib = element.attrib
+            for reference_attribute in scanner.reference_attributes:
+                if reference_attribute in attrib:
+                    location = attrib[scanner.location_attribute]
+                    yield (object_name,
+                           property_name,
+                           reference_attribute,
+                           location,
+                           attrib[reference_attribute],
+                           (xpath_template.format(object_name, property_name) +
+                            scanner.location_xpath_template.format(location)),
+                           tuple(indices[1:]))
+        elif depth == NESTED_DEPTH and element.tag == nested_tag:
+            # Only the first nested element of a property is searched.
+            nested_tag = ''
+        elif depth == PROPERTY_DEPTH:
+            property_name = None
+            scanner = None
+        elif depth == PROPERTIES_DEPTH:
+            in_properties = False
+        elif depth == OBJECT_DEPTH:
+            object_name = None
+        elif depth == OBJECT_DATA_DEPTH:
+            in_object_data = False
+
+        path.pop()
+        indices.pop()
+        child_counts.pop()
+        if path:
+            path[-1].remove(element)
@@ -0,0 +1,43 @@
+import logging
+from typing import Callable, Dict, List, Optional
+
+from ..document_cache import DocumentCache
+from ..document_roots import DocumentRoots, iter_document_roots
+from ..prefilter import QueriesPrefilter
+from ..profiler import phase
+from .compiled_query import CompiledQuery
+from .find_many_in_root import find_many_in_root
+from .query import Query
+from .reference import Reference
+
+__all__ = ['make_find_many']
+
+logger = logging.getLogger(__name__)
+
+
+def make_find_many(find_root_by_document_path: Callable[..., DocumentRoots]):
+    def find_many(base_path: str,
+                  queries: List[Query],
+                  jobs: int = 1,
+                  cache: Optional[DocumentCache] = None) -> Dict[Query, List[Reference]]:
+        """Returns a dictionary where keys are queries,
+        and values are the same references ``find`` returns for each query.
+
+        Each document is loaded and walked once for all queries.
+        """
+        references_by_query = {query: [] for query in queries}
+        compiled_queries = [CompiledQuery(query) for query in queries]
+        prefilter = QueriesPrefilter(queries)
+        root_by_document_path = find_root_by_document_path(base_path,
+                                                           jobs=jobs,
+                                                           cache=cache,
+                                                           prefilter=prefilter)
+        logger.debug(f'Finding references to {len(queries)} queries in base path {base_path}')
+        for document_path, root in iter_document_roots(root_by_document_path):
+            logger.debug(f'Checking document {document_path}')
+            with phase('match', document_path):
+                references_by_query_in_document = find_many_in_root(document_path, root, compiled_queries)
+            for query, references in references_by_query_in_document.items():
+                references_by_query[query].extend(references)
+        return references_by_query
+    return find_many
@@ -0,0 +1,38 @@
+import logging
+from typing import Callable, Iterator, Optional
+
+from ..document_cache import DocumentCache
+from ..document_roots import DocumentRoots, iter_document_roots
+from ..prefilter import QueryPrefilter
+from ..profiler import phase
+from .compiled_query import CompiledQuery
+from .find_references_in_root import find_query_references_in_root
+from .query import Query
+from .reference import Reference
+
+__all__ = ['make_iter_find']
+
+logger = logging.getLogger(__name__)
+
+
+def make_iter_find(find_root_by_document_path: Callable[..., DocumentRoots]):
+    def iter_find(base_path: str,
+                  query: Query,
+                  jobs: int = 1,
+                  cache: Optional[DocumentCache] = None) -> Iterator[Reference]:
+        """Yields references to query document by document,
+        as soon as each document is checked.
+        """
+        compiled_query = CompiledQuery(query)
+        prefilter = QueryPrefilter(query)
+        root_by_document_path = find_root_by_document_path(base_path,
+                                                           jobs=jobs,
+                                                           cache=cache,
+                                                           prefilter=prefilter)
+        logger.debug(f'Finding references in base path {base_path}')
+        for document_path, root in iter_document_roots(root_by_document_path):
+            logger.debug(f'Checking document {document_path}')
+            with phase('match', document_path):
+                references = find_query_references_in_root(document_path, root, compiled_query)
+            yield from references
+    return iter_find
@@ -0,0 +1,47 @@
+import logging
+from functools import partial
+from typing import Callable, Iterator, List
+from zipfile import ZipFile
+
+from ..process_map import catch_document_errors, iter_document_results, process_map
+from ..profiler import phase
+from .compiled_query import CompiledQuery
+from .find_references_in_root import find_query_references
+from .iter_reference_attributes_in_document_xml import \
+    iter_reference_attributes_in_document_xml
+from .query import Query
+from .reference import Reference
+
+__all__ = ['make_stream_find']
+
+logger = logging.getLogger(__name__)
+
+
+def make_stream_find(find_document_paths: Callable[[str], List[str]]):
+    """Makes a find function which streams each ``Document.xml``
+    instead of building its full element tree.
+    """
+    def find(base_path: str, query: Query, jobs: int = 1) -> Iterator[Reference]:
+        """Yields references to query document by document,
+        as soon as each document is streamed.
+        """
+        document_paths = find_document_paths(base_path)
+        logger.debug(f'Finding references in base path {base_path}')
+        find_references_in_document = partial(_find_references_in_document,
+                                              compiled_query=CompiledQuery(query))
+        results = process_map(find_references_in_document, document_paths, jobs)
+        for _, references in iter_document_results(document_paths, results):
+            yield from references
+    return find
+
+
+@catch_document_errors(default=[])
+def _find_references_in_document(document_path: str, compiled_query: CompiledQuery) -> List[Reference]:
+    logger.debug(f'Checking document {document_path}')
+    is_owner_document = compiled_query.matches_document(document_path)
+    with phase('match', document_path):
+        with ZipFile(document_path, 'r') as archive, archive.open('Document.xml') as source:
+            return find_query_references(document_path,
+                                         iter_reference_attributes_in_document_xml(source),
+                                         compiled_query,
+                                         is_owner_document)
@@ -0,0 +1,83 @@
+from typing import Dict, Tuple
+
+from .xml_property_name import XMLPropertyName
+
+__all__ = ['register_property_scanner', 'scanner_by_property_name', 'PropertyScanner']
+
+
+class PropertyScanner:
+    """Describes where to find potential references in a property.
+
+    XML Examples::
+
+        <Property name="cells" type="Spreadsheet::PropertySheet" status="67108864">
+            <Cells Count="4" xlink="1">
+                <Cell address="B1" content="=Main#Spreadsheet.Value" alias="Value" />
+            </Cells>
+        </Property>
+        <Property name="ExpressionEngine" type="App::PropertyExpressionEngine" status="67108864">
+            <ExpressionEngine count="2" xlink="1">
+                <Expression path="Radius" expression="Main#Spreadsheet.Value" />
+            </ExpressionEngine>
+        </Property>
+
+    +--------------------+---------------------+--------------------+----------------------+--------------------+
+    | property_name      | nested_element_name | child_element_name | reference_attributes | location_attribute |
+    +====================+=====================+====================+======================+====================+
+    | cells              | Cells               | Cell               | (content, alias)     | address            |
+    +--------------------+---------------------+--------------------+----------------------+--------------------+
+    | ExpressionEngine   | ExpressionEngine    | Expression         | (expression,)        | path               |
+    +--------------------+---------------------+--------------------+----------------------+--------------------+
+
+    FreeCAD Source:
+    * `Property <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/App/PropertyContainer.cpp#L221-L310>`_
+    * `Cells <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/Mod/Spreadsheet/App/PropertySheet.cpp#L277-L304>`_
+    * `Expression Engine <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/App/PropertyExpressionEngine.cpp#L163-L185>`_
+    """
+    __slots__ = ('nested_element_name',
+                 'child_element_name',
+                 'reference_attributes',
+                 'location_attribute',
+                 'location_xpath_template')
+
+    def __init__(self,
+                 nested_element_name: str,
+                 child_element_name: str,
+                 reference_attributes: Tuple[str, ...],
+                 location_attribute: str) -> None:
+        self.nested_element_name = nested_element_name
+        self.child_element_name = child_element_name
+        self.reference_attributes = tuple(reference_attributes)
+        self.location_attribute = location_attribute
+        self.location_xpath_template = "{}/{}[@{}='{{}}']".format(
+            nested_element_name, child_element_name, location_attribute)
+
+    def __repr__(self):
+        return 'PropertyScanner({!r}, {!r}, {!r}, {!r})'.format(self.nested_element_name,
+                                                                 self.child_element_name,
+                                                                 self.reference_attributes,
+                                                                 self.location_attribute)
+
+
+scanner_by_property_name: Dict[str, PropertyScanner] = {}
+
+
+def register_property_scanner(property_name: str, scanner: PropertyScanner) -> None:
+    """Registers where to find potential references in properties named property_name.
+
+    Scanners registered after documents are loaded in worker processes
+    aren't seen by those processes, so register scanners at import time.
+    """
+    scanner_by_property_name[property_name] = scanner
+
+
+register_property_scanner(XMLPropertyName.cells.value,
+                          PropertyScanner(nested_element_name='Cells',
+                                          child_element_name='Cell',
+                                          reference_attributes=('content', 'alias'),
+                                          location_attribute='address'))
+register_property_scanner(XMLPropertyName.ExpressionEngine.value,
+                          PropertyScanner(nested_element_name='ExpressionEngine',
+                                          child_element_name='Expression',
+                                          reference_attributes=('expression',),
+                                          location_attribute='path'))
@@ -1,5 +1,7 @@
 from typing import Optional
+from xml.etree.ElementTree import Element
 
+from ..label import extract_label, find_document_label, is_label, label_index
 from .extract_document import extract_document
 
 __all__ = ['Query']
@@ -32,7 +34,22 @@ class Query:
             regex += '\.' + self.property_name
         return regex
 
-    def matches_document(self, document_path: str) -> bool:
+    def matches_document(self,
+                         document_path: str,
+                         root: Optional[Element] = None,
+                         document_xml: Optional[bytes] = None) -> bool:
+        """Returns whether the document at document_path owns the query.
+
+        When the query's document is a label (e.g. ``<<My Document>>``),
+        the label is read from root, the start of document_xml when root isn't passed,
+        or the start of the document when neither are passed.
+        """
+        if is_label(self.document):
+            if root is not None:
+                label = find_document_label(root)
+            else:
+                label = label_index.document_label(document_path, document_xml)
+            return label == extract_label(self.document)
         return self.document == extract_document(document_path)
 
     def __str__(self):
@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 from .extract_document import extract_document
 
 __all__ = ['Reference']
@@ -13,7 +15,8 @@ class Reference:
                  location: str,
                  match: str,
                  content: str,
-                 xpath: str) -> None:
+                 xpath: str,
+                 locator: Optional[Tuple[int, ...]] = None) -> None:
         self.document_path = document_path
         self.object_name = object_name
         self.property_name = property_name
@@ -22,6 +25,9 @@ class Reference:
         self.match = match
         self.content = content
         self.xpath = xpath
+        # Child indices from the root the reference was found in, if known.
+        # Not compared for equality since references found by other means don't have one.
+        self.locator = locator
 
     def __str__(self):
         return self._to_string()
@@ -0,0 +1,162 @@
+import logging
+import os
+import re
+from io import BytesIO
+from typing import IO, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+from zipfile import ZipFile
+
+from .process_map import DOCUMENT_ERRORS
+
+__all__ = [
+    'extract_label',
+    'find_document_label',
+    'index_objects',
+    'is_label',
+    'read_document_label',
+    'LabelIndex',
+    'ObjectIndex'
+]
+
+logger = logging.getLogger(__name__)
+
+LABEL_PATTERN = re.compile('<<(.*)>>')
+
+
+def is_label(object_name: str) -> bool:
+    return (
+        object_name.startswith('<<') and
+        object_name.endswith('>>')
+    )
+
+
+def extract_label(object_name: str) -> str:
+    match = LABEL_PATTERN.match(object_name)
+    if not match:
+        return object_name
+    return match.group(1)
+
+
+def read_document_label(source: IO[bytes]) -> Optional[str]:
+    """Returns the document label from a ``Document.xml`` file object,
+    parsing only up to the end of the document's ``Properties`` element.
+
+    The document label comes before objects, near the start of ``Document.xml``::
+
+        <Document SchemaVersion="4" ProgramVersion="0.19R24276 (Git)" FileVersion="1">
+            <Properties Count="14" TransientCount="3">
+                <Property name="Label" type="App::PropertyString" status="1">
+                    <String value="Master"/>
+                </Property>
+            </Properties>
+            <Objects Count="1">
+    """
+    depth = 0
+    in_label_property = False
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if depth == 3 and element.tag == 'Property':
+                in_label_property = element.attrib.get('name') == 'Label'
+            elif depth == 4 and in_label_property and 'value' in element.attrib:
+                return element.attrib['value']
+        else:
+            depth -= 1
+            if depth == 1 and element.tag == 'Properties':
+                return None
+    return None
+
+
+def find_document_label(root: Element) -> Optional[str]:
+    """Returns the document label from a ``Document.xml`` root element, or a ``SlimDocument``."""
+    if not isinstance(root, Element):
+        return root.label
+    return _find_label(root.find("Properties/Property[@name='Label']"))
+
+
+class LabelIndex:
+    """Document labels by document filepath,
+    read with ``read_document_label`` and kept until documents change.
+    """
+
+    def __init__(self) -> None:
+        self._entry_by_document_path: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
+
+    def document_label(self, document_path: str, document_xml: Optional[bytes] = None) -> Optional[str]:
+        """Returns the label of the document at document_path,
+        or ``None`` when it can't be read.
+
+        When its ``Document.xml`` was already read, pass it as document_xml.
+        The label is then read from document_xml instead of the archive, and kept for later lookups.
+        """
+        try:
+            stat = os.stat(document_path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        if document_xml is None:
+            if key is None:
+                return None
+            entry = self._entry_by_document_path.get(document_path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+        try:
+            if document_xml is not None:
+                label = read_document_label(BytesIO(document_xml))
+            else:
+                with ZipFile(document_path, 'r') as archive, archive.open('Document.xml') as source:
+                    label = read_document_label(source)
+        except DOCUMENT_ERRORS as error:
+            logger.debug('Failed to read label of {}: {}'.format(document_path, error))
+            return None
+        if key is not None:
+            self._entry_by_document_path[document_path] = (key, label)
+        return label
+
+
+label_index = LabelIndex()
+
+
+class ObjectIndex:
+    """``ObjectData/Object`` elements of a document by object name and label."""
+
+    def __init__(self, root: Element) -> None:
+        self.object_by_name: Dict[str, Element] = {}
+        self.object_by_label: Dict[str, Element] = {}
+        object_data = root.find('ObjectData')
+        if object_data is None:
+            return
+        for object_element in object_data.iterfind('Object'):
+            self.object_by_name.setdefault(object_element.attrib.get('name'), object_element)
+            label = _find_label(object_element.find("Properties/Property[@name='Label']"))
+            if label is not None:
+                self.object_by_label.setdefault(label, object_element)
+
+    def find(self, object_name: str) -> Optional[Element]:
+        """Returns the first object named object_name, or labeled ``<<Label>>``."""
+        if is_label(object_name):
+            return self.object_by_label.get(extract_label(object_name))
+        return self.object_by_name.get(object_name)
+
+
+_object_index_by_root: 'WeakKeyDictionary[Element, ObjectIndex]' = WeakKeyDictionary()
+
+
+def index_objects(root: Element) -> ObjectIndex:
+    """Returns the object index of root, built once per root."""
+    object_index = _object_index_by_root.get(root)
+    if object_index is None:
+        object_index = ObjectIndex(root)
+        _object_index_by_root[root] = object_index
+    return object_index
+
+
+def _find_label(label_property: Optional[Element]) -> Optional[str]:
+    if label_property is None:
+        return None
+    for child in label_property:
+        if 'value' in child.attrib:
+            return child.attrib['value']
+    return None
@@ -0,0 +1,152 @@
+import logging
+import re
+from io import BytesIO
+from re import Pattern
+from typing import List, Optional, Union
+from xml.etree.ElementTree import ParseError
+from xml.sax.saxutils import escape
+
+from .find.query import Query
+from .label import read_document_label
+
+__all__ = ['escape_attribute', 'is_literal', 'LabelPrefilter', 'Prefilter', 'QueriesPrefilter', 'QueryPrefilter']
+
+logger = logging.getLogger(__name__)
+
+REGEX_SPECIAL_CHARACTERS = set('.^$*+?{}[]\\|()')
+
+# FreeCAD writes apostrophes in attribute values as &apos;, and ElementTree writes them as is.
+APOSTROPHE_PATTERN = b"(?:'|&apos;)"
+
+Token = Union[bytes, Pattern]
+
+
+class Prefilter:
+    """Skips parsing documents whose raw ``Document.xml`` bytes
+    don't contain every literal token a match requires.
+
+    Tokens are XML text, so attribute values in tokens must be escaped with ``escape_attribute``.
+    Non-ASCII tokens are left out since they may be written as character references.
+    Apostrophes may be written as ``'`` or ``&apos;``,
+    so tokens containing them are searched for with a pattern matching either.
+    Counts of parsed and skipped documents are kept in ``parsed`` and ``skipped``.
+    """
+
+    def __init__(self, tokens: List[str]) -> None:
+        self.tokens = _encode_tokens(tokens)
+        self.parsed = 0
+        self.skipped = 0
+
+    def matches(self, document_path: str, document_xml: bytes) -> bool:
+        return all(_contains(document_xml, token) for token in self.tokens_for(document_path, document_xml))
+
+    def tokens_for(self, document_path: str, document_xml: bytes) -> List[Token]:
+        return self.tokens
+
+    def count(self, matched: bool) -> None:
+        if matched:
+            self.parsed += 1
+        else:
+            self.skipped += 1
+
+    def log_counts(self) -> None:
+        logger.debug('Parsed {} and skipped {} document(s) with {}.'.format(
+            self.parsed, self.skipped, repr(self)))
+
+    def __repr__(self):
+        return 'Prefilter({})'.format(self.tokens)
+
+
+class QueryPrefilter(Prefilter):
+    """Prefilter for references to a query.
+
+    The document, ``#``, object, and property must all appear in other documents,
+    and the property in the document owning the query.
+    The document, ``#``, and object are searched for as one token when neither contain
+    regular expression special characters.
+    """
+
+    def __init__(self, query: Query) -> None:
+        literals = [query.document, '#', query.object_name]
+        if all(map(is_literal, literals)):
+            literals = [''.join(literals)]
+        super().__init__(_escape_literals(literals + [query.property_name]))
+        self.query = query
+        self.owner_tokens = _encode_tokens(_escape_literals([str(query.property_name)]))
+
+    def tokens_for(self, document_path: str, document_xml: bytes) -> List[Token]:
+        if self.query.matches_document(document_path, document_xml=document_xml):
+            return self.owner_tokens
+        return self.tokens
+
+    def __repr__(self):
+        return 'QueryPrefilter({})'.format(self.query)
+
+
+class QueriesPrefilter(Prefilter):
+    """Prefilter for references to any of several queries."""
+
+    def __init__(self, queries: List[Query]) -> None:
+        super().__init__([])
+        self.prefilters = [QueryPrefilter(query) for query in queries]
+
+    def matches(self, document_path: str, document_xml: bytes) -> bool:
+        return any(p.matches(document_path, document_xml) for p in self.prefilters)
+
+    def __repr__(self):
+        return 'QueriesPrefilter({})'.format([p.query for p in self.prefilters])
+
+
+class LabelPrefilter(Prefilter):
+    """Prefilter for documents labeled label,
+    which only parses ``Document.xml`` up to the document label.
+    """
+
+    def __init__(self, label: str) -> None:
+        super().__init__([])
+        self.label = label
+
+    def matches(self, document_path: str, document_xml: bytes) -> bool:
+        try:
+            return read_document_label(BytesIO(document_xml)) == self.label
+        except ParseError:
+            # Parse the document, so the error is reported.
+            return True
+
+    def __repr__(self):
+        return 'LabelPrefilter({})'.format(self.label)
+
+
+def escape_attribute(value: str) -> str:
+    """Escapes value the same way as attribute values in ``Document.xml``."""
+    return escape(value, {'"': '&quot;'})
+
+
+def _escape_literals(literals: List[Optional[str]]) -> List[str]:
+    """Escapes literal parts of a query pattern,
+    leaving out parts with regular expression special characters since they may match different text.
+    """
+    return [escape_attribute(literal) for literal in literals if is_literal(literal)]
+
+
+def is_literal(string: Optional[str]) -> bool:
+    """Returns whether string is non-empty and has no regular expression special characters."""
+    return bool(string) and not REGEX_SPECIAL_CHARACTERS & set(string)
+
+
+def _encode_tokens(tokens: List[str]) -> List[Token]:
+    encoded_tokens = []
+    for token in tokens:
+        if not token.isascii():
+            continue
+        encoded_token = token.encode('ascii')
+        if b"'" in encoded_token:
+            encoded_token = re.compile(APOSTROPHE_PATTERN.join(map(re.escape, encoded_token.split(b"'"))))
+        encoded_tokens.append(encoded_token)
+    return encoded_tokens
+
+
+def _contains(document_xml: bytes, token: Token) -> bool:
+    if isinstance(token, bytes):
+        return token in document_xml
+    return token.search(document_xml) is not None
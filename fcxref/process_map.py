@@ -0,0 +1,72 @@
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from xml.etree.ElementTree import ParseError
+from zipfile import BadZipFile
+
+__all__ = ['catch_document_errors', 'iter_document_results', 'log_document_error', 'process_map', 'DOCUMENT_ERRORS']
+
+logger = logging.getLogger(__name__)
+
+# Errors raised reading or parsing a document which skip it instead of aborting.
+DOCUMENT_ERRORS = (OSError, BadZipFile, KeyError, ParseError)
+
+T = TypeVar('T')
+
+
+def process_map(function: Callable, iterable: List, jobs: int = 1) -> Iterator:
+    """Lazily maps function over iterable in a pool of ``jobs`` worker processes, preserving order.
+
+    Maps in the current process when ``jobs`` is 1,
+    and uses one worker process per CPU when ``jobs`` is 0.
+    At most twice as many results as workers are pending at once,
+    so memory stays bounded when results are consumed one at a time.
+    """
+    if jobs == 1 or len(iterable) < 2:
+        yield from map(function, iterable)
+        return
+    max_workers = jobs if jobs > 0 else os.cpu_count()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in iterable:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= max_workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def catch_document_errors(default: Any = None) -> Callable:
+    """Decorates a function of a document path to return a (result, error) pair,
+    so one unreadable document doesn't abort the others.
+
+    The pair is ``(default, str(error))`` when the function raises one of ``DOCUMENT_ERRORS``.
+    """
+    def decorate(function: Callable[..., T]) -> Callable[..., Tuple[T, Optional[str]]]:
+        @wraps(function)
+        def wrapper(document_path: str, *args, **kwargs) -> Tuple[T, Optional[str]]:
+            try:
+                return function(document_path, *args, **kwargs), None
+            except DOCUMENT_ERRORS as error:
+                return default, str(error)
+        return wrapper
+    return decorate
+
+
+def iter_document_results(document_paths: Iterable[str],
+                          results: Iterable[Tuple[T, Optional[str]]]) -> Iterator[Tuple[str, T]]:
+    """Yields (document filepath, result) pairs of (result, error) pairs,
+    logging and skipping documents with an error.
+    """
+    for document_path, (result, error) in zip(document_paths, results):
+        if error is not None:
+            log_document_error(document_path, error)
+            continue
+        yield document_path, result
+
+
+def log_document_error(document_path: str, error: str) -> None:
+    logger.error('Skipping document {}: {}'.format(document_path, error))
@@ -0,0 +1,214 @@
+import cProfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+__all__ = ['phase', 'DocumentStats', 'PhaseStats', 'ProfileStats', 'Profiler']
+
+MEBIBYTE = 1024 * 1024
+
+_NULL_CONTEXT = nullcontext()
+
+_active_profiler: Optional['Profiler'] = None
+
+
+class PhaseStats:
+    """Wall time in seconds, number of calls,
+    and peak traced memory in bytes (``None`` when memory isn't traced) of a phase.
+    """
+
+    def __init__(self, wall_time: float = 0.0, calls: int = 0, peak_memory: Optional[int] = None) -> None:
+        self.wall_time = wall_time
+        self.calls = calls
+        self.peak_memory = peak_memory
+
+    def add(self, wall_time: float, peak_memory: Optional[int]) -> None:
+        self.wall_time += wall_time
+        self.calls += 1
+        if peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, peak_memory)
+
+    def to_dict(self) -> dict:
+        return {'wall_time': self.wall_time, 'calls': self.calls, 'peak_memory': self.peak_memory}
+
+    def __repr__(self):
+        return 'PhaseStats(wall_time={!r}, calls={!r}, peak_memory={!r})'.format(
+            self.wall_time, self.calls, self.peak_memory)
+
+
+class DocumentStats:
+    """Stats of each phase for one document."""
+
+    def __init__(self, document_path: str) -> None:
+        self.document_path = document_path
+        self.phases: Dict[str, PhaseStats] = {}
+
+    @property
+    def wall_time(self) -> float:
+        return sum(phase_stats.wall_time for phase_stats in self.phases.values())
+
+    def to_dict(self) -> dict:
+        return {'document_path': self.document_path,
+                'wall_time': self.wall_time,
+                'phases': {name: phase_stats.to_dict() for name, phase_stats in self.phases.items()}}
+
+
+class ProfileStats:
+    """Stats of a profiled run, by phase and by document.
+
+    Phases are:
+
+    * ``walk`` - finding documents.
+    * ``decompress`` - reading ``Document.xml`` from documents.
+    * ``parse`` - building XML trees.
+    * ``match`` - finding references in XML trees.
+    * ``rename`` and ``remove`` - copying and editing XML trees.
+    * ``serialize`` - converting XML trees to bytes.
+    * ``write`` - writing documents.
+
+    Phases run in worker processes (when ``jobs`` isn't 1) aren't recorded.
+    """
+
+    def __init__(self) -> None:
+        self.wall_time = 0.0
+        self.peak_memory: Optional[int] = None
+        self.phases: Dict[str, PhaseStats] = {}
+        self.documents: Dict[str, DocumentStats] = {}
+
+    def slowest_documents(self, n: int = 10) -> List[DocumentStats]:
+        return sorted(self.documents.values(), key=lambda d: d.wall_time, reverse=True)[:n]
+
+    def to_dict(self, n: Optional[int] = None) -> dict:
+        """Returns stats as a JSON serializable dictionary,
+        with every document, or the n slowest documents.
+        """
+        documents = self.slowest_documents(len(self.documents) if n is None else n)
+        return {'wall_time': self.wall_time,
+                'peak_memory': self.peak_memory,
+                'phases': {name: phase_stats.to_dict() for name, phase_stats in self.phases.items()},
+                'documents': [document_stats.to_dict() for document_stats in documents]}
+
+    def format(self, n: int = 10) -> str:
+        """Returns a table of phases, followed by the n slowest documents."""
+        lines = ['{:<12} {:>8} {:>12} {:>18}'.format('Phase', 'Calls', 'Wall (s)', 'Peak memory (MiB)')]
+        for name, phase_stats in self.phases.items():
+            lines.append('{:<12} {:>8} {:>12.3f} {:>18}'.format(
+                name, phase_stats.calls, phase_stats.wall_time, _format_memory(phase_stats.peak_memory)))
+        lines.append('Total wall time: {:.3f} s'.format(self.wall_time))
+        if self.peak_memory is not None:
+            lines.append('Peak memory: {} MiB'.format(_format_memory(self.peak_memory)))
+        slowest_documents = self.slowest_documents(n)
+        if slowest_documents:
+            lines.append('Slowest {} document(s):'.format(len(slowest_documents)))
+            for document_stats in slowest_documents:
+                phases = ', '.join('{} {:.3f}'.format(name, phase_stats.wall_time)
+                                   for name, phase_stats in document_stats.phases.items())
+                lines.append('  {:>8.3f} s  {} ({})'.format(
+                    document_stats.wall_time, document_stats.document_path, phases))
+        return '\n'.join(lines)
+
+
+class Profiler:
+    """Records time and memory spent in each phase of the functions called while it's active.
+
+    .. code-block:: python
+
+        with Profiler() as profiler:
+            find(base_path, query)
+        print(profiler.stats.format())
+
+    Memory is traced with ``tracemalloc`` when ``trace_memory`` is true, which slows down phases.
+    ``tracemalloc`` has one peak for the whole process,
+    so it's only reset when a phase starts while no other phase is active.
+    The peak memory of phases nested in others, or run at the same time in other threads (e.g. by ``afind``),
+    includes memory allocated by those phases, so it's an upper bound.
+    A ``cProfile`` profile is written to ``pstats_path`` when it's passed.
+    Only one profiler may be active at a time.
+    """
+
+    def __init__(self, trace_memory: bool = True, pstats_path: Optional[str] = None) -> None:
+        self.trace_memory = trace_memory
+        self.pstats_path = pstats_path
+        self.stats = ProfileStats()
+        self._lock = threading.RLock()
+        self._active_phases = 0
+        self._started_tracing = False
+        self._profile: Optional[cProfile.Profile] = None
+        self._start = 0.0
+
+    def __enter__(self) -> 'Profiler':
+        global _active_profiler
+        if _active_profiler is not None:
+            raise RuntimeError('Another profiler is already active.')
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.pstats_path is not None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._start = time.perf_counter()
+        _active_profiler = self
+        return self
+
+    def __exit__(self, *args) -> None:
+        global _active_profiler
+        _active_profiler = None
+        self.stats.wall_time += time.perf_counter() - self._start
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.pstats_path)
+            self._profile = None
+        if self.trace_memory:
+            self._record_peak(tracemalloc.get_traced_memory()[1])
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str, document_path: Optional[str] = None) -> Iterator[None]:
+        if self.trace_memory:
+            with self._lock:
+                if self._active_phases == 0:
+                    self._record_peak(tracemalloc.get_traced_memory()[1])
+                    tracemalloc.reset_peak()
+                self._active_phases += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start
+            peak_memory = None
+            if self.trace_memory:
+                with self._lock:
+                    peak_memory = tracemalloc.get_traced_memory()[1]
+                    self._active_phases -= 1
+            self._record(name, document_path, wall_time, peak_memory)
+
+    def _record_peak(self, peak_memory: int) -> None:
+        with self._lock:
+            self.stats.peak_memory = max(self.stats.peak_memory or 0, peak_memory)
+
+    def _record(self, name: str, document_path: Optional[str], wall_time: float, peak_memory: Optional[int]) -> None:
+        if peak_memory is not None:
+            self._record_peak(peak_memory)
+        with self._lock:
+            self.stats.phases.setdefault(name, PhaseStats()).add(wall_time, peak_memory)
+            if document_path is not None:
+                document_stats = self.stats.documents.get(document_path)
+                if document_stats is None:
+                    document_stats = self.stats.documents[document_path] = DocumentStats(document_path)
+                document_stats.phases.setdefault(name, PhaseStats()).add(wall_time, peak_memory)
+
+
+def phase(name: str, document_path: Optional[str] = None) -> ContextManager[None]:
+    """Records a phase with the active ``Profiler``, or does nothing when no profiler is active."""
+    profiler = _active_profiler
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.phase(name, document_path)
+
+
+def _format_memory(memory: Optional[int]) -> str:
+    return '-' if memory is None else '{:.1f}'.format(memory / MEBIBYTE)
@@ -0,0 +1,239 @@
+import logging
+import os
+import posixpath
+import sqlite3
+from typing import Iterator, List, Optional, Tuple
+
+from .document_cache import read_document_key
+from .find.compiled_query import CompiledQuery
+from .find.find_references_in_root import find_query_references
+from .find.query import Query
+from .find.reference import Reference
+from .prefilter import is_literal
+from .process_map import log_document_error, process_map
+from .slim_document import load_slim_document
+from .walker import Walker
+
+__all__ = ['ReferenceIndex', 'INDEX_FILENAME']
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = '.fcxref.sqlite'
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    crc INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    id INTEGER PRIMARY KEY,
+    document_path TEXT NOT NULL REFERENCES documents (path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    object_name TEXT NOT NULL,
+    property_name TEXT NOT NULL,
+    reference_attribute TEXT NOT NULL,
+    location TEXT NOT NULL,
+    content TEXT NOT NULL,
+    xpath TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attributes_document_path ON attributes (document_path, position);
+CREATE TABLE IF NOT EXISTS separators (
+    reversed_before TEXT NOT NULL,
+    after TEXT NOT NULL,
+    attribute_id INTEGER NOT NULL REFERENCES attributes (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS separators_after ON separators (after, reversed_before);
+CREATE INDEX IF NOT EXISTS separators_attribute_id ON separators (attribute_id);
+"""
+
+# Characters of content kept on each side of a # separator.
+SEPARATOR_CONTEXT_LENGTH = 128
+
+MAX_CHARACTER = '\U0010ffff'
+
+ATTRIBUTE_COLUMNS = ', '.join('a.' + column for column in [
+    'object_name', 'property_name', 'reference_attribute', 'location', 'content', 'xpath'])
+
+Attribute = Tuple[str, str, str, str, str, str]
+
+
+class ReferenceIndex:
+    """SQLite index of reference-bearing attributes in documents in base_path,
+    and the text around each ``#`` separator in their content.
+
+    Document paths are stored relative to base_path with forward slashes,
+    so the index file can be copied to another checkout of the same documents.
+    """
+
+    def __init__(self, path: str, base_path: str) -> None:
+        self.path = path
+        self.base_path = base_path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self.connection.executescript("""
+                DROP TABLE IF EXISTS separators;
+                DROP TABLE IF EXISTS attributes;
+                DROP TABLE IF EXISTS documents;
+            """)
+            self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.connection.executescript(SCHEMA)
+
+    def update(self, walker: Optional[Walker] = None, jobs: int = 1) -> List[str]:
+        """Indexes new and changed documents, and removes deleted documents.
+
+        Documents whose modification time changed but whose ``Document.xml`` CRC and size didn't
+        aren't indexed again.
+
+        Returns paths of indexed and removed documents.
+        """
+        document_paths = (walker or Walker()).find_document_paths(self.base_path)
+        key_by_relative_path = {
+            row[0]: row[1:] for row in self.connection.execute(
+                'SELECT path, crc, size, mtime_ns FROM documents')
+        }
+        changed_document_paths = []
+        with self.connection:
+            for position, document_path in enumerate(document_paths):
+                relative_path = self._to_relative_path(document_path)
+                key = read_document_key(document_path)
+                if key is None:
+                    continue
+                indexed_key = key_by_relative_path.pop(relative_path, None)
+                if indexed_key is not None and list(indexed_key[:2]) == key[:2]:
+                    self.connection.execute(
+                        'UPDATE documents SET position = ?, mtime_ns = ? WHERE path = ?',
+                        (position, key[2], relative_path))
+                    continue
+                changed_document_paths.append((position, document_path, key))
+
+            removed_document_paths = list(key_by_relative_path.keys())
+            for relative_path in removed_document_paths:
+                self.connection.execute('DELETE FROM documents WHERE path = ?', (relative_path,))
+
+            paths = [document_path for _, document_path, _ in changed_document_paths]
+            results = process_map(_read_attributes, paths, jobs)
+            for (position, document_path, key), (attributes, error) in zip(changed_document_paths, results):
+                if error is not None:
+                    log_document_error(document_path, error)
+                    self.connection.execute('DELETE FROM documents WHERE path = ?',
+                                            (self._to_relative_path(document_path),))
+                    continue
+                logger.debug(f'Indexing {document_path}')
+                self._index_document(self._to_relative_path(document_path), position, key, attributes)
+        return paths + [self._to_document_path(p) for p in removed_document_paths]
+
+    def find(self, query: Query) -> List[Reference]:
+        """Returns the same references as ``find``, in the same order, from the index.
+
+        When query doesn't contain regular expression special characters,
+        only attributes with a ``#`` separator preceded by the document of query
+        and followed by the rest of query are searched outside of the document owning query.
+        """
+        candidate_rows_by_relative_path = None
+        literals = [query.document, query.object_name] + ([query.property_name] if query.property_name else [])
+        before, after = str(query).split('#', 1)
+        if (all(map(is_literal, literals)) and
+                len(before) <= SEPARATOR_CONTEXT_LENGTH and
+                len(after) <= SEPARATOR_CONTEXT_LENGTH):
+            candidate_rows_by_relative_path = {}
+            for relative_path, *row in self.connection.execute(
+                    'SELECT DISTINCT a.document_path, ' + ATTRIBUTE_COLUMNS + ', a.position '
+                    'FROM separators s JOIN attributes a ON a.id = s.attribute_id '
+                    'WHERE s.after >= ? AND s.after < ? AND s.reversed_before >= ? AND s.reversed_before < ? '
+                    'ORDER BY a.document_path, a.position',
+                    _prefix_range(after) + _prefix_range(before[::-1])):
+                candidate_rows_by_relative_path.setdefault(relative_path, []).append(row[:-1])
+
+        compiled_query = CompiledQuery(query)
+        references = []
+        for relative_path, in self.connection.execute('SELECT path FROM documents ORDER BY position').fetchall():
+            document_path = self._to_document_path(relative_path)
+            is_owner_document = query.matches_document(document_path)
+            if candidate_rows_by_relative_path is not None and not is_owner_document:
+                # Other documents only have references when a candidate has a direct reference.
+                candidate_rows = candidate_rows_by_relative_path.get(relative_path, [])
+                if not any(compiled_query.direct_pattern.search(row[4]) for row in candidate_rows):
+                    continue
+            attributes = (row + (None,) for row in self._select_attributes(relative_path))
+            references.extend(find_query_references(document_path, attributes, compiled_query, is_owner_document))
+        return references
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'ReferenceIndex':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _index_document(self,
+                        relative_path: str,
+                        position: int,
+                        key: List[int],
+                        attributes: List[Attribute]) -> None:
+        crc, size, mtime_ns = key
+        self.connection.execute('DELETE FROM documents WHERE path = ?', (relative_path,))
+        self.connection.execute(
+            'INSERT INTO documents (path, position, crc, size, mtime_ns) VALUES (?, ?, ?, ?, ?)',
+            (relative_path, position, crc, size, mtime_ns))
+        for attribute_position, attribute in enumerate(attributes):
+            cursor = self.connection.execute(
+                'INSERT INTO attributes (document_path, position, object_name, property_name, '
+                'reference_attribute, location, content, xpath) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (relative_path, attribute_position) + attribute)
+            self.connection.executemany(
+                'INSERT INTO separators (reversed_before, after, attribute_id) VALUES (?, ?, ?)',
+                [(reversed_before, after, cursor.lastrowid)
+                 for reversed_before, after in _iter_separator_contexts(attribute[4])])
+
+    def _select_attributes(self, relative_path: str) -> List[Attribute]:
+        return self.connection.execute(
+            'SELECT ' + ATTRIBUTE_COLUMNS + ' FROM attributes a WHERE a.document_path = ? ORDER BY a.position',
+            (relative_path,)).fetchall()
+
+    def _to_relative_path(self, document_path: str) -> str:
+        relative_path = os.path.relpath(document_path, self.base_path)
+        return relative_path.replace(os.path.sep, posixpath.sep)
+
+    def _to_document_path(self, relative_path: str) -> str:
+        return os.path.join(self.base_path, *relative_path.split(posixpath.sep))
+
+
+def _read_attributes(document_path: str) -> Tuple[List[Attribute], Optional[str]]:
+    """Returns a (reference-bearing attributes, error) pair of the document at document_path."""
+    document, error = load_slim_document(document_path)
+    if document is None:
+        return [], error
+    return [attribute[:-1] for attribute in document.iter_reference_attributes()], None
+
+
+def _iter_separator_contexts(content: str) -> Iterator[Tuple[str, str]]:
+    """Yields (reversed text before, text after) pairs of each ``#`` in content,
+    of at most ``SEPARATOR_CONTEXT_LENGTH`` characters each.
+
+    Content contains ``Doc#Object.Property`` exactly when a pair has reversed text before starting with
+    ``Doc`` reversed, and text after starting with ``Object.Property``,
+    so both are looked up by prefix.
+    """
+    index = content.find('#')
+    while index != -1:
+        yield (content[max(0, index - SEPARATOR_CONTEXT_LENGTH):index][::-1],
+               content[index + 1:index + 1 + SEPARATOR_CONTEXT_LENGTH])
+        index = content.find('#', index + 1)
+
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """Returns the (inclusive, exclusive) bounds of separator contexts starting with prefix.
+
+    Contexts have at most ``SEPARATOR_CONTEXT_LENGTH`` characters,
+    so each one starting with prefix is less than prefix followed by that many of the greatest character.
+    """
+    return prefix, prefix + MAX_CHARACTER * SEPARATOR_CONTEXT_LENGTH
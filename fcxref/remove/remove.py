@@ -1,15 +1,19 @@
-from copy import deepcopy
-from typing import Callable, Dict
-from xml.etree import ElementTree
+from typing import Callable, Dict, Iterator, Tuple
 from xml.etree.ElementTree import Element
 
+from ..copy_on_write import (CopyOnWriteTree, Locator, find_indexed,
+                             iter_indexed)
+from ..document_roots import DocumentRoots, iter_document_roots
+from ..find.property_scanner import scanner_by_property_name
+from ..prefilter import Prefilter, escape_attribute
+from ..profiler import phase
 from .remove_document_from_xlinks import remove_document_from_multi_xlinks
 
 __all__ = ['make_remove']
 
 
-def make_remove(find_root_by_document_path: Callable[[str], Dict[str, Element]]):
-    def remove(base_path: str, document_name: str) -> Dict[str, Element]:
+def make_remove(find_root_by_document_path: Callable[..., DocumentRoots]):
+    def remove(base_path: str, document_name: str, jobs: int = 1) -> Dict[str, Element]:
         """
         The below are example Doument.xml snippets of no XLinks and XLinks.
 
@@ -55,36 +59,85 @@ def make_remove(find_root_by_document_path: Callable[[str], Dict[str, Element]])
         * `XLinks <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/App/PropertyLinks.cpp#L4473-L4510>`_
         * `XLink <https://github.com/FreeCAD/FreeCAD/blob/0.19.2/src/App/PropertyLinks.cpp#L3155-L3249>`_
         """
-        root_by_document_path = find_root_by_document_path(base_path)
+        doc_map_token = 'DocMap name="{}"'.format(escape_attribute(document_name))
+        root_by_document_path = find_root_by_document_path(base_path,
+                                                           jobs=jobs,
+                                                           prefilter=Prefilter([doc_map_token]))
 
         renamed_root_by_document_path = {}
-        for document_path, root in root_by_document_path.items():
-            copy = deepcopy(root)
-            xlinks_parent_elements = copy.findall('.//XLinks/..')
-            for xlinks_parent_element in xlinks_parent_elements:
-                for xlinks_element in xlinks_parent_element.findall('XLinks'):
-                    doc_map_xpath = f"./DocMap[@name='{document_name}']"
-                    matching_doc_map_elements = xlinks_element.findall(
-                        doc_map_xpath)
-                    if len(matching_doc_map_elements):
-                        xlinks_count = int(xlinks_element.attrib['count'])
-                        if xlinks_count == 1:
-                            if xlinks_parent_element.tag == 'Cells':
-                                xlinks_element.attrib['count'] = '0'
-                                del xlinks_element.attrib['docs']
-                                for child in list(xlinks_element):
-                                    xlinks_element.remove(child)
-                            elif xlinks_parent_element.tag == 'ExpressionEngine':
-                                del xlinks_parent_element.attrib['xlink']
-                                xlinks_parent_element.remove(xlinks_element)
-                        else:
-                            updated_xlinks_element = remove_document_from_multi_xlinks(
-                                xlinks_element, document_name)
-                            xlinks_parent_element.remove(xlinks_element)
-                            xlinks_parent_element.insert(
-                                0, updated_xlinks_element)
-            if ElementTree.tostring(copy) != ElementTree.tostring(root):
-                renamed_root_by_document_path[document_path] = copy
+        for document_path, root in iter_document_roots(root_by_document_path):
+            with phase('remove', document_path):
+                tree = remove_document_from_root(root, document_name)
+            if tree.modified:
+                renamed_root_by_document_path[document_path] = tree.root
 
         return renamed_root_by_document_path
     return remove
+
+
+def remove_document_from_root(root: Element, document_name: str) -> CopyOnWriteTree:
+    """Returns a copy-on-write tree of root with XLinks to document_name removed."""
+    tree = CopyOnWriteTree(root)
+    for locator, xlinks_parent_element in iter_xlinks_parent_elements(root):
+        for xlinks_element in [e for e in xlinks_parent_element if e.tag == 'XLinks']:
+            if not has_doc_map(xlinks_element, document_name):
+                continue
+            xlinks_count = int(xlinks_element.attrib['count'])
+            if xlinks_count == 1:
+                if xlinks_parent_element.tag == 'Cells':
+                    copy = tree.element(locator)
+                    replace_child(copy, xlinks_element, make_empty_xlinks(xlinks_element))
+                elif xlinks_parent_element.tag == 'ExpressionEngine':
+                    copy = tree.element(locator)
+                    del copy.attrib['xlink']
+                    copy.remove(xlinks_element)
+            else:
+                copy = tree.element(locator)
+                updated_xlinks_element = remove_document_from_multi_xlinks(
+                    xlinks_element, document_name)
+                copy.remove(xlinks_element)
+                copy.insert(0, updated_xlinks_element)
+    return tree
+
+
+def iter_xlinks_parent_elements(root: Element) -> Iterator[Tuple[Locator, Element]]:
+    """Yields (locator, element) pairs of elements which may contain ``XLinks``,
+    going directly to ``ObjectData/Object/Properties/Property/{Cells,ExpressionEngine}``
+    instead of searching the whole tree.
+    """
+    object_data_index, object_data = find_indexed(root, 'ObjectData')
+    if object_data is None:
+        return
+    for object_index, object in iter_indexed(object_data, 'Object'):
+        properties_index, properties_element = find_indexed(object, 'Properties')
+        if properties_element is None:
+            continue
+        for property_index, property_element in iter_indexed(properties_element, 'Property'):
+            scanner = scanner_by_property_name.get(property_element.attrib.get('name'))
+            if scanner is None:
+                continue
+            nested_index, nested_element = find_indexed(property_element, scanner.nested_element_name)
+            if nested_element is not None:
+                yield ((object_data_index, object_index, properties_index, property_index, nested_index),
+                       nested_element)
+
+
+def has_doc_map(xlinks_element: Element, document_name: str) -> bool:
+    return any(child.tag == 'DocMap' and child.attrib.get('name') == document_name
+               for child in xlinks_element)
+
+
+def make_empty_xlinks(xlinks_element: Element) -> Element:
+    """Returns a copy of xlinks_element without children, a count of 0, and no docs attribute."""
+    attrib = dict(xlinks_element.attrib)
+    attrib['count'] = '0'
+    del attrib['docs']
+    empty = xlinks_element.makeelement(xlinks_element.tag, attrib)
+    empty.text = xlinks_element.text
+    empty.tail = xlinks_element.tail
+    return empty
+
+
+def replace_child(parent: Element, child: Element, replacement: Element) -> None:
+    index = next(i for i, c in enumerate(parent) if c is child)
+    parent[index] = replacement
@@ -1,47 +1,63 @@
-from copy import deepcopy
+from bisect import bisect_left
 from typing import List
 from xml.etree.ElementTree import Element
 
+from ..copy_on_write import copy_element
+
 
 def remove_document_from_multi_xlinks(xlinks_element: Element,
                                       document_name: str) -> Element:
     """
     Removes document references from XLinks
     when the XLinks element has a count greater than 1.
+
+    Each DocMap's index is the position of its document's first XLink,
+    and a document's XLinks run until the next DocMap's index.
+
+    Returns a new XLinks element built in one pass over its children,
+    sharing unchanged XLink elements with xlinks_element,
+    which isn't modified.
     """
-    copy = deepcopy(xlinks_element)
-    matching_doc_map_element = copy.find(f"./DocMap[@name='{document_name}']")
-    matching_doc_map_index = int(matching_doc_map_element.attrib['index'])
+    children = list(xlinks_element)
+    all_doc_map_elements = [c for c in children if c.tag == 'DocMap']
+    matching_doc_map_element = next(
+        d for d in all_doc_map_elements if d.attrib.get('name') == document_name)
+    start = int(matching_doc_map_element.attrib['index'])
+    xlink_count = sum(1 for c in children if c.tag == 'XLink')
 
-    all_xlink_elements = copy.findall('XLink')
-    all_doc_map_elements = copy.findall('DocMap')
     doc_map_indices = get_sorted_doc_map_indices(all_doc_map_elements)
-    next_doc_map_index = doc_map_indices.index(matching_doc_map_index) + 1
-
-    # Remove XLink elements
+    next_doc_map_index = bisect_left(doc_map_indices, start) + 1
     if next_doc_map_index < len(doc_map_indices):
-        next_index = doc_map_indices[next_doc_map_index]
-        for i in range(matching_doc_map_index, next_index):
-            copy.remove(all_xlink_elements[i])
+        end = doc_map_indices[next_doc_map_index]
     else:
-        for i in range(matching_doc_map_index, len(all_xlink_elements)):
-            copy.remove(all_xlink_elements[i])
-
-    # Remove matching DocMap element
-    copy.remove(matching_doc_map_element)
+        end = xlink_count
+    removed_count = end - start
 
-    # Re-index any DocMap elements left over
-    xlink_elements_after_removal = copy.findall('XLink')
-    doc_map_elements_after_removal = copy.findall('DocMap')
-    for doc_map_element in doc_map_elements_after_removal:
-        matching_doc_map_index = int(doc_map_element.attrib['index'])
-        xlink_element = all_xlink_elements[matching_doc_map_index]
-        new_index = xlink_elements_after_removal.index(xlink_element)
-        doc_map_element.attrib['index'] = str(new_index)
+    copy = xlinks_element.makeelement(xlinks_element.tag, dict(xlinks_element.attrib))
+    copy.text = xlinks_element.text
+    copy.tail = xlinks_element.tail
+    xlink_index = 0
+    doc_map_count = 0
+    for child in children:
+        if child.tag == 'XLink':
+            is_removed = start <= xlink_index < end
+            xlink_index += 1
+            if is_removed:
+                continue
+        elif child.tag == 'DocMap':
+            if child is matching_doc_map_element:
+                continue
+            # Re-index DocMap elements after the removed XLink elements.
+            index = int(child.attrib['index'])
+            if index >= end:
+                child = copy_element(child)
+                child.attrib['index'] = str(index - removed_count)
+            doc_map_count += 1
+        copy.append(child)
 
     # Update counts on XLinks element
-    copy.attrib['count'] = str(len(xlink_elements_after_removal))
-    copy.attrib['docs'] = str(len(doc_map_elements_after_removal))
+    copy.attrib['count'] = str(xlink_count - removed_count)
+    copy.attrib['docs'] = str(doc_map_count)
 
     return copy
 
@@ -1,4 +1,5 @@
+from .make_rename_properties import make_rename_properties
 from .make_rename_property import make_rename_property
 
 
-__all__ = ['make_rename_property']
+__all__ = ['make_rename_properties', 'make_rename_property']
@@ -0,0 +1,130 @@
+import logging
+import re
+from typing import Callable, Dict, List, Tuple
+from xml.etree.ElementTree import Element
+
+from ..copy_on_write import CopyOnWriteTree, Locator
+from ..document_roots import DocumentRoots, iter_document_roots
+from ..find import Query, Reference
+from ..find.compiled_query import CompiledQuery
+from ..find.find_many_in_root import find_many_in_root
+from ..prefilter import QueriesPrefilter
+from ..profiler import phase
+from .rename_owner_document import find_object_element
+from .rename_references_in_root import get_locator, is_fully_qualified_reference
+
+__all__ = ['make_rename_properties']
+
+logger = logging.getLogger(__name__)
+
+
+def make_rename_properties(find_root_by_document_path: Callable[..., DocumentRoots]):
+    def rename_properties(base_path: str,
+                          document: str,
+                          object_name: str,
+                          to_property_by_from_property: Dict[str, str],
+                          jobs: int = 1) -> Dict[str, Element]:
+        """Renames many properties of an object in one pass over each document.
+
+        Properties are renamed simultaneously,
+        so properties may be swapped (e.g. ``{'A': 'B', 'B': 'A'}``) or chained.
+
+        Raises ``ValueError`` when two properties are renamed to the same property,
+        or a property is renamed to an existing alias which isn't renamed.
+
+        Returns a dictionary where keys are filepaths of documents with renamed references,
+        and values are renamed copies of their roots.
+        """
+        to_property_by_from_property = {
+            f: t for f, t in to_property_by_from_property.items() if f != t
+        }
+        _check_unique(to_property_by_from_property)
+        to_query_by_from_query = {
+            Query(document, object_name, f): Query(document, object_name, t)
+            for f, t in to_property_by_from_property.items()
+        }
+        from_queries = list(to_query_by_from_query.keys())
+        if not from_queries:
+            return {}
+        compiled_queries = [CompiledQuery(query) for query in from_queries]
+        root_by_document_path = find_root_by_document_path(base_path,
+                                                           jobs=jobs,
+                                                           prefilter=QueriesPrefilter(from_queries))
+        renamed_root_by_document_path = {}
+        owner_found = False
+        for document_path, root in iter_document_roots(root_by_document_path):
+            with phase('match', document_path):
+                references_by_query = find_many_in_root(document_path, root, compiled_queries)
+            # Aliases are checked in the first document named document, like rename_property,
+            # but references are renamed in every document with its name.
+            if not owner_found and _is_owner_document(document, document_path, root):
+                owner_found = True
+                _check_aliases(root, object_name, to_property_by_from_property)
+            if not any(references_by_query.values()):
+                continue
+            logger.debug(f'Renaming references in {document_path}')
+            with phase('rename', document_path):
+                renamed_root_by_document_path[document_path] = _rename_references(
+                    root, references_by_query, to_query_by_from_query)
+        return renamed_root_by_document_path
+    return rename_properties
+
+
+def _check_unique(to_property_by_from_property: Dict[str, str]) -> None:
+    from_properties_by_to_property = {}
+    for from_property, to_property in to_property_by_from_property.items():
+        from_properties_by_to_property.setdefault(to_property, []).append(from_property)
+    for to_property, from_properties in from_properties_by_to_property.items():
+        if len(from_properties) > 1:
+            raise ValueError('Cannot rename {} to the same property {}.'.format(
+                ', '.join(from_properties), to_property))
+
+
+def _is_owner_document(document: str, document_path: str, root: Element) -> bool:
+    return Query(document, '').matches_document(document_path, root)
+
+
+def _check_aliases(root: Element,
+                   object_name: str,
+                   to_property_by_from_property: Dict[str, str]) -> None:
+    """Checks properties aren't renamed to existing aliases of the object in the owner document,
+    unless those aliases are renamed too.
+    """
+    object_element = find_object_element(root, object_name)
+    if object_element is None:
+        return
+    aliases = {cell.attrib['alias'] for cell in object_element.iterfind(
+        "Properties/Property[@name='cells']/Cells/Cell[@alias]")}
+    for from_property, to_property in to_property_by_from_property.items():
+        if to_property in aliases and to_property not in to_property_by_from_property:
+            raise ValueError('Cannot rename {} to {} since {} already exists.'.format(
+                from_property, to_property, to_property))
+
+
+def _rename_references(root: Element,
+                       references_by_query: Dict[Query, List[Reference]],
+                       to_query_by_from_query: Dict[Query, Query]) -> Element:
+    """Returns a copy of root with every reference renamed in one substitution per attribute,
+    so renaming one property never renames the result of renaming another.
+
+    Only elements on the paths to references are copied, so root isn't modified.
+    """
+    tree = CopyOnWriteTree(root)
+    replacement_by_match_by_location: Dict[Tuple[Locator, str], Dict[str, str]] = {}
+    for from_query, references in references_by_query.items():
+        to_query = to_query_by_from_query[from_query]
+        for reference in references:
+            replacement = str(to_query) if is_fully_qualified_reference(
+                reference.match) else to_query.property_name
+            location = (get_locator(root, reference), reference.reference_attribute)
+            replacement_by_match = replacement_by_match_by_location.setdefault(location, {})
+            replacement_by_match.setdefault(reference.match, replacement)
+    for (locator, reference_attribute), replacement_by_match in replacement_by_match_by_location.items():
+        element = tree.element(locator)
+        # Longest matches first so Value2 isn't renamed as Value followed by 2.
+        matches = sorted(replacement_by_match.keys(), key=len, reverse=True)
+        pattern = re.compile('|'.join(map(re.escape, matches)))
+        renamed = pattern.sub(lambda match: replacement_by_match[match.group(0)],
+                              element.attrib[reference_attribute])
+        element.set(reference_attribute, renamed)
+    return tree.root
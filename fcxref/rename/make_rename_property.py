@@ -1,31 +1,39 @@
-from typing import Callable, Dict, List, Tuple
+from functools import partial
+from typing import Callable, Dict, Tuple
 from xml.etree.ElementTree import Element
 
-from ..find import Query, Reference, make_find
-from ..group_references_by_document_path import \
-    group_references_by_document_path
+from ..document_roots import DocumentRoots, iter_document_roots
+from ..find import Query
+from ..find.compiled_query import CompiledQuery
+from ..find.find_references_in_root import find_query_references_in_root
+from ..label import extract_label, is_label
+from ..prefilter import LabelPrefilter, QueryPrefilter
+from ..profiler import phase
 from .rename_owner_document import rename_owner_document
 from .rename_references_in_root import rename_references_in_root
 
 
-def make_rename_property(find_root_by_document_path: Callable[[str], Dict[str, Element]]):
-    find = make_find(find_root_by_document_path)
-
+def make_rename_property(find_root_by_document_path: Callable[..., DocumentRoots]):
     def rename_property(base_path: str,
                document: str,
                object_name: str,
-               from_to_properties: Tuple[str, str]) -> Dict[str, Element]:
+               from_to_properties: Tuple[str, str],
+               jobs: int = 1) -> Dict[str, Element]:
         from_property_name, to_property_name = from_to_properties
-        root_by_document_path = find_root_by_document_path(base_path)
         from_property = Query(document, object_name, from_property_name)
         to_property = Query(document, object_name, to_property_name)
-        references = find(base_path, from_property)
-        references_by_document_path = group_references_by_document_path(
-            references)
+        load_owner_document = partial(find_root_by_document_path, jobs=jobs)
+        if is_label(document):
+            # Skip parsing documents with other labels.
+            load_owner_document = partial(load_owner_document,
+                                          prefilter=LabelPrefilter(extract_label(document)))
         owner_document_path_by_root = rename_owner_document(
-            find_root_by_document_path, base_path, from_property, to_property_name)
+            load_owner_document, base_path, from_property, to_property_name)
+        root_by_document_path = find_root_by_document_path(base_path,
+                                                           jobs=jobs,
+                                                           prefilter=QueryPrefilter(from_property))
         root_by_document_path = rename_references_in_document_xml(root_by_document_path,
-                                                                  references_by_document_path,
+                                                                  CompiledQuery(from_property),
                                                                   to_property)
         if owner_document_path_by_root:
             root_by_document_path.update(owner_document_path_by_root)
@@ -33,12 +41,22 @@ def make_rename_property(find_root_by_document_path: Callable[[str], Dict[str, E
     return rename_property
 
 
-def rename_references_in_document_xml(root_by_document_path: Dict[str, Element],
-                                      references_by_document_path: Dict[str, List[Reference]],
+def rename_references_in_document_xml(root_by_document_path: DocumentRoots,
+                                      compiled_query: CompiledQuery,
                                       to_property: Query) -> Dict[str, Element]:
+    """Returns copies of roots with references to compiled_query renamed to to_property,
+    for roots with references.
+
+    References are found and renamed in the same root,
+    so they're never applied to a root loaded separately.
+    """
     renamed_root_by_document_path = {}
-    for document_path, references in references_by_document_path.items():
-        root = root_by_document_path[document_path]
-        copy = rename_references_in_root(root, references, to_property)
+    for document_path, root in iter_document_roots(root_by_document_path):
+        with phase('match', document_path):
+            references = find_query_references_in_root(document_path, root, compiled_query)
+        if not references:
+            continue
+        with phase('rename', document_path):
+            copy = rename_references_in_root(root, references, to_property)
         renamed_root_by_document_path[document_path] = copy
     return renamed_root_by_document_path
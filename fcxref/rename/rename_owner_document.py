@@ -3,15 +3,17 @@ import re
 from typing import Callable, Dict, Optional, Tuple
 from xml.etree.ElementTree import Element
 
+from ..document_roots import DocumentRoots, iter_document_roots
 from ..find import Query
 from ..find.find_references_in_root import find_references_in_root
+from ..label import extract_label, find_document_label, index_objects, is_label
+from ..profiler import phase
 from ..rename.rename_references_in_root import rename_references_in_root
-from .label import extract_label, is_label
 
 logger = logging.getLogger(__name__)
 
 
-def rename_owner_document(find_root_by_document_path: Callable[[str, str], Dict[str, Element]],
+def rename_owner_document(find_root_by_document_path: Callable[[str, str], DocumentRoots],
                           base_path: str,
                           from_property: Query,
                           to_property_name: str) -> Dict[str, Element]:
@@ -32,38 +34,34 @@ def rename_owner_document(find_root_by_document_path: Callable[[str, str], Dict[
     alias_xpath = join_xpath_expressions(property_xpath, cell_xpath)
     cell_element = object_element.find(alias_xpath)
     if cell_element is not None:
-        cell_element.set('alias', to_property_name)
+        # The alias is renamed with the other references, since it matches pattern too.
         pattern = re.compile(r'\b{}\b'.format(from_property.property_name))
-        references = find_references_in_root(document_path, root, pattern)
+        with phase('match', document_path):
+            references = find_references_in_root(document_path, root, pattern)
         to_property = Query(from_property.document,
                                from_property.object_name,
                                to_property_name)
-        copy = rename_references_in_root(root, references, to_property)
+        with phase('rename', document_path):
+            copy = rename_references_in_root(root, references, to_property)
         return {document_path: copy}
     return {}
 
 
 def find_object_element(root: Element, object_name: str) -> Element:
-    object_xpath_template = "ObjectData/Object/Properties/Property[@name='Label']*/[@value='{}']/../../.." \
-        if is_label(object_name) else "ObjectData/Object[@name='{}']"
-    object_xpath = object_xpath_template.format(extract_label(object_name))
-    object_element = root.find(object_xpath)
-    return object_element
+    return index_objects(root).find(object_name)
 
 
 def join_xpath_expressions(*args) -> str:
     return '/'.join(args)
 
 
-def find_document_by_label(find_root_by_document_path: Callable[[str, str], Dict[str, Element]],
+def find_document_by_label(find_root_by_document_path: Callable[[str, str], DocumentRoots],
                            base_path: str,
                            document_label: str) -> Optional[Tuple[str, Element]]:
+    label = extract_label(document_label)
     root_by_document_path = find_root_by_document_path(base_path, '*')
-    for document_path, root in root_by_document_path.items():
-        xpath = "Properties/Property[@name='Label']*/[@value='{}']".format(
-            extract_label(document_label))
-        string_element = root.find(xpath)
-        if string_element is not None:
+    for document_path, root in iter_document_roots(root_by_document_path):
+        if find_document_label(root) == label:
             return document_path, root
     return None
 
@@ -75,10 +73,10 @@ def find_document_by_name(find_root_by_document_path, base_path, document_name:
     return None if len(items) == 0 else items[0]
 
 
-def with_find_first_logging(find_root_by_document_path: Callable[[str, str], Dict[str, Element]]) -> Callable[[str, str], Dict[str, Element]]:
+def with_find_first_logging(find_root_by_document_path: Callable[[str, str], DocumentRoots]) -> Callable[[str, str], Dict[str, Element]]:
     def wrapped(base_path, document_pattern):
-        root_by_document_path = find_root_by_document_path(
-            base_path, document_pattern)
+        root_by_document_path = dict(iter_document_roots(
+            find_root_by_document_path(base_path, document_pattern)))
         num_documents = len(root_by_document_path)
         if num_documents == 0:
             logger.info('No document named "{}" found.'.format(
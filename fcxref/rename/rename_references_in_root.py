@@ -1,29 +1,52 @@
 import re
-from copy import deepcopy
-from typing import Dict, List
+from typing import List
 from xml.etree.ElementTree import Element
 
+from ..copy_on_write import (CopyOnWriteTree, Locator, find_locator,
+                             matches_locator)
 from ..find import Query, Reference
 
 __all__ = ['rename_references_in_root']
 
+FULLY_QUALIFIED_REFERENCE_PATTERN = re.compile(r'.*#.*\..*')
 
-def rename_references_in_root(root: Dict[str, Element],
+
+def rename_references_in_root(root: Element,
                               references: List[Reference],
                               to_property: Query) -> Element:
-    copy = deepcopy(root)
+    """Returns a copy of root with references renamed to to_property.
+
+    Only elements on the paths to references are copied, so root isn't modified.
+    References are reached by their locator, or xpath when their locator doesn't lead to it.
+    """
+    tree = CopyOnWriteTree(root)
     for reference in references:
-        element_with_reference = copy.find(reference.xpath)
+        element_with_reference = tree.element(get_locator(root, reference))
         expression_with_reference = element_with_reference.attrib[reference.reference_attribute]
         replace_with = str(to_property) if is_fully_qualified_reference(
             reference.match) else to_property.property_name
         renamed = expression_with_reference.replace(
             reference.match, replace_with)
         element_with_reference.set(reference.reference_attribute, renamed)
-    return copy
+    return tree.root
+
+
+def get_locator(root: Element, reference: Reference) -> Locator:
+    """Returns the locator of the element with reference in root.
+
+    The locator of reference is only used when it leads to the element at its xpath,
+    since root may not be the root reference was found in.
+
+    Raises ``ValueError`` when root has no element at the xpath of reference.
+    """
+    if reference.locator is not None and matches_locator(root, reference.locator, reference.xpath):
+        return tuple(reference.locator)
+    locator = find_locator(root, reference.xpath)
+    if locator is None:
+        raise ValueError('No element at {} in {}.'.format(reference.xpath, reference.document_path))
+    return locator
 
 
 def is_fully_qualified_reference(string: str) -> bool:
-    pattern = re.compile(r'.*#.*\..*')
-    match = pattern.search(string)
+    match = FULLY_QUALIFIED_REFERENCE_PATTERN.search(string)
     return bool(match)
@@ -1,59 +1,282 @@
+import logging
+import os
+import shutil
+import struct
+import tempfile
 import time
-from glob import glob
-from pathlib import Path
-from typing import Dict, List
+from copy import copy
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
-from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+from zipfile import ZIP_DEFLATED, BadZipFile, ZipFile, ZipInfo
 
-__all__ = ['find_root_by_document_path', 'write_root_by_document_path']
+from .document_cache import DocumentCache, read_document_key
+from .prefilter import Prefilter
+from .process_map import (catch_document_errors, iter_document_results,
+                          log_document_error, process_map)
+from .profiler import phase
+from .walker import Walker
 
+__all__ = [
+    'find_document_paths',
+    'find_root_by_document_path',
+    'iter_document_xmls',
+    'iter_root_by_document_path',
+    'load_document_xml',
+    'parse_document_xml',
+    'read_document_xml',
+    'read_prefiltered_document_xml',
+    'write_root_by_document_path'
+]
 
-def find_root_by_document_path(base_path: str, document_pattern: str = '*') -> Dict[str, Element]:
+logger = logging.getLogger(__name__)
+
+LOCAL_FILE_HEADER_SIGNATURE = b'PK\x03\x04'
+LOCAL_FILE_HEADER_SIZE = 30
+DATA_DESCRIPTOR_FLAG = 0x08
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def find_root_by_document_path(base_path: str,
+                               document_pattern: str = '*',
+                               jobs: int = 1,
+                               cache: Optional[DocumentCache] = None,
+                               prefilter: Optional[Prefilter] = None,
+                               walker: Optional[Walker] = None) -> Dict[str, Element]:
     """Returns a dictionary where keys are document filepaths,
     and values are document xml root elements.
+
+    See ``iter_root_by_document_path`` for parameters.
+    """
+    return dict(iter_root_by_document_path(base_path, document_pattern, jobs, cache, prefilter, walker))
+
+
+def iter_root_by_document_path(base_path: str,
+                               document_pattern: str = '*',
+                               jobs: int = 1,
+                               cache: Optional[DocumentCache] = None,
+                               prefilter: Optional[Prefilter] = None,
+                               walker: Optional[Walker] = None) -> Iterator[Tuple[str, Element]]:
+    """Yields (document filepath, document xml root element) pairs,
+    parsing each document only when the previous pair is consumed,
+    so only one document is held in memory at a time.
+
+    Documents are read and prefiltered in a pool of ``jobs`` worker processes when ``jobs`` is greater than 1,
+    or one worker process per CPU when ``jobs`` is 0, and parsed in this process.
+    Documents which cannot be loaded are logged and skipped.
+
+    When a ``cache`` is passed, roots only contain reference-bearing elements
+    and must not be written back with ``write_root_by_document_path``.
+
+    When a ``prefilter`` is passed, documents it doesn't match are skipped without parsing.
+
+    Documents are found with ``walker``, or a default ``Walker``.
     """
-    document_paths = _find_document_paths(base_path, document_pattern)
-    return _parse_document_xmls(document_paths)
+    document_paths = find_document_paths(base_path, document_pattern, walker)
+    if cache is None:
+        yield from iter_document_xmls(document_paths, jobs, prefilter)
+    else:
+        yield from _iter_cached_document_xmls(document_paths, jobs, cache, prefilter)
+
+
+def find_document_paths(base_path: str,
+                        document_pattern: str = '*',
+                        walker: Optional[Walker] = None) -> List[str]:
+    """Returns filepaths of documents recursively found in base_path
+    with names matching document_pattern.
+    """
+    if walker is None:
+        walker = Walker()
+    return walker.find_document_paths(base_path, document_pattern)
+
 
+def write_root_by_document_path(root_by_document_path: Dict[str, Element],
+                                jobs: int = 1,
+                                progress: Optional[Callable[[str, Optional[str]], None]] = None) -> Dict[str, str]:
+    """Writes each root to the ``Document.xml`` of its document.
 
-def _find_document_paths(base_path: str, document_pattern: str) -> List[str]:
-    document_filename = '{}.FCStd'.format(document_pattern)
-    pattern = Path(base_path).joinpath('**', document_filename).as_posix()
-    return glob(pattern, recursive=True)
+    Documents are written in a pool of ``jobs`` worker processes when ``jobs`` is greater than 1,
+    or one worker process per CPU when ``jobs`` is 0.
+    Calls ``progress`` with each document path and error (or ``None``) as documents are written.
+
+    Returns a dictionary where keys are filepaths of documents which failed to be written,
+    and values are error messages.
+    """
+    error_by_document_path = {}
+    items = list(root_by_document_path.items())
+    results = process_map(_write_root, items, jobs)
+    for (document_path, _), error in zip(items, results):
+        if error is not None:
+            logger.error('Failed to write document {}: {}'.format(document_path, error))
+            error_by_document_path[document_path] = error
+        if progress is not None:
+            progress(document_path, error)
+    return error_by_document_path
 
 
-def write_root_by_document_path(root_by_document_path: Dict[str, Element]) -> None:
-    for document_path, root in root_by_document_path.items():
-        document_xml = ElementTree.tostring(root)
-        data_by_member = _get_data_by_member(document_path, document_xml)
-        with ZipFile(document_path, 'w', ZIP_DEFLATED) as fcstd:
-            for filename, data in data_by_member.items():
-                member = ZipInfo(filename, time.localtime()[:6])
-                member.compress_type = ZIP_DEFLATED
-                fcstd.writestr(member, data)
+def _write_root(item: Tuple[str, Element]) -> Optional[str]:
+    """Returns an error message instead of raising,
+    so one document failing to be written doesn't stop the others.
+    """
+    document_path, root = item
+    try:
+        with phase('serialize', document_path):
+            document_xml = ElementTree.tostring(root)
+        with phase('write', document_path):
+            _write_document_xml(document_path, document_xml)
+    except (OSError, BadZipFile, struct.error) as error:
+        return str(error)
+    return None
 
 
-def _get_data_by_member(document_path, document_xml) -> Dict[str, str]:
-    data_by_member = {}
-    with ZipFile(document_path, 'r', ZIP_DEFLATED) as fcstd:
-        for member in fcstd.infolist():
-            filename = member.filename
-            data = document_xml if filename == 'Document.xml' else fcstd.read(
-                filename)
-            data_by_member[filename] = data
-    return data_by_member
+def _write_document_xml(document_path: str, document_xml: bytes) -> None:
+    """Replaces ``Document.xml`` in the archive at document_path.
+
+    Other members are copied as already-compressed data with their original metadata.
+    The archive is written to a temporary file in the same directory,
+    and then atomically renamed over the original.
+    """
+    directory = os.path.dirname(os.path.abspath(document_path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.FCStd.tmp')
+    os.close(file_descriptor)
+    try:
+        with ZipFile(document_path, 'r') as source, ZipFile(temporary_path, 'w', ZIP_DEFLATED) as target:
+            for member in source.infolist():
+                if member.filename == 'Document.xml':
+                    document_member = ZipInfo(member.filename, time.localtime()[:6])
+                    document_member.compress_type = ZIP_DEFLATED
+                    document_member.create_system = member.create_system
+                    document_member.external_attr = member.external_attr
+                    target.writestr(document_member, document_xml)
+                else:
+                    _copy_compressed_member(source, target, member)
+        shutil.copymode(document_path, temporary_path)
+        os.replace(temporary_path, document_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def _copy_compressed_member(source: ZipFile, target: ZipFile, member: ZipInfo) -> None:
+    """Copies the compressed data of member from source to target without recompressing it.
+
+    zipfile has no public API for copying compressed data,
+    so this writes the local file header and updates target's bookkeeping
+    the same way ``ZipFile.writestr`` does.
+    """
+    source.fp.seek(member.header_offset)
+    local_file_header = source.fp.read(LOCAL_FILE_HEADER_SIZE)
+    if local_file_header[:4] != LOCAL_FILE_HEADER_SIGNATURE:
+        raise BadZipFile('Bad local file header for {}'.format(member.filename))
+    filename_length, extra_field_length = struct.unpack('<HH', local_file_header[26:30])
+    source.fp.seek(filename_length + extra_field_length, os.SEEK_CUR)
+
+    copied_member = copy(member)
+    # Write the CRC and sizes in the local file header instead of a trailing data descriptor.
+    copied_member.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+    copied_member.header_offset = target.fp.tell()
+    target.fp.write(copied_member.FileHeader())
+    remaining = member.compress_size
+    while remaining > 0:
+        chunk = source.fp.read(min(remaining, COPY_CHUNK_SIZE))
+        if not chunk:
+            raise BadZipFile('Truncated data for {}'.format(member.filename))
+        target.fp.write(chunk)
+        remaining -= len(chunk)
+    target.filelist.append(copied_member)
+    target.NameToInfo[copied_member.filename] = copied_member
+    target.start_dir = target.fp.tell()
+    target._didModify = True
+
+
+def iter_document_xmls(document_paths: List[str],
+                       jobs: int = 1,
+                       prefilter: Optional[Prefilter] = None) -> Iterator[Tuple[str, Element]]:
+    """Yields (document filepath, root) pairs of document_paths,
+    reading and prefiltering documents in a pool of ``jobs`` worker processes when ``jobs`` isn't 1.
+
+    Workers return ``Document.xml`` bytes which are parsed in this process,
+    since pickling element trees back from workers costs more than parsing them.
+    Documents which cannot be loaded, or which prefilter doesn't match, are skipped.
+    """
+    results = process_map(partial(read_prefiltered_document_xml, prefilter=prefilter), document_paths, jobs)
+    for document_path, document_xml in iter_document_results(document_paths, results):
+        if prefilter is not None:
+            prefilter.count(document_xml is not None)
+        if document_xml is None:
+            continue
+        root, error = parse_document_xml(document_path, document_xml)
+        if error is not None:
+            log_document_error(document_path, error)
+            continue
+        yield document_path, root
+    if prefilter is not None:
+        prefilter.log_counts()
+
+
+def _iter_cached_document_xmls(document_paths: List[str],
+                               jobs: int,
+                               cache: DocumentCache,
+                               prefilter: Optional[Prefilter] = None) -> Iterator[Tuple[str, Element]]:
+    # Keys are read once, before documents are parsed,
+    # so documents changed while they're parsed are cached with their previous key.
+    key_by_document_path = {p: read_document_key(p) for p in document_paths}
+    uncached_document_paths = [p for p in document_paths if not cache.contains(p, key_by_document_path[p])]
+    parsed = iter_document_xmls(uncached_document_paths, jobs, prefilter)
+    next_parsed = next(parsed, None)
+    uncached_document_paths = set(uncached_document_paths)
+    try:
+        for document_path in document_paths:
+            key = key_by_document_path[document_path]
+            if document_path not in uncached_document_paths:
+                root = cache.get(document_path, key)
+            elif next_parsed is not None and next_parsed[0] == document_path:
+                root = cache.put(document_path, next_parsed[1], key)
+                next_parsed = next(parsed, None)
+            else:
+                # Skipped by iter_document_xmls since it couldn't be loaded or didn't match.
+                root = None
+            if root is not None:
+                yield document_path, root
+    finally:
+        cache.evict()
+        cache.save()
+
+
+def load_document_xml(document_path: str,
+                      prefilter: Optional[Prefilter] = None) -> Tuple[Optional[Element], Optional[str]]:
+    """Returns a (root, error) pair of the document at document_path (see ``catch_document_errors``).
+
+    Root is ``None`` without an error when the prefilter doesn't match.
+    """
+    document_xml, error = read_prefiltered_document_xml(document_path, prefilter)
+    if document_xml is None:
+        return None, error
+    return parse_document_xml(document_path, document_xml)
+
+
+@catch_document_errors()
+def read_prefiltered_document_xml(document_path: str, prefilter: Optional[Prefilter] = None) -> Optional[bytes]:
+    """Returns a (``Document.xml`` bytes, error) pair of the document at document_path.
+
+    The bytes are ``None`` without an error when the prefilter doesn't match.
+    """
+    with phase('decompress', document_path):
+        document_xml = read_document_xml(document_path)
+    if prefilter is not None and not prefilter.matches(document_path, document_xml):
+        return None
+    return document_xml
 
 
-def _parse_document_xmls(document_paths: List[str]) -> Dict[str, Element]:
-    root_by_document_path = {}
-    for document_path in document_paths:
-        root = _parse_document_xml(document_path)
-        root_by_document_path[document_path] = root
-    return root_by_document_path
+@catch_document_errors()
+def parse_document_xml(document_path: str, document_xml: bytes) -> Element:
+    """Returns a (root, error) pair of the ``Document.xml`` bytes of the document at document_path."""
+    with phase('parse', document_path):
+        return ElementTree.fromstring(document_xml)
 
 
-def _parse_document_xml(document_path: str) -> Element:
-    archive = ZipFile(document_path, 'r')
-    document_xml = archive.read('Document.xml')
-    return ElementTree.fromstring(document_xml)
+def read_document_xml(document_path: str) -> bytes:
+    """Returns the contents of ``Document.xml`` in the archive at document_path."""
+    with ZipFile(document_path, 'r') as archive:
+        return archive.read('Document.xml')
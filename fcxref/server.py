@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from typing import List, Optional
+
+from .find import Query, Reference, make_find
+from .walker import Walker
+from .workspace import SlimWorkspace
+
+__all__ = ['Client', 'serve', 'WorkspaceMismatchError', 'SOCKET_FILENAME']
+
+logger = logging.getLogger(__name__)
+
+SOCKET_FILENAME = '.fcxref.sock'
+
+ENCODING = 'utf-8'
+
+
+class WorkspaceMismatchError(RuntimeError):
+    """Raised by ``Client`` when the server finds documents in another base path, or with other ``Walker`` options."""
+
+
+class Client:
+    """Sends queries about documents in base_path, found with walker (or a default ``Walker``),
+    to a server started with ``serve``.
+
+    Raises ``OSError`` when no server is listening on socket_path,
+    and ``WorkspaceMismatchError`` when the server doesn't serve the same documents.
+    """
+
+    def __init__(self, socket_path: str, base_path: str, walker: Optional[Walker] = None) -> None:
+        self.socket_path = socket_path
+        self.base_path = base_path
+        self.walker = walker or Walker()
+
+    def find(self, query: Query) -> List[Reference]:
+        response = self.request({'command': 'find',
+                                 'document': query.document,
+                                 'object': query.object_name,
+                                 'property': query.property_name})
+        return [Reference(**reference) for reference in response['references']]
+
+    def remove(self, document_name: str) -> List[str]:
+        """Returns paths of documents ``remove`` would update, without updating them."""
+        response = self.request({'command': 'remove', 'document': document_name})
+        return response['document_paths']
+
+    def request(self, message: dict) -> dict:
+        message = dict(message, base_path=os.path.abspath(self.base_path), walker=self.walker.options())
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+            client_socket.connect(self.socket_path)
+            client_socket.sendall(json.dumps(message).encode(ENCODING) + b'\n')
+            with client_socket.makefile('rb') as f:
+                line = f.readline()
+        if not line:
+            raise ConnectionError('No response from {}'.format(self.socket_path))
+        response = json.loads(line.decode(ENCODING))
+        if 'mismatch' in response:
+            raise WorkspaceMismatchError(response['mismatch'])
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+
+def serve(base_path: str,
+          socket_path: Optional[str] = None,
+          walker: Optional[Walker] = None,
+          jobs: int = 1,
+          interval: float = 2.0,
+          ready: Optional[threading.Event] = None,
+          stop: Optional[threading.Event] = None) -> None:
+    """Indexes documents in base_path, and answers ``Client`` queries
+    over a Unix socket until ``stop`` is set or the process is interrupted.
+
+    The socket is created at socket_path, or ``.fcxref.sock`` in base_path.
+    Documents are checked for changes every ``interval`` seconds.
+    ``ready`` is set once the socket is accepting queries.
+    """
+    if socket_path is None:
+        socket_path = os.path.join(base_path, SOCKET_FILENAME)
+    stop = stop or threading.Event()
+    index = SlimWorkspace(base_path, walker, jobs)
+    index.refresh()
+    logger.info('Indexed {} document(s) in {}.'.format(len(index), base_path))
+
+    _remove_stale_socket(socket_path)
+    server = _Server(socket_path, index)
+
+    def shutdown_when_stopped() -> None:
+        stop.wait()
+        server.shutdown()
+    poller = threading.Thread(target=_poll, args=(index, interval, stop), daemon=True)
+    stopper = threading.Thread(target=shutdown_when_stopped, daemon=True)
+    try:
+        poller.start()
+        stopper.start()
+        logger.info('Listening on {}'.format(socket_path))
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, index: SlimWorkspace) -> None:
+        super().__init__(socket_path, _RequestHandler)
+        self.index = index
+        self.find = make_find(index)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            message = json.loads(line.decode(ENCODING))
+            response = self._respond(message)
+        except Exception as error:
+            logger.exception('Failed to answer {}'.format(line))
+            response = {'error': '{}: {}'.format(type(error).__name__, error)}
+        self.wfile.write(json.dumps(response).encode(ENCODING) + b'\n')
+
+    def _respond(self, message: dict) -> dict:
+        command = message['command']
+        base_path = self.server.index.base_path
+        if command == 'ping':
+            return {}
+        mismatch = _find_mismatch(self.server.index, message)
+        if mismatch is not None:
+            return {'mismatch': mismatch}
+        if command == 'find':
+            query = Query(message['document'], message['object'], message.get('property'))
+            references = self.server.find(base_path, query)
+            return {'references': [vars(reference) for reference in references]}
+        elif command == 'remove':
+            return {'document_paths': self.server.index.find_linking_document_paths(message['document'])}
+        raise ValueError('Unknown command "{}".'.format(command))
+
+
+def _poll(index: SlimWorkspace, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        try:
+            changed_document_paths = index.refresh()
+        except OSError as error:
+            logger.error('Failed to refresh index: {}'.format(error))
+            continue
+        if changed_document_paths:
+            logger.info('Refreshed {} document(s).'.format(len(changed_document_paths)))
+
+
+def _find_mismatch(index: SlimWorkspace, message: dict) -> Optional[str]:
+    """Returns why the documents of index aren't the documents message is about, if they aren't."""
+    base_path = os.path.abspath(index.base_path)
+    if message.get('base_path') != base_path:
+        return 'Server finds documents in "{}", not "{}".'.format(base_path, message.get('base_path'))
+    options = (index.walker or Walker()).options()
+    if message.get('walker') != options:
+        return 'Server finds documents with {}, not {}.'.format(options, message.get('walker'))
+    return None
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Removes a socket left behind by a server which didn't shut down cleanly."""
+    if not os.path.exists(socket_path):
+        return
+    try:
+        Client(socket_path, os.path.dirname(socket_path)).request({'command': 'ping'})
+    except OSError:
+        os.unlink(socket_path)
+        return
+    raise RuntimeError('A server is already listening on {}'.format(socket_path))
@@ -0,0 +1,255 @@
+import sys
+from typing import IO, FrozenSet, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+from zipfile import ZipFile
+
+from .copy_on_write import Locator
+from .find.property_scanner import scanner_by_property_name
+from .process_map import catch_document_errors, iter_document_results, process_map
+from .profiler import phase
+
+__all__ = [
+    'iter_slim_documents',
+    'load_slim_document',
+    'read_slim_document',
+    'SlimAttribute',
+    'SlimDocument',
+    'SlimProperty'
+]
+
+# Depths of elements in Document.xml, where the Document element has a depth of 1.
+#
+#   Document/ObjectData/Object/Properties/Property/Cells/Cell
+#   1        2          3      4          5        6     7
+#                                                        XLinks/DocMap
+#                                                        7      8
+OBJECT_DEPTH = 3
+PROPERTIES_DEPTH = 4
+PROPERTY_DEPTH = 5
+NESTED_DEPTH = 6
+CHILD_DEPTH = 7
+DOC_MAP_DEPTH = 8
+
+XPATH_TEMPLATE = "ObjectData/Object[@name='{}']/Properties/Property[@name='{}']/"
+
+
+class SlimProperty:
+    """A reference-bearing property (e.g. ``cells``) of an object,
+    shared by the attributes found in it.
+
+    ``locator`` is the locator of the property's nested element (e.g. ``Cells``).
+    """
+    __slots__ = ('object_name', 'property_name', 'locator', 'location_xpath_template')
+
+    def __init__(self,
+                 object_name: str,
+                 property_name: str,
+                 locator: Locator,
+                 location_xpath_template: str) -> None:
+        self.object_name = object_name
+        self.property_name = property_name
+        self.locator = locator
+        self.location_xpath_template = location_xpath_template
+
+
+class SlimAttribute:
+    """An attribute with potential references (e.g. the ``content`` of a ``Cell``)."""
+    __slots__ = ('property', 'reference_attribute', 'location', 'content', 'child_index')
+
+    def __init__(self,
+                 property: SlimProperty,
+                 reference_attribute: str,
+                 location: str,
+                 content: str,
+                 child_index: int) -> None:
+        self.property = property
+        self.reference_attribute = reference_attribute
+        self.location = location
+        self.content = content
+        self.child_index = child_index
+
+
+class SlimDocument:
+    """The reference-bearing data of a ``Document.xml``:
+    the document label, object names and labels,
+    attributes of ``cells`` and ``ExpressionEngine`` properties,
+    and names of documents in their ``XLinks``.
+
+    Names are interned, so they're shared across documents.
+    A slim document can be passed to ``find`` and ``find_many`` in place of a root,
+    but not to ``rename_property`` or ``remove``, which edit elements.
+    """
+    __slots__ = ('label', 'object_names', 'object_labels', 'attributes', 'doc_map_names')
+
+    def __init__(self,
+                 label: Optional[str] = None,
+                 object_names: Tuple[str, ...] = (),
+                 object_labels: Tuple[Optional[str], ...] = (),
+                 attributes: Tuple[SlimAttribute, ...] = (),
+                 doc_map_names: FrozenSet[str] = frozenset()) -> None:
+        self.label = label
+        self.object_names = object_names
+        self.object_labels = object_labels
+        self.attributes = attributes
+        self.doc_map_names = doc_map_names
+
+    def find_object_name(self, object_label: str) -> Optional[str]:
+        """Returns the name of the first object labeled object_label."""
+        for object_name, label in zip(self.object_names, self.object_labels):
+            if label == object_label:
+                return object_name
+        return None
+
+    def iter_reference_attributes(self) -> Iterator[Tuple[str, str, str, str, str, str, Locator]]:
+        """Yields the same tuples as ``iter_reference_attributes`` for the root of the document."""
+        for attribute in self.attributes:
+            property = attribute.property
+            yield (property.object_name,
+                   property.property_name,
+                   attribute.reference_attribute,
+                   attribute.location,
+                   attribute.content,
+                   (XPATH_TEMPLATE.format(property.object_name, property.property_name) +
+                    property.location_xpath_template.format(attribute.location)),
+                   property.locator + (attribute.child_index,))
+
+    def __repr__(self):
+        return 'SlimDocument(label={!r}, objects={}, attributes={})'.format(
+            self.label, len(self.object_names), len(self.attributes))
+
+
+def read_slim_document(source: IO[bytes]) -> SlimDocument:
+    """Returns the slim document of a ``Document.xml`` file object, parsed in one pass.
+
+    Elements are detached from their parent as soon as they end,
+    so the full element tree is never built.
+    """
+    path = []
+    # Number of children seen so far of each element in path.
+    child_counts = [0]
+    indices = []
+    label = None
+    object_names = []
+    object_labels = []
+    attributes = []
+    doc_map_names = set()
+
+    seen_label_property = False
+    in_label_property = False
+    seen_object_data = False
+    in_object_data = False
+    in_properties = False
+    seen_properties = False
+    property_name = None
+    property = None
+    scanner = None
+    nested_tag = None
+
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            indices.append(child_counts[-1])
+            child_counts[-1] += 1
+            child_counts.append(0)
+            path.append(element)
+            depth = len(path)
+            tag = element.tag
+            if depth == 2:
+                in_object_data = tag == 'ObjectData' and not seen_object_data
+                seen_object_data = seen_object_data or in_object_data
+            elif depth == 3 and path[1].tag == 'Properties':
+                in_label_property = (tag == 'Property' and
+                                     not seen_label_property and
+                                     element.attrib.get('name') == 'Label')
+                seen_label_property = seen_label_property or in_label_property
+            elif depth == 4 and in_label_property:
+                if label is None and 'value' in element.attrib:
+                    label = element.attrib['value']
+            elif not in_object_data:
+                continue
+            elif depth == OBJECT_DEPTH and tag == 'Object':
+                object_names.append(sys.intern(element.attrib['name']))
+                object_labels.append(None)
+                seen_properties = False
+            elif depth == PROPERTIES_DEPTH and path[2].tag == 'Object' and tag == 'Properties':
+                in_properties = not seen_properties
+                seen_properties = True
+            elif depth == PROPERTY_DEPTH and in_properties and tag == 'Property':
+                property_name = sys.intern(element.attrib['name'])
+                scanner = scanner_by_property_name.get(property_name)
+                nested_tag = None
+            elif depth == NESTED_DEPTH and property_name == 'Label' and in_properties:
+                if object_labels[-1] is None and 'value' in element.attrib:
+                    object_labels[-1] = sys.intern(element.attrib['value'])
+            elif (depth == NESTED_DEPTH and
+                  scanner is not None and
+                  nested_tag is None and
+                  tag == scanner.nested_element_name):
+                nested_tag = tag
+                property = SlimProperty(object_names[-1],
+                                        property_name,
+                                        tuple(indices[1:]),
+                                        scanner.location_xpath_template)
+            elif (depth == DOC_MAP_DEPTH and
+                  nested_tag and
+                  path[-3].tag == nested_tag and
+                  path[-2].tag == 'XLinks' and
+                  tag == 'DocMap' and
+                  'name' in element.attrib):
+                doc_map_names.add(sys.intern(element.attrib['name']))
+            continue
+
+        depth = len(path)
+        if (depth == CHILD_DEPTH and
+                nested_tag and
+                path[-2].tag == nested_tag and
+                element.tag == scanner.child_element_name):
+            attrib = element.attrib
+            for reference_attribute in scanner.reference_attributes:
+                if reference_attribute in attrib:
+                    attributes.append(SlimAttribute(property,
+                                                    reference_attribute,
+                                                    sys.intern(attrib[scanner.location_attribute]),
+                                                    attrib[reference_attribute],
+                                                    indices[-1]))
+        elif depth == NESTED_DEPTH and element.tag == nested_tag:
+            # Only the first nested element of a property is searched.
+            nested_tag = ''
+        elif depth == PROPERTY_DEPTH:
+            property_name = None
+            scanner = None
+        elif depth == PROPERTIES_DEPTH:
+            in_properties = False
+        elif depth == 3:
+            in_label_property = False
+        elif depth == 2:
+            in_object_data = False
+
+        path.pop()
+        indices.pop()
+        child_counts.pop()
+        if path:
+            path[-1].remove(element)
+
+    return SlimDocument(label,
+                        tuple(object_names),
+                        tuple(object_labels),
+                        tuple(attributes),
+                        frozenset(doc_map_names))
+
+
+@catch_document_errors()
+def load_slim_document(document_path: str) -> SlimDocument:
+    """Returns a (slim document, error) pair of the document at document_path (see ``catch_document_errors``)."""
+    with phase('parse', document_path):
+        with ZipFile(document_path, 'r') as archive, archive.open('Document.xml') as source:
+            return read_slim_document(source)
+
+
+def iter_slim_documents(document_paths: List[str], jobs: int = 1) -> Iterator[Tuple[str, SlimDocument]]:
+    """Yields (document filepath, slim document) pairs,
+    loading documents in a pool of ``jobs`` worker processes when ``jobs`` isn't 1.
+
+    Documents which cannot be loaded are logged and skipped.
+    """
+    results = process_map(load_slim_document, document_paths, jobs)
+    yield from iter_document_results(document_paths, results)
@@ -0,0 +1,152 @@
+import logging
+import os
+import posixpath
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from .profiler import phase
+
+__all__ = ['matches_document_pattern', 'Walker']
+
+logger = logging.getLogger(__name__)
+
+IGNORE_FILENAME = '.fcxrefignore'
+
+DOCUMENT_SUFFIX = '.fcstd'
+
+
+class Walker:
+    """Walks a directory tree for ``.FCStd`` documents with ``os.scandir``.
+
+    Excluded directories are pruned without being descended into.
+    Patterns are case-insensitive, and matched against entry names
+    and paths relative to the base path (using forward slashes).
+
+    * ``include`` - patterns documents must match, if any.
+    * ``exclude`` - patterns of documents and directories to skip.
+      Patterns ending in a slash only match directories.
+    * ``max_depth`` - how many directories deep to descend below the base path,
+      where 0 only finds documents directly in the base path.
+
+    Patterns in a ``.fcxrefignore`` file in the base path are added to ``exclude``,
+    one per line, ignoring blank lines and lines starting with ``#``.
+
+    Like ``glob``, hidden files and directories are skipped.
+    Symbolic links to directories are followed once,
+    so symbolic link cycles are not descended into again.
+    """
+
+    def __init__(self,
+                 include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None,
+                 max_depth: Optional[int] = None) -> None:
+        self.include = include or []
+        self.exclude = exclude or []
+        self.max_depth = max_depth
+        self._include_patterns = [p.lower() for p in self.include]
+
+    def options(self) -> dict:
+        """Returns include, exclude, and max_depth as a JSON serializable dictionary."""
+        return {'include': list(self.include), 'exclude': list(self.exclude), 'max_depth': self.max_depth}
+
+    def find_document_paths(self, base_path: str, document_pattern: str = '*') -> List[str]:
+        exclude = self.exclude + read_ignore_file(base_path)
+        file_patterns = [p.lower() for p in exclude if not p.endswith('/')]
+        directory_patterns = [p.rstrip('/').lower() for p in exclude]
+        document_paths = []
+        with phase('walk'):
+            self._walk(base_path,
+                       '',
+                       0,
+                       document_pattern.lower(),
+                       file_patterns,
+                       directory_patterns,
+                       set(),
+                       document_paths)
+        return document_paths
+
+    def _walk(self,
+              directory: str,
+              relative_directory: str,
+              depth: int,
+              document_pattern: str,
+              file_patterns: List[str],
+              directory_patterns: List[str],
+              visited: Set[Tuple[int, int]],
+              document_paths: List[str]) -> None:
+        try:
+            stat = os.stat(directory)
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda e: e.name)
+        except OSError as error:
+            logger.warning('Skipping directory {}: {}'.format(directory, error))
+            return
+        inode = (stat.st_dev, stat.st_ino)
+        if inode in visited:
+            logger.debug(f'Skipping already visited directory {directory}')
+            return
+        visited.add(inode)
+
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            relative_path = posixpath.join(relative_directory, entry.name)
+            try:
+                is_directory = entry.is_dir()
+            except OSError:
+                continue
+            if is_directory:
+                if self.max_depth is not None and depth >= self.max_depth:
+                    continue
+                if _matches_any(entry.name, relative_path, directory_patterns):
+                    logger.debug(f'Skipping excluded directory {entry.path}')
+                    continue
+                self._walk(entry.path,
+                           relative_path,
+                           depth + 1,
+                           document_pattern,
+                           file_patterns,
+                           directory_patterns,
+                           visited,
+                           document_paths)
+            elif self._is_document(entry.name, relative_path, document_pattern, file_patterns):
+                document_paths.append(entry.path)
+
+    def _is_document(self,
+                     name: str,
+                     relative_path: str,
+                     document_pattern: str,
+                     file_patterns: List[str]) -> bool:
+        if not matches_document_pattern(name, document_pattern):
+            return False
+        if _matches_any(name, relative_path, file_patterns):
+            return False
+        return not self._include_patterns or _matches_any(name, relative_path, self._include_patterns)
+
+
+def matches_document_pattern(document_path: str, document_pattern: str) -> bool:
+    """Returns whether document_path is a document with a name (without ``.FCStd``)
+    matching document_pattern, ignoring case.
+    """
+    name = os.path.basename(document_path).lower()
+    if not name.endswith(DOCUMENT_SUFFIX):
+        return False
+    return fnmatchcase(name[:-len(DOCUMENT_SUFFIX)], document_pattern.lower())
+
+
+def read_ignore_file(base_path: str) -> List[str]:
+    ignore_path = Path(base_path).joinpath(IGNORE_FILENAME)
+    try:
+        lines = ignore_path.read_text().splitlines()
+    except OSError:
+        return []
+    return [line.strip() for line in lines
+            if line.strip() and not line.strip().startswith('#')]
+
+
+def _matches_any(name: str, relative_path: str, lowercase_patterns: List[str]) -> bool:
+    name = name.lower()
+    relative_path = relative_path.lower()
+    return any(fnmatchcase(name, pattern) or fnmatchcase(relative_path, pattern)
+               for pattern in lowercase_patterns)
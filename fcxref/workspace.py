@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import Element
+
+from .root_by_document_path import find_document_paths, iter_document_xmls
+from .slim_document import SlimDocument, iter_slim_documents
+from .walker import Walker, matches_document_pattern
+
+__all__ = ['SlimWorkspace', 'Workspace']
+
+logger = logging.getLogger(__name__)
+
+
+class Workspace:
+    """Documents in base_path, loaded once and shared across calls.
+
+    A workspace is a loader which can be passed to ``make_find``, ``make_rename_property``,
+    ``make_remove``, and the other factories accepting a ``find_root_by_document_path`` function.
+    Documents are loaded on first use,
+    and reloaded by ``refresh`` when their modification time or size changes.
+
+    ``rename_property`` and ``remove`` return copies of the roots they update,
+    so roots are never modified.
+    Call ``refresh`` after writing updated roots to documents.
+    """
+
+    def __init__(self, base_path: str, walker: Optional[Walker] = None, jobs: int = 1) -> None:
+        self.base_path = base_path
+        self.walker = walker
+        self.jobs = jobs
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._entry_by_document_path: Dict[str, Tuple[Tuple[int, int], Element]] = {}
+
+    def refresh(self) -> List[str]:
+        """Loads new and changed documents, and drops deleted documents.
+
+        Returns paths of loaded and dropped documents.
+        """
+        document_paths = find_document_paths(self.base_path, walker=self.walker)
+        key_by_document_path = {}
+        for document_path in document_paths:
+            try:
+                stat = os.stat(document_path)
+            except OSError:
+                continue
+            key_by_document_path[document_path] = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry_by_document_path = dict(self._entry_by_document_path)
+        changed_document_paths = [
+            p for p, key in key_by_document_path.items()
+            if p not in entry_by_document_path or entry_by_document_path[p][0] != key
+        ]
+        dropped_document_paths = [
+            p for p in entry_by_document_path if p not in key_by_document_path
+        ]
+        for document_path in dropped_document_paths:
+            del entry_by_document_path[document_path]
+        for document_path, root in self._load(changed_document_paths):
+            logger.debug(f'Loaded {document_path}')
+            entry_by_document_path[document_path] = (key_by_document_path[document_path], root)
+        # Keep documents in the order they're found in.
+        with self._lock:
+            self._entry_by_document_path = {
+                p: entry_by_document_path[p] for p in document_paths if p in entry_by_document_path
+            }
+            self._loaded = True
+        return changed_document_paths + dropped_document_paths
+
+    def __call__(self,
+                 base_path: str,
+                 document_pattern: str = '*',
+                 *args,
+                 **kwargs) -> Iterator[Tuple[str, Element]]:
+        """Yields (document filepath, root) pairs of loaded documents with names matching document_pattern.
+
+        Accepts the same arguments as ``iter_root_by_document_path``,
+        but ``jobs``, ``cache``, ``prefilter``, and ``walker`` have no effect since documents are already loaded.
+
+        Raises ``ValueError`` when base_path isn't the base path of the workspace.
+        """
+        if os.path.abspath(base_path) != os.path.abspath(self.base_path):
+            raise ValueError('Workspace of "{}" can\'t load documents in "{}".'.format(
+                self.base_path, base_path))
+        if not self._loaded:
+            self.refresh()
+        with self._lock:
+            items = list(self._entry_by_document_path.items())
+        for document_path, (_, root) in items:
+            if document_pattern == '*' or matches_document_pattern(document_path, document_pattern):
+                yield document_path, root
+
+    def __len__(self):
+        return len(self._entry_by_document_path)
+
+    def _load(self, document_paths: List[str]) -> Iterator[Tuple[str, Element]]:
+        """Yields (document filepath, root) pairs of the documents to keep in memory."""
+        return iter_document_xmls(document_paths, self.jobs)
+
+
+class SlimWorkspace(Workspace):
+    """Workspace keeping a ``SlimDocument`` of each document in memory, instead of its root.
+
+    Slim documents only hold labels, reference-bearing attributes, and names of documents in ``XLinks``,
+    so they take a fraction of the memory of roots, and are read without building element trees.
+    A slim workspace can be passed to ``make_find``, ``make_iter_find``, and ``make_find_many``,
+    but not to factories of functions which edit roots, such as ``make_rename_property`` and ``make_remove``.
+    """
+
+    def find_linking_document_paths(self, document_name: str) -> List[str]:
+        """Returns paths of documents with ``XLinks`` to document_name,
+        which are the documents ``remove`` updates.
+        """
+        return [document_path for document_path, document in self(self.base_path)
+                if document_name in document.doc_map_names]
+
+    def _load(self, document_paths: List[str]) -> Iterator[Tuple[str, SlimDocument]]:
+        return iter_slim_documents(document_paths, self.jobs)
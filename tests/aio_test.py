@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+from fcxref import (Query, afind, aremove, arename_property, find, remove,
+                    rename_property)
+from fcxref import aio
+
+example_path = str(Path(__file__).parent.parent.joinpath('example'))
+
+
+class AioTest(unittest.TestCase):
+
+    def test_same_results_as_synchronous_functions(self):
+        query = Query('MainDocument', 'Spreadsheet', 'Value')
+        rename_args = ('MainDocument', 'Spreadsheet', ('Value', 'RenamedValue'))
+        for executor in [None, ThreadPoolExecutor(2), ProcessPoolExecutor(2)]:
+            with self.subTest(executor=type(executor).__name__):
+                self.assertListEqual(asyncio.run(afind(example_path, query, executor)),
+                                     find(example_path, query))
+                self.assert_roots_equal(asyncio.run(arename_property(example_path, *rename_args, executor)),
+                                        rename_property(example_path, *rename_args))
+                self.assert_roots_equal(asyncio.run(aremove(example_path, 'MainDocument', executor)),
+                                        remove(example_path, 'MainDocument'))
+            if executor is not None:
+                executor.shutdown()
+
+    def test_rename_property_with_labels(self):
+        args = ('<<MainDocument>>', '<<Spreadsheet>>', ('Value', 'RenamedValue'))
+
+        self.assert_roots_equal(asyncio.run(arename_property(example_path, *args)),
+                                rename_property(example_path, *args))
+
+    def test_cancel(self):
+        started = threading.Event()
+        release = threading.Event()
+        load_document_xml = aio.load_document_xml
+
+        def blocking_load_document_xml(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return load_document_xml(*args, **kwargs)
+
+        async def cancel_find(executor):
+            task = asyncio.ensure_future(afind(example_path, Query('MainDocument', 'Spreadsheet'), executor, limit=1))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with ThreadPoolExecutor(1) as executor, \
+                patch.object(aio, 'load_document_xml', wraps=blocking_load_document_xml) as mock:
+            asyncio.run(cancel_find(executor))
+            release.set()
+
+        self.assertEqual(mock.call_count, 1)
+
+    def test_limit_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(afind(example_path, Query('MainDocument', 'Spreadsheet'), limit=0))
+
+    def assert_roots_equal(self, actual, expected):
+        self.assertListEqual(list(actual.keys()), list(expected.keys()))
+        for document_path, root in actual.items():
+            self.assertEqual(ElementTree.tostring(root), ElementTree.tostring(expected[document_path]))
+
+
+if __name__ == '__main__':
+    unittest.main()
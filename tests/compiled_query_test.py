@@ -0,0 +1,32 @@
+import unittest
+
+from fcxref.find import Query
+from fcxref.find.compiled_query import CompiledQuery
+
+
+class CompiledQueryTest(unittest.TestCase):
+
+    def test_search(self):
+        compiled_query = CompiledQuery(Query('MainDocument', 'Spreadsheet', 'Value'))
+
+        match, indirect_match = compiled_query.search('=MainDocument#Spreadsheet.Value + Value', False)
+        self.assertEqual(match.group(0), 'MainDocument#Spreadsheet.Value')
+        self.assertEqual(indirect_match.start(), len('=MainDocument#Spreadsheet.Value + '))
+
+        match, indirect_match = compiled_query.search('=MainDocument#Spreadsheet.Value', False)
+        self.assertIsNotNone(match)
+        self.assertIsNone(indirect_match)
+
+        match, indirect_match = compiled_query.search('=Spreadsheet.Value', True)
+        self.assertEqual(match.group(0), 'Value')
+        self.assertIsNone(indirect_match)
+
+    def test_search_indirect_with_variable_width_regex(self):
+        compiled_query = CompiledQuery(Query('Main.*', 'Spreadsheet', 'Value'))
+
+        self.assertIsNone(compiled_query.search_indirect('=MainDocument#Spreadsheet.Value'))
+        self.assertIsNotNone(compiled_query.search_indirect('=Spreadsheet.Value'))
+
+
+if __name__ == '__main__':
+    unittest.main()
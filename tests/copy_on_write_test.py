@@ -0,0 +1,78 @@
+import re
+import unittest
+from pathlib import Path
+from xml.etree import ElementTree
+
+from fcxref.copy_on_write import (CopyOnWriteTree, find_locator,
+                                  matches_locator)
+from fcxref.find import Query
+from fcxref.find.find_references_in_root import find_references_in_root
+from fcxref.rename.rename_references_in_root import rename_references_in_root
+
+
+def load_root(document_xml_path: str):
+    path = Path(__file__).parent.joinpath(document_xml_path)
+    with open(path) as f:
+        document_xml = f.read()
+    return ElementTree.fromstring(document_xml)
+
+
+class CopyOnWriteTreeTest(unittest.TestCase):
+
+    def test_element(self):
+        root = load_root('MainDocument.xml')
+        original_xml = ElementTree.tostring(root)
+        xpath = "ObjectData/Object[@name='Spreadsheet']/Properties/Property[@name='cells']/Cells/Cell[@address='B1']"
+        locator = find_locator(root, xpath)
+        tree = CopyOnWriteTree(root)
+
+        self.assertIs(tree.root, root)
+        tree.element(locator).set('alias', 'RenamedValue')
+        tree.element(locator).set('content', '20')
+
+        self.assertTrue(tree.modified)
+        self.assertEqual(ElementTree.tostring(root), original_xml)
+        self.assertEqual(tree.root.find(xpath).attrib, {'address': 'B1', 'content': '20', 'alias': 'RenamedValue'})
+        self.assertEqual(root.find(xpath).attrib['alias'], 'Value')
+        # Unedited siblings are shared with the original root.
+        self.assertIs(tree.root[locator[0]][locator[1] + 1], root[locator[0]][locator[1] + 1])
+
+    def test_find_locator(self):
+        root = load_root('MainDocument.xml')
+
+        for reference in find_references_in_root('MainDocument.FCStd', root, re.compile('Value')):
+            with self.subTest(xpath=reference.xpath):
+                self.assertEqual(find_locator(root, reference.xpath), reference.locator)
+        self.assertIsNone(find_locator(root, "ObjectData/Object[@name='Missing']"))
+
+    def test_matches_locator(self):
+        root = load_root('MainDocument.xml')
+        reference = find_references_in_root('MainDocument.FCStd', root, re.compile('Value'))[0]
+        next_locator = reference.locator[:-1] + (reference.locator[-1] + 1,)
+
+        self.assertTrue(matches_locator(root, reference.locator, reference.xpath))
+        self.assertFalse(matches_locator(root, next_locator, reference.xpath))
+        self.assertFalse(matches_locator(root, reference.locator[:-1], reference.xpath))
+        self.assertFalse(matches_locator(root, reference.locator[:-1] + (1000,), reference.xpath))
+
+    def test_rename_references_in_root_with_stale_locators(self):
+        root = load_root('MainDocument.xml')
+        references = find_references_in_root('MainDocument.FCStd', root, re.compile(r'\bValue\b'))
+        # Another load of the document, where a cell was added before the others.
+        other_root = load_root('MainDocument.xml')
+        other_root.find("ObjectData/Object[@name='Spreadsheet']/Properties/Property[@name='cells']/Cells").insert(
+            0, ElementTree.Element('Cell', {'address': 'Z1', 'content': 'Value'}))
+
+        renamed_root = rename_references_in_root(other_root,
+                                                 references,
+                                                 Query('MainDocument', 'Spreadsheet', 'RenamedValue'))
+
+        for reference in references:
+            with self.subTest(xpath=reference.xpath):
+                attribute = renamed_root.find(reference.xpath).attrib[reference.reference_attribute]
+                self.assertIn('RenamedValue', attribute)
+        self.assertEqual(renamed_root.find(".//Cell[@address='Z1']").attrib['content'], 'Value')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from pathlib import Path
+
+from fcxref.dependency_graph import DependencyGraph, make_build_dependency_graph
+from fcxref.root_by_document_path import find_document_paths
+
+example_path = Path(__file__).parent.parent.joinpath('example')
+
+
+class DependencyGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dependency_graph = DependencyGraph({
+            'Assembly.FCStd': ['Part.FCStd'],
+            'Part.FCStd': ['Master.FCStd', 'Sketch.FCStd'],
+            'Master.FCStd': [],
+            'Drawing.FCStd': ['Part.FCStd', 'Assembly.FCStd'],
+            'Sketch.FCStd': []
+        })
+
+    def test_dependencies(self):
+        self.assertListEqual(self.dependency_graph.dependencies('Assembly'),
+                             ['Part.FCStd'])
+        self.assertListEqual(self.dependency_graph.dependencies('Assembly', transitive=True),
+                             ['Part.FCStd', 'Master.FCStd', 'Sketch.FCStd'])
+        self.assertListEqual(self.dependency_graph.dependencies('Master'), [])
+
+    def test_dependents(self):
+        self.assertListEqual(self.dependency_graph.dependents('Master'),
+                             ['Part.FCStd', 'Assembly.FCStd', 'Drawing.FCStd'])
+        self.assertListEqual(self.dependency_graph.dependents('Master', transitive=False),
+                             ['Part.FCStd'])
+        self.assertListEqual(self.dependency_graph.dependents('Drawing'), [])
+
+    def test_dependents_with_cycle(self):
+        dependency_graph = DependencyGraph({'A.FCStd': ['B.FCStd'], 'B.FCStd': ['A.FCStd']})
+
+        self.assertListEqual(dependency_graph.dependents('A'), ['B.FCStd'])
+
+    def test_build_dependency_graph(self):
+        build_dependency_graph = make_build_dependency_graph(find_document_paths)
+        main_document_path = str(example_path.joinpath('MainDocument.FCStd'))
+        example_document_path = str(example_path.joinpath('ExampleDocument.FCStd'))
+
+        dependency_graph = build_dependency_graph(str(example_path))
+
+        self.assertDictEqual(dependency_graph.dependencies_by_document_path, {
+            example_document_path: [main_document_path],
+            main_document_path: []
+        })
+        self.assertListEqual(dependency_graph.dependents('MainDocument'), [example_document_path])
+
+
+if __name__ == '__main__':
+    unittest.main()
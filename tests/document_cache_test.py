@@ -0,0 +1,99 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from xml.etree import ElementTree
+
+from fcxref.document_cache import (DocumentCache, extract_reference_root,
+                                   read_document_key)
+from fcxref.find import Query, make_find
+from fcxref.root_by_document_path import find_root_by_document_path
+
+
+def load_root(document_xml_path: str):
+    path = Path(__file__).parent.joinpath(document_xml_path)
+    with open(path) as f:
+        document_xml = f.read()
+    return ElementTree.fromstring(document_xml)
+
+
+class DocumentCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.base_path = Path(self.directory).joinpath('documents')
+        example_path = Path(__file__).parent.parent.joinpath('example')
+        shutil.copytree(example_path, self.base_path)
+        self.cache_path = Path(self.directory).joinpath('cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_extract_reference_root(self):
+        root = load_root('MainDocument.xml')
+
+        reference_root = extract_reference_root(root)
+
+        self.assertEqual(len(reference_root.findall('Properties/Property')), 1)
+        label = reference_root.find("Properties/Property[@name='Label']/String")
+        self.assertEqual(label.attrib['value'], 'MainDocument')
+        property_names = {p.attrib['name'] for p in reference_root.iterfind(
+            'ObjectData/Object/Properties/Property')}
+        self.assertSetEqual(property_names, {'Label', 'cells', 'ExpressionEngine'})
+
+    def test_find_with_cache(self):
+        find = make_find(find_root_by_document_path)
+        query = Query('MainDocument', 'Spreadsheet', 'Value')
+        expected = find(str(self.base_path), query)
+
+        first = find(str(self.base_path), query, cache=DocumentCache(self.cache_path))
+        second = find(str(self.base_path), query, cache=DocumentCache(self.cache_path))
+
+        self.assertListEqual(first, expected)
+        self.assertListEqual(second, expected)
+
+    def test_get_after_document_changes(self):
+        document_path = str(self.base_path.joinpath('MainDocument.FCStd'))
+        cache = DocumentCache(self.cache_path)
+        cache.put(document_path, load_root('MainDocument.xml'))
+        self.assertIsNotNone(cache.get(document_path))
+
+        shutil.copy(self.base_path.joinpath('ExampleDocument.FCStd'), document_path)
+
+        self.assertIsNone(cache.get(document_path))
+
+    def test_put_with_key_read_before_document_changes(self):
+        document_path = str(self.base_path.joinpath('MainDocument.FCStd'))
+        cache = DocumentCache(self.cache_path)
+        key = read_document_key(document_path)
+
+        shutil.copy(self.base_path.joinpath('ExampleDocument.FCStd'), document_path)
+        cache.put(document_path, load_root('MainDocument.xml'), key)
+
+        self.assertTrue(cache.contains(document_path, key))
+        self.assertIsNone(cache.get(document_path))
+
+    def test_evict(self):
+        main_document_path = str(self.base_path.joinpath('MainDocument.FCStd'))
+        example_document_path = str(self.base_path.joinpath('ExampleDocument.FCStd'))
+        cache = DocumentCache(self.cache_path)
+        cache.put(main_document_path, load_root('MainDocument.xml'))
+        cache.put(example_document_path, load_root('ExampleDocument.xml'))
+
+        Path(example_document_path).unlink()
+        cache.evict()
+        cache.save()
+
+        cache = DocumentCache(self.cache_path)
+        self.assertIsNotNone(cache.get(main_document_path))
+        self.assertEqual(len(list(self.cache_path.glob('*.xml'))), 1)
+
+        cache.max_size = 0
+        cache.evict()
+
+        self.assertIsNone(cache.get(main_document_path))
+        self.assertEqual(len(list(self.cache_path.glob('*.xml'))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
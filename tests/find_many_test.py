@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from fcxref.cli import read_queries_file
+from fcxref.find import Query, make_find, make_find_many
+from fcxref.root_by_document_path import iter_root_by_document_path
+
+example_path = Path(__file__).parent.parent.joinpath('example')
+
+
+class FindManyTest(unittest.TestCase):
+
+    def test_find_many_matches_find(self):
+        find = make_find(iter_root_by_document_path)
+        find_many = make_find_many(iter_root_by_document_path)
+        queries = [Query('MainDocument', 'Spreadsheet', 'Value'),
+                   Query('MainDocument', 'Spreadsheet'),
+                   Query('MainDocument', 'Spreadsheet', 'Missing'),
+                   Query('ExampleDocument', 'Spreadsheet', 'Value'),
+                   Query('<<MainDocument>>', '<<Spreadsheet>>', 'Value'),
+                   Query('Main.*', 'Spreadsheet', 'Value'),
+                   Query('Document', 'Spreadsheet', 'Value'),
+                   Query('MainDocument', 'Spreadsheet', 'Val'),
+                   Query('MainDocument', 'Box', 'Length')]
+
+        references_by_query = find_many(str(example_path), queries)
+
+        self.assertListEqual(list(references_by_query.keys()), queries)
+        for query in queries:
+            with self.subTest(query=str(query)):
+                self.assertListEqual(references_by_query[query], find(str(example_path), query))
+        self.assertGreater(len(references_by_query[queries[0]]), 0)
+        self.assertListEqual(references_by_query[queries[2]], [])
+
+
+class ReadQueriesFileTest(unittest.TestCase):
+
+    def setUp(self):
+        file_descriptor, self.path = tempfile.mkstemp(suffix='.txt')
+        os.close(file_descriptor)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_read_queries_file(self):
+        Path(self.path).write_text('# Comment\n'
+                                   'MainDocument Spreadsheet Value\n'
+                                   '\n'
+                                   '"<<My Document>>" Spreadsheet\n')
+
+        queries = read_queries_file(self.path)
+
+        self.assertListEqual([str(query) for query in queries],
+                             ['MainDocument#Spreadsheet.Value', '<<My Document>>#Spreadsheet'])
+
+    def test_read_queries_file_with_wrong_number_of_arguments(self):
+        for line in ['MainDocument', 'MainDocument Spreadsheet Value Extra']:
+            with self.subTest(line=line):
+                Path(self.path).write_text('MainDocument Spreadsheet\n' + line + '\n')
+
+                with self.assertRaisesRegex(ValueError, '{}:2: '.format(self.path)):
+                    read_queries_file(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,18 @@
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
 
+from fcxref.profiler import Profiler
 from fcxref.root_by_document_path import find_root_by_document_path
 
 
 class FindRootByDocumentPathTest(unittest.TestCase):
 
-    @patch('fcxref.root_by_document_path.glob')
-    def test_find_root_by_document_path(self, glob):
+    def test_find_root_by_document_path(self):
         tests_path = Path(__file__).parent
-        glob.return_value = [str(tests_path.joinpath('Test.FCStd'))]
 
         root_by_document_path = find_root_by_document_path(str(tests_path))
 
@@ -26,32 +27,56 @@ class FindRootByDocumentPathTest(unittest.TestCase):
         self.assertEqual(root.attrib['SchemaVersion'], '4')
         self.assertEqual(root.find('Properties').attrib['Count'], '15')
 
-        glob.assert_called_once()
-        glob_pattern = str(tests_path.joinpath('**', '*.FCStd'))
-        glob.assert_called_with(glob_pattern, recursive=True)
-
-    @patch('fcxref.root_by_document_path.glob')
-    def test_find_root_by_document_path_with_document_pattern(self, glob):
+    def test_find_root_by_document_path_with_document_pattern(self):
         tests_path = Path(__file__).parent
-        glob.return_value = [str(tests_path.joinpath('Test.FCStd'))]
 
-        root_by_document_path = find_root_by_document_path(
-            str(tests_path), 'Test')
+        for document_pattern in ['Test', 'test', 'T*']:
+            with self.subTest(document_pattern=document_pattern):
+                root_by_document_path = find_root_by_document_path(
+                    str(tests_path), document_pattern)
 
-        self.assertEqual(len(root_by_document_path.items()), 1)
+                self.assertEqual(len(root_by_document_path.items()), 1)
 
-        document_path = str(tests_path.joinpath('Test.FCStd'))
-        self.assertIn(document_path, root_by_document_path)
+                document_path = str(tests_path.joinpath('Test.FCStd'))
+                self.assertIn(document_path, root_by_document_path)
+
+                root = root_by_document_path[document_path]
+                self.assertIsInstance(root, Element)
+                self.assertEqual(root.tag, 'Document')
+                self.assertEqual(root.attrib['SchemaVersion'], '4')
+                self.assertEqual(root.find('Properties').attrib['Count'], '15')
+
+        root_by_document_path = find_root_by_document_path(str(tests_path), 'Other')
+        self.assertEqual(len(root_by_document_path.items()), 0)
 
+    def test_find_root_by_document_path_with_jobs_skips_corrupt_document(self):
+        tests_path = Path(__file__).parent
+        with tempfile.TemporaryDirectory() as directory:
+            corrupt_document_path = str(Path(directory).joinpath('Corrupt.FCStd'))
+            with open(corrupt_document_path, 'w') as f:
+                f.write('Not a zip file.')
+            document_path = str(Path(directory).joinpath('Test.FCStd'))
+            shutil.copy(tests_path.joinpath('Test.FCStd'), document_path)
+
+            with self.assertLogs('fcxref.process_map', level='ERROR'):
+                root_by_document_path = find_root_by_document_path(
+                    directory, jobs=2)
+
+        self.assertEqual(list(root_by_document_path.keys()), [document_path])
         root = root_by_document_path[document_path]
-        self.assertIsInstance(root, Element)
-        self.assertEqual(root.tag, 'Document')
-        self.assertEqual(root.attrib['SchemaVersion'], '4')
         self.assertEqual(root.find('Properties').attrib['Count'], '15')
 
-        glob.assert_called_once()
-        glob_pattern = str(tests_path.joinpath('**', 'Test.FCStd'))
-        glob.assert_called_with(glob_pattern, recursive=True)
+    def test_find_root_by_document_path_with_jobs_parses_in_this_process(self):
+        example_path = Path(__file__).parent.parent.joinpath('example')
+
+        with Profiler() as profiler:
+            root_by_document_path = find_root_by_document_path(str(example_path), jobs=2)
+
+        self.assertDictEqual({p: ElementTree.tostring(r) for p, r in root_by_document_path.items()},
+                             {p: ElementTree.tostring(r) for p, r in find_root_by_document_path(str(example_path)).items()})
+        # Workers only read documents, so parsing is recorded here.
+        self.assertEqual(profiler.stats.phases['parse'].calls, 2)
+        self.assertNotIn('decompress', profiler.stats.phases)
 
 
 if __name__ == '__main__':
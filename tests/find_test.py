@@ -1,13 +1,13 @@
 import unittest
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, Tuple
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
 
-from fcxref.find import Query, Reference, make_find
+from fcxref.find import Query, Reference, make_find, make_iter_find
 
 
-def find_root_by_document_path(base_path: str) -> Dict[str, Element]:
+def find_root_by_document_path(base_path: str, document_pattern: str = '*', jobs: int = 1, cache=None, prefilter=None) -> Dict[str, Element]:
     documents = ['MainDocument', 'ExampleDocument']
     root_by_document_path = {}
     for document in documents:
@@ -18,6 +18,10 @@ def find_root_by_document_path(base_path: str) -> Dict[str, Element]:
     return root_by_document_path
 
 
+def iter_root_by_document_path(base_path: str, document_pattern: str = '*', jobs: int = 1, cache=None, prefilter=None) -> Iterator[Tuple[str, Element]]:
+    yield from find_root_by_document_path(base_path, document_pattern, jobs, cache).items()
+
+
 class FindTest(unittest.TestCase):
 
     def test_find_with_document_object_and_property(self):
@@ -155,6 +159,32 @@ class FindTest(unittest.TestCase):
                                    '=MainDocument#Spreadsheet.Value',
                                    xpath0))
 
+    def test_find_with_iter_root_by_document_path(self):
+        find = make_find(iter_root_by_document_path)
+        references = find('base_path',
+                          Query('MainDocument', 'Spreadsheet', 'Value'))
+
+        expected = make_find(find_root_by_document_path)(
+            'base_path', Query('MainDocument', 'Spreadsheet', 'Value'))
+        self.assertListEqual(references, expected)
+
+    def test_iter_find_yields_references_as_documents_are_checked(self):
+        loaded_document_paths = []
+
+        def iter_root_by_document_path_logging_loads(*args, **kwargs):
+            for document_path, root in iter_root_by_document_path(*args, **kwargs):
+                loaded_document_paths.append(document_path)
+                yield document_path, root
+
+        iter_find = make_iter_find(iter_root_by_document_path_logging_loads)
+        references = iter_find('base_path', Query('MainDocument', 'Spreadsheet', 'Value'))
+
+        self.assertEqual(next(references).document_path, 'MainDocument.FCStd')
+        self.assertListEqual(loaded_document_paths, ['MainDocument.FCStd'])
+        expected = make_find(find_root_by_document_path)(
+            'base_path', Query('MainDocument', 'Spreadsheet', 'Value'))
+        self.assertListEqual(list(references), expected[1:])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+from pathlib import Path
+from xml.etree import ElementTree
+
+from fcxref.find.find_references_in_root import iter_reference_attributes
+from fcxref.find.iter_reference_attributes_in_document_xml import \
+    iter_reference_attributes_in_document_xml
+
+
+class IterReferenceAttributesInDocumentXMLTest(unittest.TestCase):
+
+    def test_iter_reference_attributes_in_document_xml_matches_iter_reference_attributes(self):
+        documents = ['MainDocument', 'ExampleDocument', 'ExampleDocumentWithMultiXLink']
+        for document in documents:
+            with self.subTest(document=document):
+                document_xml_path = Path(__file__).parent.joinpath(f'{document}.xml')
+                root = ElementTree.parse(document_xml_path).getroot()
+                with open(document_xml_path, 'rb') as source:
+                    attributes = list(iter_reference_attributes_in_document_xml(source))
+
+                self.assertGreater(len(attributes), 0)
+                self.assertListEqual(attributes, list(iter_reference_attributes(root)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,18 @@
 import unittest
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+from xml.etree import ElementTree
 
+from fcxref.find import Query
+from fcxref.label import (LabelIndex, find_document_label, index_objects,
+                          read_document_label)
+from fcxref.prefilter import QueryPrefilter
 from fcxref.rename.label import is_label, extract_label
 
+tests_path = Path(__file__).parent
+example_path = tests_path.parent.joinpath('example')
+
 
 class LabelTest(unittest.TestCase):
 
@@ -20,6 +31,56 @@ class LabelTest(unittest.TestCase):
         self.assertEqual(extract_label('<<Something with Spaces>>'), 'Something with Spaces')
         self.assertEqual(extract_label('Main'), 'Main')
         self.assertEqual(extract_label('<<<SurroundedByAngleBrackets>>>'), '<SurroundedByAngleBrackets>')
+    def test_read_document_label(self):
+        document_xml = tests_path.joinpath('MainDocument.xml').read_bytes()
+        objects_start = document_xml.index(b'<Objects ')
+
+        # Everything after the document's properties is cut off, so parsing must stop before it.
+        label = read_document_label(BytesIO(document_xml[:objects_start]))
+
+        self.assertEqual(label, 'MainDocument')
+
+    def test_find_document_label(self):
+        root = ElementTree.parse(tests_path.joinpath('MainDocument.xml')).getroot()
+
+        self.assertEqual(find_document_label(root), 'MainDocument')
+
+    def test_label_index(self):
+        label_index = LabelIndex()
+        document_path = str(example_path.joinpath('MainDocument.FCStd'))
+
+        self.assertEqual(label_index.document_label(document_path), 'MainDocument')
+        self.assertIsNone(label_index.document_label('Missing.FCStd'))
+
+    def test_label_index_with_document_xml(self):
+        label_index = LabelIndex()
+        document_xml = tests_path.joinpath('MainDocument.xml').read_bytes()
+
+        with patch('fcxref.label.ZipFile') as zip_file:
+            self.assertEqual(label_index.document_label('Missing.FCStd', document_xml), 'MainDocument')
+            self.assertTrue(QueryPrefilter(Query('<<MainDocument>>', 'Spreadsheet', 'Value')).matches(
+                'Missing.FCStd', document_xml))
+
+        zip_file.assert_not_called()
+
+    def test_index_objects(self):
+        root = ElementTree.parse(tests_path.joinpath('MainDocument.xml')).getroot()
+
+        object_index = index_objects(root)
+
+        self.assertIs(index_objects(root), object_index)
+        self.assertIs(object_index.find('<<Cube>>'), object_index.find('Box'))
+        self.assertEqual(object_index.find('Box').attrib['name'], 'Box')
+        self.assertIsNone(object_index.find('<<Box>>'))
+
+    def test_query_matches_document_label(self):
+        root = ElementTree.parse(tests_path.joinpath('MainDocument.xml')).getroot()
+        query = Query('<<MainDocument>>', 'Spreadsheet', 'Value')
+
+        self.assertTrue(query.matches_document('Renamed.FCStd', root))
+        self.assertTrue(query.matches_document(str(example_path.joinpath('MainDocument.FCStd'))))
+        self.assertFalse(query.matches_document(str(example_path.joinpath('ExampleDocument.FCStd'))))
+
 
 if __name__ == '__main__':
     unittest.main()
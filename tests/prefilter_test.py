@@ -0,0 +1,69 @@
+import unittest
+from pathlib import Path
+
+from fcxref.find import Query
+from fcxref.prefilter import Prefilter, QueryPrefilter, escape_attribute
+from fcxref.root_by_document_path import find_root_by_document_path
+
+
+def read_document_xml(document_xml_path: str) -> bytes:
+    return Path(__file__).parent.joinpath(document_xml_path).read_bytes()
+
+
+class PrefilterTest(unittest.TestCase):
+
+    def test_prefilter(self):
+        token = 'DocMap name="{}"'.format(escape_attribute('MainDocument'))
+        prefilter = Prefilter([token])
+
+        self.assertTrue(prefilter.matches(
+            'ExampleDocument.FCStd', read_document_xml('ExampleDocument.xml')))
+        self.assertFalse(prefilter.matches(
+            'ExampleDocument.FCStd', read_document_xml('ExampleDocumentWithoutXLink.xml')))
+
+    def test_query_prefilter(self):
+        prefilter = QueryPrefilter(Query('MainDocument', 'Spreadsheet', 'Value'))
+
+        self.assertTrue(prefilter.matches(
+            'ExampleDocument.FCStd', read_document_xml('ExampleDocument.xml')))
+        self.assertTrue(prefilter.matches(
+            'MainDocument.FCStd', read_document_xml('MainDocument.xml')))
+        self.assertListEqual(prefilter.tokens, [b'MainDocument#Spreadsheet', b'Value'])
+        self.assertFalse(prefilter.matches(
+            'OtherDocument.FCStd', read_document_xml('MainDocument.xml')))
+
+    def test_query_prefilter_with_labels(self):
+        prefilter = QueryPrefilter(Query('<<Main Document>>', '<<Spreadsheet>>', 'Value'))
+
+        self.assertListEqual(prefilter.tokens,
+                             [b'&lt;&lt;Main Document&gt;&gt;#&lt;&lt;Spreadsheet&gt;&gt;', b'Value'])
+
+    def test_query_prefilter_with_apostrophes(self):
+        prefilter = QueryPrefilter(Query("<<Bob's>>", 'Spreadsheet', 'Value'))
+        doc_map_prefilter = Prefilter(['DocMap name="{}"'.format(escape_attribute("Bob's"))])
+
+        for apostrophe in [b'&apos;', b"'"]:
+            with self.subTest(apostrophe=apostrophe):
+                document_xml = (b'<Cell address="A1" content="=&lt;&lt;Bob' + apostrophe +
+                                b's&gt;&gt;#Spreadsheet.Value"/>'
+                                b'<DocMap name="Bob' + apostrophe + b's" label="Bob"/>')
+
+                self.assertTrue(prefilter.matches('ExampleDocument.FCStd', document_xml))
+                self.assertTrue(doc_map_prefilter.matches('ExampleDocument.FCStd', document_xml))
+        self.assertFalse(prefilter.matches('ExampleDocument.FCStd', b'&lt;&lt;Bobs&gt;&gt;#Value'))
+
+    def test_find_root_by_document_path_with_prefilter(self):
+        example_path = Path(__file__).parent.parent.joinpath('example')
+        prefilter = QueryPrefilter(Query('MainDocument', 'Box', 'Length'))
+
+        root_by_document_path = find_root_by_document_path(str(example_path),
+                                                           prefilter=prefilter)
+
+        self.assertListEqual(list(root_by_document_path.keys()),
+                             [str(example_path.joinpath('MainDocument.FCStd'))])
+        self.assertEqual(prefilter.parsed, 1)
+        self.assertEqual(prefilter.skipped, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
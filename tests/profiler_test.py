@@ -0,0 +1,88 @@
+import json
+import os
+import pstats
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from fcxref import Profiler, Query, find
+from fcxref.profiler import phase
+
+example_path = Path(__file__).parent.parent.joinpath('example')
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def test_profile_find(self):
+        with Profiler() as profiler:
+            find(str(example_path), Query('MainDocument', 'Spreadsheet', 'Value'))
+
+        stats = profiler.stats
+        self.assertListEqual(list(stats.phases.keys()), ['walk', 'decompress', 'parse', 'match'])
+        self.assertEqual(stats.phases['walk'].calls, 1)
+        self.assertEqual(stats.phases['parse'].calls, 2)
+        self.assertGreater(stats.phases['parse'].peak_memory, 0)
+        self.assertGreaterEqual(stats.peak_memory, stats.phases['parse'].peak_memory)
+        self.assertGreaterEqual(stats.wall_time, sum(p.wall_time for p in stats.phases.values()))
+        self.assertSetEqual({d.document_path for d in stats.slowest_documents()},
+                            {str(example_path.joinpath('ExampleDocument.FCStd')),
+                             str(example_path.joinpath('MainDocument.FCStd'))})
+        slowest_document, _ = stats.slowest_documents(2)
+        self.assertIs(stats.slowest_documents(1)[0], slowest_document)
+        self.assertEqual(len(json.loads(json.dumps(stats.to_dict(1)))['documents']), 1)
+
+    def test_nested_phases(self):
+        with Profiler() as profiler:
+            with phase('outer'):
+                with phase('inner', 'Document.FCStd'):
+                    data = bytearray(1024 * 1024)
+                del data
+
+        stats = profiler.stats
+        self.assertGreaterEqual(stats.phases['outer'].peak_memory, 1024 * 1024)
+        self.assertGreaterEqual(stats.phases['inner'].peak_memory, 1024 * 1024)
+        self.assertListEqual(list(stats.documents['Document.FCStd'].phases.keys()), ['inner'])
+
+    def test_concurrent_phases(self):
+        allocated = threading.Event()
+        other_phase_ended = threading.Event()
+
+        def allocate():
+            with phase('allocate'):
+                data = bytearray(1024 * 1024)
+                del data
+                allocated.set()
+                other_phase_ended.wait()
+
+        with Profiler() as profiler:
+            thread = threading.Thread(target=allocate)
+            thread.start()
+            allocated.wait()
+            with phase('other'):
+                pass
+            other_phase_ended.set()
+            thread.join()
+
+        self.assertGreaterEqual(profiler.stats.phases['allocate'].peak_memory, 1024 * 1024)
+
+    def test_pstats_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pstats_path = os.path.join(directory, 'find.pstats')
+            with Profiler(trace_memory=False, pstats_path=pstats_path) as profiler:
+                find(str(example_path), Query('MainDocument', 'Spreadsheet', 'Value'))
+
+            self.assertIsNone(profiler.stats.phases['parse'].peak_memory)
+            self.assertGreater(pstats.Stats(pstats_path).total_calls, 0)
+
+    def test_phase_without_profiler(self):
+        with phase('parse'):
+            pass
+
+        with Profiler() as profiler:
+            pass
+        self.assertDictEqual(profiler.stats.phases, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import re
+import unittest
+from xml.etree import ElementTree
+
+from fcxref.find import PropertyScanner, register_property_scanner
+from fcxref.find.find_references_in_root import find_references_in_root
+from fcxref.find.property_scanner import scanner_by_property_name
+
+DOCUMENT_XML = """
+<Document SchemaVersion="4">
+    <ObjectData Count="1">
+        <Object name="Sketch">
+            <Properties Count="2">
+                <Property name="Constraints" type="Sketcher::PropertyConstraintList">
+                    <ConstrainList count="1">
+                        <Constrain Name="Width" Expression="Main#Spreadsheet.Width"/>
+                    </ConstrainList>
+                </Property>
+                <Property name="ExpressionEngine" type="App::PropertyExpressionEngine">
+                    <ExpressionEngine count="1">
+                        <Expression path="Height" expression="Main#Spreadsheet.Width"/>
+                    </ExpressionEngine>
+                </Property>
+            </Properties>
+        </Object>
+    </ObjectData>
+</Document>
+"""
+
+
+class PropertyScannerTest(unittest.TestCase):
+
+    def tearDown(self):
+        scanner_by_property_name.pop('Constraints', None)
+
+    def test_register_property_scanner(self):
+        root = ElementTree.fromstring(DOCUMENT_XML)
+        pattern = re.compile(r'Main#Spreadsheet\.Width')
+
+        self.assertEqual(len(find_references_in_root('Sketch.FCStd', root, pattern)), 1)
+
+        register_property_scanner('Constraints', PropertyScanner(nested_element_name='ConstrainList',
+                                                                 child_element_name='Constrain',
+                                                                 reference_attributes=('Expression',),
+                                                                 location_attribute='Name'))
+        references = find_references_in_root('Sketch.FCStd', root, pattern)
+
+        self.assertEqual(len(references), 2)
+        self.assertEqual(references[0].property_name, 'Constraints')
+        self.assertEqual(references[0].location, 'Width')
+        self.assertEqual(references[0].xpath,
+                         "ObjectData/Object[@name='Sketch']/Properties/Property[@name='Constraints']"
+                         "/ConstrainList/Constrain[@Name='Width']")
+        self.assertIs(root.find(references[0].xpath), root.find('.//Constrain'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from fcxref.find import Query, make_find
+from fcxref.reference_index import ReferenceIndex
+from fcxref.root_by_document_path import find_root_by_document_path
+
+
+class ReferenceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.base_path = os.path.join(self.directory, 'documents')
+        example_path = Path(__file__).parent.parent.joinpath('example')
+        shutil.copytree(example_path, self.base_path)
+        self.index_path = os.path.join(self.directory, 'index.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_find_matches_find(self):
+        find = make_find(find_root_by_document_path)
+        queries = [Query('MainDocument', 'Spreadsheet', 'Value'),
+                   Query('MainDocument', 'Spreadsheet'),
+                   Query('Main.*', 'Spreadsheet'),
+                   Query('Main.*', 'Spreadsheet', 'Value'),
+                   Query('ExampleDocument', 'Spreadsheet', 'Value'),
+                   Query('<<MainDocument>>', '<<Spreadsheet>>', 'Value'),
+                   # Match within longer names, like find.
+                   Query('Document', 'Spreadsheet', 'Value'),
+                   Query('ainDocument', 'Spread'),
+                   Query('MainDocument', 'Spreadsheet', 'Val')]
+        with ReferenceIndex(self.index_path, self.base_path) as index:
+            index.update()
+            for query in queries:
+                with self.subTest(query=str(query)):
+                    self.assertListEqual(index.find(query), find(self.base_path, query))
+
+    def test_update(self):
+        main_document_path = os.path.join(self.base_path, 'MainDocument.FCStd')
+        example_document_path = os.path.join(self.base_path, 'ExampleDocument.FCStd')
+        query = Query('MainDocument', 'Spreadsheet', 'Value')
+        with ReferenceIndex(self.index_path, self.base_path) as index:
+            self.assertListEqual(index.update(), [example_document_path, main_document_path])
+            self.assertGreater(len(index.find(query)), 0)
+
+            stat = os.stat(main_document_path)
+            os.utime(main_document_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            self.assertListEqual(index.update(), [])
+
+            os.unlink(main_document_path)
+            self.assertListEqual(index.update(), [main_document_path])
+
+        with ReferenceIndex(self.index_path, self.base_path) as index:
+            references = index.find(query)
+
+        self.assertGreater(len(references), 0)
+        self.assertTrue(all(r.document_path == example_document_path for r in references))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -101,6 +101,34 @@ class RemoveDocumentFromMultiXLinks(unittest.TestCase):
             ElementTree.tostringlist(expected)
         )
 
+    def test_remove_document_from_xlinks_between_documents(self):
+        xlinks_element = ElementTree.fromstring("""
+            <XLinks count="4" docs="3">
+                <DocMap name="Master" label="Master" index="1"/>
+                <DocMap name="Cube" label="Cube" index="0"/>
+                <DocMap name="Cylinder" label="Cylinder" index="3"/>
+                <XLink file="Cube.FCStd" stamp="2021-07-25T20:03:03Z" name="Box"/>
+                <XLink file="Master.FCStd" stamp="2021-08-01T19:31:06Z" name="Spreadsheet1"/>
+                <XLink file="Master.FCStd" stamp="2021-08-01T19:31:06Z" name="Spreadsheet2"/>
+                <XLink file="Cylinder.FCStd" stamp="2021-07-25T20:03:03Z" name="Cylinder"/>
+            </XLinks>""")
+        original = ElementTree.tostring(xlinks_element)
+
+        actual = remove_document_from_multi_xlinks(xlinks_element, 'Master')
+
+        expected = ElementTree.fromstring("""
+            <XLinks count="2" docs="2">
+                <DocMap name="Cube" label="Cube" index="0"/>
+                <DocMap name="Cylinder" label="Cylinder" index="1"/>
+                <XLink file="Cube.FCStd" stamp="2021-07-25T20:03:03Z" name="Box"/>
+                <XLink file="Cylinder.FCStd" stamp="2021-07-25T20:03:03Z" name="Cylinder"/>
+            </XLinks>""")
+        self.assertListEqual(
+            ElementTree.tostringlist(actual),
+            ElementTree.tostringlist(expected)
+        )
+        self.assertEqual(ElementTree.tostring(xlinks_element), original)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,7 @@ from fcxref.remove import make_remove
 
 
 def make_find_root_by_document_path(document_name: str):
-    def find_root_by_document_path(base_path: str, document_pattern: str = '*') -> Dict[str, Element]:
+    def find_root_by_document_path(base_path: str, document_pattern: str = '*', jobs: int = 1, prefilter=None) -> Dict[str, Element]:
         document = document_name if document_pattern == '*' else document_pattern
         filepath = '{}.FCStd'.format(document)
         return {
@@ -17,6 +17,14 @@ def make_find_root_by_document_path(document_name: str):
     return find_root_by_document_path
 
 
+def make_iter_root_by_document_path(document_name: str):
+    find_root_by_document_path = make_find_root_by_document_path(document_name)
+
+    def iter_root_by_document_path(base_path: str, document_pattern: str = '*', jobs: int = 1, prefilter=None):
+        yield from find_root_by_document_path(base_path, document_pattern, jobs).items()
+    return iter_root_by_document_path
+
+
 def load_root(document_xml_path: str) -> Element:
     path = Path(__file__).parent.joinpath(document_xml_path)
     with open(path) as f:
@@ -56,6 +64,35 @@ class RemoveTest(unittest.TestCase):
         self.assertMultiLineEqual(ElementTree.tostring(example_root).decode('utf-8'),
                                   ElementTree.tostring(expected_document_root).decode('utf-8'))
 
+    def test_remove_with_iter_root_by_document_path(self):
+        iter_root_by_document_path = make_iter_root_by_document_path(
+            'ExampleDocument')
+        remove = make_remove(iter_root_by_document_path)
+        root_by_document_path = remove('base_path', 'MainDocument')
+
+        self.assertEqual(len(root_by_document_path.items()), 1)
+
+        example_root = root_by_document_path['ExampleDocument.FCStd']
+        expected_document_root = load_root('ExampleDocumentWithoutXLink.xml')
+        self.assertMultiLineEqual(ElementTree.tostring(example_root).decode('utf-8'),
+                                  ElementTree.tostring(expected_document_root).decode('utf-8'))
+
+    def test_remove_does_not_modify_loaded_roots(self):
+        root_by_document_path = {
+            'ExampleDocument.FCStd': load_root('ExampleDocument.xml'),
+            'MainDocument.FCStd': load_root('MainDocument.xml')
+        }
+        xml_by_document_path = {
+            document_path: ElementTree.tostring(root)
+            for document_path, root in root_by_document_path.items()
+        }
+        remove = make_remove(lambda *args, **kwargs: root_by_document_path)
+        removed_root_by_document_path = remove('base_path', 'MainDocument')
+
+        self.assertEqual(list(removed_root_by_document_path.keys()), ['ExampleDocument.FCStd'])
+        for document_path, root in root_by_document_path.items():
+            self.assertEqual(ElementTree.tostring(root), xml_by_document_path[document_path])
+
 
 if __name__ == '__main__':
     unittest.main()
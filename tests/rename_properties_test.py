@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from xml.etree import ElementTree
+
+from fcxref.rename import make_rename_properties, make_rename_property
+from fcxref.root_by_document_path import iter_root_by_document_path
+
+example_path = str(Path(__file__).parent.parent.joinpath('example'))
+
+
+def find_cell(root, address: str):
+    return root.find(".//Cell[@address='{}']".format(address))
+
+
+class RenamePropertiesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rename_properties = make_rename_properties(iter_root_by_document_path)
+
+    def test_rename_properties_matches_rename_property(self):
+        rename_property = make_rename_property(iter_root_by_document_path)
+        expected = rename_property(example_path, 'MainDocument', 'Spreadsheet', ('Value', 'RenamedValue'))
+
+        root_by_document_path = self.rename_properties(example_path,
+                                                       'MainDocument',
+                                                       'Spreadsheet',
+                                                       {'Value': 'RenamedValue'})
+
+        self.assertListEqual(sorted(root_by_document_path.keys()), sorted(expected.keys()))
+        for document_path, root in root_by_document_path.items():
+            with self.subTest(document_path=document_path):
+                self.assertMultiLineEqual(ElementTree.tostring(root).decode('utf-8'),
+                                          ElementTree.tostring(expected[document_path]).decode('utf-8'))
+
+    def test_rename_properties_in_documents_with_the_same_name(self):
+        rename_property = make_rename_property(iter_root_by_document_path)
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copytree(example_path, Path(directory).joinpath('a'))
+            shutil.copytree(example_path, Path(directory).joinpath('b'))
+            expected = rename_property(directory, 'MainDocument', 'Spreadsheet', ('Value', 'RenamedValue'))
+
+            root_by_document_path = self.rename_properties(directory,
+                                                           'MainDocument',
+                                                           'Spreadsheet',
+                                                           {'Value': 'RenamedValue'})
+
+        self.assertIn(str(Path(directory).joinpath('b', 'MainDocument.FCStd')), root_by_document_path)
+        self.assertListEqual(sorted(root_by_document_path.keys()), sorted(expected.keys()))
+        for document_path, root in root_by_document_path.items():
+            with self.subTest(document_path=document_path):
+                self.assertMultiLineEqual(ElementTree.tostring(root).decode('utf-8'),
+                                          ElementTree.tostring(expected[document_path]).decode('utf-8'))
+
+    def test_rename_properties_swaps_properties(self):
+        root_by_document_path = self.rename_properties(example_path,
+                                                       'MainDocument',
+                                                       'Spreadsheet',
+                                                       {'Value': 'ValueOther', 'ValueOther': 'Value'})
+
+        main_root = root_by_document_path[str(Path(example_path).joinpath('MainDocument.FCStd'))]
+        self.assertEqual(find_cell(main_root, 'B1').attrib['alias'], 'ValueOther')
+        self.assertEqual(find_cell(main_root, 'B2').attrib['content'], '=ValueOther')
+        self.assertEqual(find_cell(main_root, 'B3').attrib['alias'], 'Value')
+        example_root = root_by_document_path[str(Path(example_path).joinpath('ExampleDocument.FCStd'))]
+        self.assertEqual(find_cell(example_root, 'B1').attrib['content'],
+                         '=MainDocument#Spreadsheet.ValueOther')
+
+    def test_rename_properties_with_conflicts(self):
+        with self.assertRaisesRegex(ValueError, 'same property'):
+            self.rename_properties(example_path, 'MainDocument', 'Spreadsheet', {'Value': 'A', 'ValueOther': 'A'})
+        with self.assertRaisesRegex(ValueError, 'already exists'):
+            self.rename_properties(example_path, 'MainDocument', 'Spreadsheet', {'Value': 'ValueOther'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,7 @@ from xml.etree.ElementTree import Element
 from fcxref.rename import make_rename_property
 
 
-def find_root_by_document_path(base_path: str, document_pattern: str = '*') -> Dict[str, Element]:
+def find_root_by_document_path(base_path: str, document_pattern: str = '*', jobs: int = 1, cache=None, prefilter=None) -> Dict[str, Element]:
     document = 'ExampleDocument' if document_pattern == '*' else document_pattern
     filepath = '{}.FCStd'.format(document)
     return {
@@ -0,0 +1,77 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from fcxref.find import Query, make_find
+from fcxref.remove import make_remove
+from fcxref.root_by_document_path import find_root_by_document_path
+from fcxref.server import Client, WorkspaceMismatchError, serve
+from fcxref.walker import Walker
+
+example_path = Path(__file__).parent.parent.joinpath('example')
+
+
+@unittest.skipIf(not hasattr(socket, 'AF_UNIX'), 'Unix sockets are not supported.')
+class ServeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.directory, 'fcxref.sock')
+        ready = threading.Event()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=serve,
+                                       args=(str(example_path), self.socket_path),
+                                       kwargs={'ready': ready, 'stop': self.stop})
+        self.thread.start()
+        self.assertTrue(ready.wait(10))
+
+    def tearDown(self):
+        self.stop.set()
+        self.thread.join(10)
+        shutil.rmtree(self.directory)
+
+    def test_find(self):
+        find = make_find(find_root_by_document_path)
+        client = Client(self.socket_path, str(example_path))
+        queries = [Query('MainDocument', 'Spreadsheet', 'Value'),
+                   Query('MainDocument', 'Spreadsheet')]
+        for query in queries:
+            with self.subTest(query=str(query)):
+                references = client.find(query)
+
+                self.assertGreater(len(references), 0)
+                self.assertListEqual(references, find(str(example_path), query))
+
+    def test_remove(self):
+        remove = make_remove(find_root_by_document_path)
+
+        document_paths = Client(self.socket_path, str(example_path)).remove('MainDocument')
+
+        self.assertGreater(len(document_paths), 0)
+        self.assertListEqual(document_paths, list(remove(str(example_path), 'MainDocument').keys()))
+
+    def test_mismatched_workspace(self):
+        clients = [Client(self.socket_path, self.directory),
+                   Client(self.socket_path, str(example_path), Walker(exclude=['Main*']))]
+        for client in clients:
+            with self.subTest(base_path=client.base_path, walker=client.walker.options()):
+                with self.assertRaises(WorkspaceMismatchError):
+                    client.find(Query('MainDocument', 'Spreadsheet'))
+                with self.assertRaises(WorkspaceMismatchError):
+                    client.remove('MainDocument')
+
+    def test_stop_removes_socket(self):
+        self.stop.set()
+        self.thread.join(10)
+
+        self.assertFalse(os.path.exists(self.socket_path))
+        with self.assertRaises(OSError):
+            Client(self.socket_path, str(example_path)).find(Query('MainDocument', 'Spreadsheet'))
+
+
+if __name__ == '__main__':
+    unittest.main()
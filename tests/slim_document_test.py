@@ -0,0 +1,96 @@
+import gc
+import tracemalloc
+import unittest
+from io import BytesIO
+from pathlib import Path
+from xml.etree import ElementTree
+
+from fcxref import (Query, SlimWorkspace, find, find_many, make_find,
+                    make_find_many, remove)
+from fcxref.find.find_references_in_root import iter_reference_attributes
+from fcxref.label import find_document_label, index_objects
+from fcxref.slim_document import read_slim_document
+
+tests_path = Path(__file__).parent
+example_path = tests_path.parent.joinpath('example')
+
+
+class SlimDocumentTest(unittest.TestCase):
+
+    def test_same_reference_attributes_as_root(self):
+        for document_xml_path in sorted(tests_path.glob('*.xml')):
+            with self.subTest(document=document_xml_path.name):
+                root = ElementTree.parse(document_xml_path).getroot()
+                with document_xml_path.open('rb') as source:
+                    document = read_slim_document(source)
+
+                self.assertListEqual(list(iter_reference_attributes(document)),
+                                     list(iter_reference_attributes(root)))
+                self.assertEqual(find_document_label(document), find_document_label(root))
+
+    def test_object_names_and_labels(self):
+        root = ElementTree.parse(tests_path.joinpath('MainDocument.xml')).getroot()
+        with tests_path.joinpath('MainDocument.xml').open('rb') as source:
+            document = read_slim_document(source)
+        object_index = index_objects(root)
+
+        self.assertListEqual(list(document.object_names), list(object_index.object_by_name.keys()))
+        for label, object_element in object_index.object_by_label.items():
+            self.assertEqual(document.find_object_name(label), object_element.attrib['name'])
+
+    def test_doc_map_names(self):
+        with tests_path.joinpath('ExampleDocumentWithMultiXLink.xml').open('rb') as source:
+            document = read_slim_document(source)
+
+        self.assertSetEqual(set(document.doc_map_names),
+                            {'Cube', 'MainDocument', 'CircularStatorResinCast', 'HexagonalStatorResinCast'})
+
+    def test_smaller_than_root(self):
+        document_xml = tests_path.joinpath('ExampleDocument.xml').read_bytes()
+        # Names are interned on first read, so they aren't counted below.
+        read_slim_document(BytesIO(document_xml))
+
+        root_size = _traced_size(lambda: ElementTree.fromstring(document_xml))
+        document_size = _traced_size(lambda: read_slim_document(BytesIO(document_xml)))
+
+        self.assertLess(document_size * 5, root_size)
+
+
+class SlimWorkspaceTest(unittest.TestCase):
+
+    def test_same_results_as_loading_documents(self):
+        base_path = str(example_path)
+        workspace = SlimWorkspace(base_path)
+        queries = [Query('MainDocument', 'Spreadsheet', 'Value'),
+                   Query('<<MainDocument>>', '<<Spreadsheet>>', 'Value'),
+                   Query('ExampleDocument', 'Cylinder', 'Radius')]
+
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertListEqual(make_find(workspace)(base_path, query), find(base_path, query))
+        self.assertDictEqual(make_find_many(workspace)(base_path, queries), find_many(base_path, queries))
+
+    def test_find_linking_document_paths(self):
+        base_path = str(example_path)
+        workspace = SlimWorkspace(base_path)
+
+        self.assertListEqual(workspace.find_linking_document_paths('MainDocument'),
+                             list(remove(base_path, 'MainDocument').keys()))
+
+
+def _traced_size(function) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        # Only released after its size is read.
+        del result
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
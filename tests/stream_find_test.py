@@ -0,0 +1,30 @@
+import unittest
+from pathlib import Path
+
+from fcxref.find import Query, make_find, make_stream_find
+from fcxref.root_by_document_path import (find_document_paths,
+                                          find_root_by_document_path)
+
+example_path = Path(__file__).parent.parent.joinpath('example')
+
+
+class StreamFindTest(unittest.TestCase):
+
+    def test_stream_find_matches_find(self):
+        find = make_find(find_root_by_document_path)
+        stream_find = make_stream_find(find_document_paths)
+        queries = [Query('MainDocument', 'Spreadsheet', 'Value'),
+                   Query('MainDocument', 'Spreadsheet'),
+                   Query('Main.*', 'Spreadsheet', 'Value')]
+        for query in queries:
+            with self.subTest(query=str(query)):
+                references = list(stream_find(str(example_path), query))
+                expected = find(str(example_path), query)
+
+                self.assertGreater(len(references), 0)
+                self.assertListEqual(references, expected)
+                self.assertListEqual([r.locator for r in references], [r.locator for r in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
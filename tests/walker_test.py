@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from fcxref.walker import Walker
+
+
+class WalkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for relative_path in ['Main.FCStd',
+                              'lower.fcstd',
+                              'Notes.txt',
+                              'parts/Box.FCStd',
+                              'parts/nested/Cylinder.FCStd',
+                              'backup/Main.FCStd',
+                              'build/Output.FCStd',
+                              '.git/Hidden.FCStd']:
+            path = Path(self.directory).joinpath(relative_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def find_relative_document_paths(self, walker: Walker, document_pattern: str = '*'):
+        document_paths = walker.find_document_paths(self.directory, document_pattern)
+        return [Path(p).relative_to(self.directory).as_posix() for p in document_paths]
+
+    def test_find_document_paths(self):
+        self.assertListEqual(self.find_relative_document_paths(Walker()),
+                             ['Main.FCStd',
+                              'backup/Main.FCStd',
+                              'build/Output.FCStd',
+                              'lower.fcstd',
+                              'parts/Box.FCStd',
+                              'parts/nested/Cylinder.FCStd'])
+
+    def test_find_document_paths_with_document_pattern(self):
+        self.assertListEqual(self.find_relative_document_paths(Walker(), 'main'),
+                             ['Main.FCStd', 'backup/Main.FCStd'])
+
+    def test_find_document_paths_with_include_exclude_and_max_depth(self):
+        self.assertListEqual(self.find_relative_document_paths(Walker(include=['parts/*'])),
+                             ['parts/Box.FCStd', 'parts/nested/Cylinder.FCStd'])
+        self.assertListEqual(self.find_relative_document_paths(Walker(exclude=['backup/', 'nested', 'Lower.FCStd'])),
+                             ['Main.FCStd', 'build/Output.FCStd', 'parts/Box.FCStd'])
+        self.assertListEqual(self.find_relative_document_paths(Walker(max_depth=0)),
+                             ['Main.FCStd', 'lower.fcstd'])
+        self.assertListEqual(self.find_relative_document_paths(Walker(max_depth=1)),
+                             ['Main.FCStd',
+                              'backup/Main.FCStd',
+                              'build/Output.FCStd',
+                              'lower.fcstd',
+                              'parts/Box.FCStd'])
+
+    def test_find_document_paths_with_ignore_file(self):
+        with open(Path(self.directory).joinpath('.fcxrefignore'), 'w') as f:
+            f.write('# Generated documents\nbuild/\n\nbackup\n')
+
+        self.assertListEqual(self.find_relative_document_paths(Walker()),
+                             ['Main.FCStd',
+                              'lower.fcstd',
+                              'parts/Box.FCStd',
+                              'parts/nested/Cylinder.FCStd'])
+
+    @unittest.skipIf(not hasattr(os, 'symlink'), 'Symbolic links are not supported.')
+    def test_find_document_paths_with_symlink_cycle(self):
+        os.symlink(self.directory, Path(self.directory).joinpath('parts', 'nested', 'cycle'))
+
+        self.assertListEqual(self.find_relative_document_paths(Walker(include=['parts/*'])),
+                             ['parts/Box.FCStd', 'parts/nested/Cylinder.FCStd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+from fcxref import (Query, Workspace, find, make_find, make_remove,
+                    make_rename_property, remove, rename_property)
+from fcxref import workspace as workspace_module
+
+example_path = Path(__file__).parent.parent.joinpath('example')
+
+
+class WorkspaceTest(unittest.TestCase):
+
+    def test_loads_documents_once(self):
+        workspace = Workspace(str(example_path))
+        with patch.object(workspace_module, 'iter_document_xmls',
+                          wraps=workspace_module.iter_document_xmls) as iter_document_xmls:
+            find = make_find(workspace)
+            find(str(example_path), Query('MainDocument', 'Spreadsheet', 'Value'))
+            rename_property = make_rename_property(workspace)
+            rename_property(str(example_path), 'MainDocument', 'Spreadsheet', ('Value', 'RenamedValue'))
+            remove = make_remove(workspace)
+            remove(str(example_path), 'MainDocument')
+
+        self.assertEqual(iter_document_xmls.call_count, 1)
+
+    def test_same_results_as_loading_documents(self):
+        base_path = str(example_path)
+        workspace = Workspace(base_path)
+        query = Query('MainDocument', 'Spreadsheet', 'Value')
+
+        self.assertListEqual(make_find(workspace)(base_path, query), find(base_path, query))
+        for make, function, args in [
+            (make_rename_property, rename_property, ('MainDocument', 'Spreadsheet', ('Value', 'RenamedValue'))),
+            (make_remove, remove, ('MainDocument',))
+        ]:
+            with self.subTest(function=function.__name__):
+                expected = function(base_path, *args)
+                actual = make(workspace)(base_path, *args)
+                self.assertListEqual(list(actual.keys()), list(expected.keys()))
+                for document_path, root in actual.items():
+                    self.assertEqual(ElementTree.tostring(root), ElementTree.tostring(expected[document_path]))
+
+    def test_roots_are_not_modified(self):
+        base_path = str(example_path)
+        workspace = Workspace(base_path)
+        xml_by_document_path = {p: ElementTree.tostring(root) for p, root in workspace(base_path)}
+
+        make_rename_property(workspace)(base_path, 'MainDocument', 'Spreadsheet', ('Value', 'RenamedValue'))
+        make_remove(workspace)(base_path, 'MainDocument')
+
+        self.assertDictEqual({p: ElementTree.tostring(root) for p, root in workspace(base_path)},
+                             xml_by_document_path)
+
+    def test_document_pattern(self):
+        workspace = Workspace(str(example_path))
+
+        document_paths = [p for p, _ in workspace(str(example_path), 'maindocument')]
+
+        self.assertListEqual(document_paths, [str(example_path.joinpath('MainDocument.FCStd'))])
+
+    def test_refresh(self):
+        with tempfile.TemporaryDirectory() as directory:
+            main_document_path = os.path.join(directory, 'MainDocument.FCStd')
+            example_document_path = os.path.join(directory, 'ExampleDocument.FCStd')
+            shutil.copy(example_path.joinpath('MainDocument.FCStd'), main_document_path)
+            shutil.copy(example_path.joinpath('ExampleDocument.FCStd'), example_document_path)
+            workspace = Workspace(directory)
+            self.assertEqual(len(list(workspace(directory))), 2)
+
+            stat = os.stat(main_document_path)
+            os.utime(main_document_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            self.assertListEqual(workspace.refresh(), [main_document_path])
+
+    def test_other_base_path(self):
+        workspace = Workspace(str(example_path))
+
+        with self.assertRaises(ValueError):
+            list(workspace(str(example_path.parent)))
+
+
+if __name__ == '__main__':
+    unittest.main()
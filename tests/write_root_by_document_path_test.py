@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from zipfile import ZipFile
+
+from fcxref.root_by_document_path import (find_root_by_document_path,
+                                          write_root_by_document_path)
+
+
+def read_compressed_data(document_path: str):
+    compressed_data_by_member = {}
+    with ZipFile(document_path, 'r') as archive:
+        for member in archive.infolist():
+            archive.fp.seek(member.header_offset + 26)
+            lengths = archive.fp.read(4)
+            offset = int.from_bytes(lengths[:2], 'little') + int.from_bytes(lengths[2:], 'little')
+            archive.fp.seek(offset, os.SEEK_CUR)
+            compressed_data_by_member[member.filename] = archive.fp.read(member.compress_size)
+    return compressed_data_by_member
+
+
+class WriteRootByDocumentPathTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        example_path = Path(__file__).parent.parent.joinpath('example')
+        self.document_path = str(Path(self.directory).joinpath('MainDocument.FCStd'))
+        shutil.copy(example_path.joinpath('MainDocument.FCStd'), self.document_path)
+        os.chmod(self.document_path, 0o640)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write_root_by_document_path(self):
+        with ZipFile(self.document_path, 'r') as archive:
+            members_before = archive.infolist()
+        compressed_data_before = read_compressed_data(self.document_path)
+        root_by_document_path = find_root_by_document_path(self.directory)
+        root = root_by_document_path[self.document_path]
+        root.find("Properties/Property[@name='Comment']/String").set('value', 'Updated')
+
+        write_root_by_document_path(root_by_document_path)
+
+        with ZipFile(self.document_path, 'r') as archive:
+            self.assertIsNone(archive.testzip())
+            members_after = archive.infolist()
+            self.assertListEqual([m.filename for m in members_after],
+                                 [m.filename for m in members_before])
+            for before, after in zip(members_before[1:], members_after[1:]):
+                self.assertEqual(after.date_time, before.date_time)
+                self.assertEqual(after.CRC, before.CRC)
+        compressed_data_after = read_compressed_data(self.document_path)
+        for filename, data in compressed_data_before.items():
+            if filename != 'Document.xml':
+                self.assertEqual(compressed_data_after[filename], data)
+        root = find_root_by_document_path(self.directory)[self.document_path]
+        comment = root.find("Properties/Property[@name='Comment']/String")
+        self.assertEqual(comment.attrib['value'], 'Updated')
+        self.assertEqual(os.stat(self.document_path).st_mode & 0o777, 0o640)
+        self.assertListEqual(os.listdir(self.directory), ['MainDocument.FCStd'])
+
+    def test_write_root_by_document_path_collects_errors(self):
+        root_by_document_path = find_root_by_document_path(self.directory)
+        missing_document_path = str(Path(self.directory).joinpath('Missing.FCStd'))
+        root_by_document_path[missing_document_path] = root_by_document_path[self.document_path]
+        progress = []
+
+        error_by_document_path = write_root_by_document_path(
+            root_by_document_path, jobs=2, progress=lambda *args: progress.append(args))
+
+        self.assertListEqual(list(error_by_document_path.keys()), [missing_document_path])
+        self.assertListEqual([document_path for document_path, _ in progress],
+                             [self.document_path, missing_document_path])
+        self.assertIsNone(progress[0][1])
+        self.assertEqual(progress[1][1], error_by_document_path[missing_document_path])
+        self.assertListEqual(os.listdir(self.directory), ['MainDocument.FCStd'])
+
+
+if __name__ == '__main__':
+    unittest.main()